@@ -0,0 +1,117 @@
+import random
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+BASE_TIMESTAMP = 1767225600  # 2026-01-01 00:00:00 UTC
+
+
+def city_name(index: int) -> str:
+    """Synthetic city name for an index."""
+    return f"Bench City {index:06d}"
+
+
+def city_id(name: str) -> int:
+    """Stable synthetic OpenWeatherMap city ID for a name."""
+    return zlib.crc32(name.encode("utf-8")) or 1
+
+
+def generate_cities(count: int) -> list[str]:
+    """Generate ``count`` distinct synthetic city names."""
+    return [city_name(i) for i in range(count)]
+
+
+def make_payload(name: str, dt: int, rng: random.Random) -> dict:
+    """
+    Build a payload shaped like the OWM current weather response.
+
+    Args:
+        name: City name
+        dt: Measurement Unix timestamp
+        rng: Random generator used for the measured values
+
+    Returns:
+        Raw payload dictionary
+    """
+    temp = rng.uniform(250.0, 310.0)
+    return {
+        "coord": {"lon": rng.uniform(-180, 180), "lat": rng.uniform(-90, 90)},
+        "weather": [
+            {"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}
+        ],
+        "base": "stations",
+        "main": {
+            "temp": temp,
+            "feels_like": temp - 1.5,
+            "temp_min": temp - 2,
+            "temp_max": temp + 2,
+            "pressure": rng.randint(980, 1040),
+            "humidity": rng.randint(20, 100),
+        },
+        "visibility": 10000,
+        "wind": {"speed": round(rng.uniform(0, 20), 2), "deg": rng.randint(0, 359)},
+        "clouds": {"all": rng.randint(0, 100)},
+        "dt": dt,
+        "sys": {"country": "PL", "sunrise": dt - 21600, "sunset": dt + 21600},
+        "timezone": 3600,
+        "id": city_id(name),
+        "name": name,
+        "cod": 200,
+    }
+
+
+def generate_payloads(
+    count: int, cities: Optional[int] = None, seed: int = 42
+) -> list[dict]:
+    """
+    Generate raw payloads for ``count`` measurements.
+
+    Measurements cycle over ``cities`` cities with one hour between the
+    rounds, so every (city, dt) pair is unique.
+
+    Args:
+        count: Number of payloads
+        cities: Number of distinct cities (defaults to ``min(count, 1000)``)
+        seed: Random seed
+
+    Returns:
+        List of raw payload dictionaries
+    """
+    rng = random.Random(seed)
+    cities = cities or min(count, 1000) or 1
+    names = generate_cities(cities)
+    return [
+        make_payload(names[i % cities], BASE_TIMESTAMP + 3600 * (i // cities), rng)
+        for i in range(count)
+    ]
+
+
+def generate_records(
+    count: int, cities: Optional[int] = None, seed: int = 42
+) -> list[dict]:
+    """
+    Generate transformed records for ``count`` measurements.
+
+    Args:
+        count: Number of records
+        cities: Number of distinct cities (defaults to ``min(count, 1000)``)
+        seed: Random seed
+
+    Returns:
+        List of records in the format returned by the transform stage
+    """
+    rng = random.Random(seed)
+    cities = cities or min(count, 1000) or 1
+    names = generate_cities(cities)
+    start = datetime(2026, 1, 1)
+    return [
+        {
+            "city": names[i % cities],
+            "temperature_celsius": rng.uniform(-20.0, 35.0),
+            "measurement_time": start + timedelta(hours=i // cities),
+            "humidity": rng.randint(20, 100),
+            "pressure": rng.randint(980, 1040),
+            "wind_speed": rng.uniform(0, 20),
+        }
+        for i in range(count)
+    ]
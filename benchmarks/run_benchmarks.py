@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.payloads import generate_cities, generate_payloads, generate_records
+from benchmarks.stub_server import StubOWMServer
+
+DEFAULT_SCALES = [10, 1_000, 100_000]
+BENCHMARK_CITY_PATTERN = "Bench City %"
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Run ``func`` ``repeat`` times and return the fastest wall-clock time."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def result(benchmark: str, scale: int, seconds: float, **extra) -> dict:
+    """Build one result entry."""
+    entry = {
+        "benchmark": benchmark,
+        "scale": scale,
+        "seconds": round(seconds, 6),
+        "records_per_second": round(scale / seconds, 1) if seconds > 0 else None,
+    }
+    entry.update(extra)
+    return entry
+
+
+def bench_extract(scale: int, server: StubOWMServer, workers: int) -> dict:
+    """
+    Time WeatherAPI.get_weather_data (the body of extract_data) for ``scale``
+    cities against the stub server.
+    """
+    from src.extract.weather_api import WeatherAPI
+
+    config = {
+        "api": {
+            "base_url": server.base_url,
+            "group_url": server.group_url,
+            "timeout": 10,
+            "max_workers": workers,
+            "retries": 3,
+            "backoff": 0.01,
+            "backoff_max": 0.1,
+        }
+    }
+    api = WeatherAPI(config)
+    cities = generate_cities(scale)
+    requests_before = server.requests
+    fetched = []
+    seconds = best_of(lambda: fetched.append(len(api.get_weather_data(cities))), 1)
+    api.close()
+    return result(
+        "extract",
+        scale,
+        seconds,
+        fetched=fetched[-1],
+        http_requests=server.requests - requests_before,
+        workers=workers,
+    )
+
+
+def bench_transform(scale: int, repeat: int) -> dict:
+    """Time transform_data_impl on ``scale`` synthetic payloads."""
+    from src.pipeline import transform_data_impl
+
+    payloads = generate_payloads(scale)
+    return result(
+        "transform", scale, best_of(lambda: transform_data_impl(payloads), repeat)
+    )
+
+
+def bench_csv(scale: int, repeat: int) -> dict:
+    """Time save_to_csv on ``scale`` synthetic records."""
+    from src.load.csv_writer import save_to_csv
+
+    records = generate_records(scale)
+    with tempfile.TemporaryDirectory() as output_dir:
+        seconds = best_of(
+            lambda: save_to_csv(records, output_dir=output_dir, filename="bench.csv"),
+            repeat,
+        )
+    return result("save_to_csv", scale, seconds)
+
+
+def _delete_benchmark_rows() -> None:
+    from src.db import get_connection
+
+    with get_connection() as dbconnect:
+        with dbconnect.cursor() as cursor:
+            for table in (
+                "weather_measurements",
+                "latest_measurements",
+                "weather_hourly",
+                "weather_daily",
+            ):
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE city LIKE %s", (BENCHMARK_CITY_PATTERN,)
+                )
+        dbconnect.commit()
+
+
+def bench_database(scale: int) -> Optional[dict]:
+    """
+    Time save_to_database on ``scale`` new rows against the configured
+    PostgreSQL (DB_* environment variables). Benchmark rows are deleted
+    before and after, so the recent-keys index is bypassed (it would
+    otherwise remember the deleted keys) and rows are not published to the
+    readings service. Returns None if the database is unreachable.
+    """
+    import psycopg2
+    from src.load.db_loader import save_to_database
+
+    try:
+        _delete_benchmark_rows()
+    except psycopg2.Error as e:
+        print(f"Skipping save_to_database: {e}".strip(), file=sys.stderr)
+        return None
+
+    records = generate_records(scale)
+    counts = []
+    try:
+        seconds = best_of(
+            lambda: counts.append(
+                save_to_database(records, use_recent_keys=False, publish=False)
+            ),
+            1,
+        )
+    finally:
+        _delete_benchmark_rows()
+    inserted, duplicates = counts[-1]
+    return result(
+        "save_to_database", scale, seconds, inserted=inserted, duplicates=duplicates
+    )
+
+
+def git_commit() -> Optional[str]:
+    """Current git commit of the working tree, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: str, tolerance: float) -> bool:
+    """
+    Print timing ratios against a baseline results file.
+
+    Args:
+        results: Current results
+        baseline_path: Results JSON written by an earlier run
+        tolerance: Allowed relative slowdown before flagging a regression
+
+    Returns:
+        True if no benchmark regressed beyond ``tolerance``
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {
+            (entry["benchmark"], entry["scale"]): entry
+            for entry in json.load(f)["results"]
+        }
+
+    ok = True
+    for entry in results:
+        previous = baseline.get((entry["benchmark"], entry["scale"]))
+        if previous is None or not previous["seconds"]:
+            continue
+        ratio = entry["seconds"] / previous["seconds"]
+        regressed = ratio > 1 + tolerance
+        ok = ok and not regressed
+        print(
+            f"{entry['benchmark']:>18} {entry['scale']:>8}: "
+            f"{previous['seconds']:.4f}s -> {entry['seconds']:.4f}s "
+            f"({ratio:.2f}x){'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark suite and write results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the weather pipeline.")
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(scale) for scale in DEFAULT_SCALES),
+        help="comma-separated record counts (default: 10,1000,100000)",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        default="extract,transform,csv,database",
+        help="comma-separated subset of extract,transform,csv,database",
+    )
+    parser.add_argument(
+        "--max-extract-scale",
+        type=int,
+        default=1_000,
+        help="largest scale to run the HTTP extract benchmark at",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="baseline results JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+    scales = [int(scale) for scale in args.scales.split(",")]
+    selected = set(args.benchmarks.split(","))
+    results = []
+
+    with StubOWMServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    ) as server:
+        for scale in scales:
+            if "extract" in selected and scale <= args.max_extract_scale:
+                results.append(bench_extract(scale, server, args.workers))
+            if "transform" in selected:
+                results.append(bench_transform(scale, args.repeat))
+            if "csv" in selected:
+                results.append(bench_csv(scale, args.repeat))
+            if "database" in selected:
+                entry = bench_database(scale)
+                if entry is not None:
+                    results.append(entry)
+            for entry in results[-4:]:
+                if entry["scale"] == scale:
+                    print(
+                        f"{entry['benchmark']:>18} {scale:>8}: "
+                        f"{entry['seconds']:.4f}s "
+                        f"({entry['records_per_second']} records/s)"
+                    )
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "workers": args.workers,
+            "repeat": args.repeat,
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        return 0 if compare(results, args.compare, args.tolerance) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import json
+import time
+import random
+import threading
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+from .payloads import BASE_TIMESTAMP, city_id, make_payload
+
+
+class StubOWMServer:
+    """
+    Local HTTP server mimicking the OpenWeatherMap current weather API.
+
+    Serves ``/data/2.5/weather?q=<city>``, ``/data/2.5/group?id=<ids>`` and
+    the hourly ``/data/2.5/history/city?q=<city>&start=&end=`` endpoint with
+    synthetic payloads, with configurable latency, server errors and rate
+    limiting.
+
+    Attributes:
+        latency: Seconds added to every response
+        error_rate: Probability of a 500 response
+        rate_limit_rate: Probability of a 429 response
+        rate_limit_first: Number of 429 responses sent before each distinct
+            request (path and query) is served
+        retry_after: Retry-After header value sent with 429 responses
+        requests: Number of requests served
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rate_limit_first: int = 0,
+        retry_after: float = 0.0,
+        seed: int = 42,
+    ):
+        """
+        Create the server (call ``start`` or use it as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds added to every response
+            error_rate: Probability of a 500 response
+            rate_limit_rate: Probability of a 429 response
+            rate_limit_first: Number of 429 responses sent before each
+                distinct request is served (deterministic rate limiting)
+            retry_after: Retry-After header value sent with 429 responses
+            seed: Random seed for errors and payload values
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rate_limit_first = rate_limit_first
+        self.retry_after = retry_after
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._names: dict[int, str] = {}
+        self._attempts: dict[str, int] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """URL of the current weather endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/data/2.5/weather"
+
+    @property
+    def group_url(self) -> str:
+        """URL of the group-by-IDs endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/data/2.5/group"
+
+    @property
+    def history_url(self) -> str:
+        """URL of the hourly history endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/data/2.5/history/city"
+
+    def _payload(self, name: str, dt: Optional[int] = None) -> dict:
+        with self._lock:
+            self._names[city_id(name)] = name
+            rng = random.Random(self._rng.random())
+        if dt is None:
+            dt = BASE_TIMESTAMP + int(time.time() - BASE_TIMESTAMP) // 600 * 600
+        return make_payload(name, dt, rng)
+
+    def _outcome(self, key: str) -> int:
+        with self._lock:
+            self.requests += 1
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+            roll = self._rng.random()
+        if attempt < self.rate_limit_first:
+            return 429
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return 200
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                status = stub._outcome(self.path)
+                if status == 429:
+                    self._send(
+                        429,
+                        {"cod": 429, "message": "rate limited"},
+                        {"Retry-After": str(stub.retry_after)},
+                    )
+                    return
+                if status == 500:
+                    self._send(500, {"cod": 500, "message": "internal error"})
+                    return
+
+                if url.path.endswith("/history/city") and "q" in query:
+                    name = query["q"][0]
+                    start = int(query.get("start", ["0"])[0])
+                    end = int(query.get("end", [str(start)])[0])
+                    first = -(-start // 3600) * 3600
+                    payloads = [
+                        stub._payload(name, dt) for dt in range(first, end, 3600)
+                    ]
+                    self._send(
+                        200,
+                        {
+                            "cod": "200",
+                            "city_id": city_id(name),
+                            "cnt": len(payloads),
+                            "list": payloads,
+                        },
+                    )
+                elif url.path.endswith("/weather") and "q" in query:
+                    self._send(200, stub._payload(query["q"][0]))
+                elif url.path.endswith("/group") and "id" in query:
+                    ids = [int(i) for i in query["id"][0].split(",") if i]
+                    payloads = [
+                        stub._payload(stub._names.get(i, f"City {i}")) for i in ids
+                    ]
+                    for payload, requested_id in zip(payloads, ids):
+                        payload["id"] = requested_id
+                    self._send(200, {"cnt": len(payloads), "list": payloads})
+                else:
+                    self._send(404, {"cod": "404", "message": "city not found"})
+
+        return Handler
+
+    def start(self) -> "StubOWMServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="owm-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubOWMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local OWM stub server.")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-first", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubOWMServer(
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rate_limit_first=args.rate_limit_first,
+    )
+    print(f"Serving {server.base_url}, {server.group_url} and {server.history_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
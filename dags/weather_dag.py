@@ -5,7 +5,32 @@ from airflow.operators.python import PythonOperator
 import sys
 
 sys.path.insert(0, "/opt/airflow")
-from src.pipeline import extract_data, transform_data, load_data
+
+
+def _pipeline_callable(name: str):
+    """
+    Wrap a src.pipeline task function so the pipeline is imported lazily.
+
+    The scheduler reparses this file constantly; importing src.pipeline
+    (requests, psycopg2, pyarrow, numpy, ...) only when a task runs keeps
+    DAG parsing fast.
+    """
+
+    def run(**context):
+        from src import pipeline
+
+        return getattr(pipeline, name)(**context)
+
+    run.__name__ = name
+    return run
+
+
+plan_shards_task = _pipeline_callable("plan_shards_task")
+extract_data_task = _pipeline_callable("extract_data_task")
+transform_data = _pipeline_callable("transform_data")
+load_data = _pipeline_callable("load_data")
+maintain_partitions_task = _pipeline_callable("maintain_partitions_task")
+merge_shard_stats_task = _pipeline_callable("merge_shard_stats_task")
 
 default_args = {
     "owner": "airflow",
@@ -25,22 +50,41 @@ with DAG(
     catchup=False,
     tags=["weather", "etl"],
 ) as dag:
-    # Task 1: Extract
-    extract_task = PythonOperator(
-        task_id="extract_weather_data",
-        python_callable=extract_data,
+    # Split the configured cities into shards (pipeline.shards)
+    plan_task = PythonOperator(
+        task_id="plan_shards",
+        python_callable=plan_shards_task,
     )
 
-    # Task 2: Transform
-    transform_task = PythonOperator(
+    # Task 1: Extract, one mapped instance per shard
+    extract_task = PythonOperator.partial(
+        task_id="extract_weather_data",
+        python_callable=extract_data_task,
+    ).expand(op_kwargs=plan_task.output)
+
+    # Task 2: Transform, one mapped instance per extracted shard
+    transform_task = PythonOperator.partial(
         task_id="transform_weather_data",
         python_callable=transform_data,
-    )
+    ).expand(op_kwargs=extract_task.output)
 
-    # Task 3: Load
-    load_task = PythonOperator(
+    # Task 3: Load, one mapped instance per transformed shard
+    load_task = PythonOperator.partial(
         task_id="load_weather_data",
         python_callable=load_data,
+    ).expand(op_kwargs=transform_task.output)
+
+    # Create upcoming partitions and expire old ones before loading
+    partitions_task = PythonOperator(
+        task_id="maintain_partitions",
+        python_callable=maintain_partitions_task,
+    )
+
+    # Sum inserted/duplicate counts over all shards
+    merge_task = PythonOperator(
+        task_id="merge_shard_stats",
+        python_callable=merge_shard_stats_task,
+        op_kwargs={"stats": load_task.output},
     )
 
-    extract_task >> transform_task >> load_task
+    partitions_task >> load_task
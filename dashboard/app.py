@@ -1,54 +1,55 @@
 import plotly.express as px
 import streamlit as st
-import psycopg2
 import pandas as pd
-import os
-from dotenv import load_dotenv
+import sys
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
 
-load_dotenv()
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.config import load_config
+from src import read_service
+from dashboard import measurements
 
+DASHBOARD_CONFIG = load_config().get("dashboard", {})
+CACHE_TTL = DASHBOARD_CONFIG.get("cache_ttl", 60)
 
-def get_db_connection():
-    """Create database connection."""
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST"),
-        port=os.getenv("DB_PORT"),
-        database=os.getenv("DB_NAME"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-    )
 
+@st.cache_resource
+def get_readings_client():
+    """Readings service client shared by all sessions and reruns."""
+    return read_service.get_readings_client()
 
-def get_latest_measurements():
-    """Get latest measurement for each city."""
-    dbconnect = get_db_connection()
 
-    query = """
-    SELECT DISTINCT ON (city) 
-        city, temperature_celsius, measurement_time, humidity, pressure, wind_speed
-    FROM weather_measurements
-    ORDER BY city, measurement_time DESC;
-    """
+@st.cache_resource
+def get_latest_store() -> measurements.LatestStore:
+    """Latest-measurements cache shared by all sessions of this process."""
+    return measurements.LatestStore(
+        ttl=CACHE_TTL, overlap=DASHBOARD_CONFIG.get("cache_overlap", 300)
+    )
+
 
-    df = pd.read_sql(query, dbconnect)
-    dbconnect.close()
-    return df
+READINGS = get_readings_client()
 
 
-def get_all_measurements():
-    """Get all measurements for time series chart."""
-    dbconnect = get_db_connection()
+@st.cache_data(ttl=CACHE_TTL)
+def get_latest_measurements():
+    """Get latest measurement for each city."""
+    return measurements.get_latest_measurements(
+        client=READINGS, store=get_latest_store()
+    )
 
-    # SQL: Pobierz wszystkie dane, posortowane po czasie
-    query = """
-    SELECT city, temperature_celsius, measurement_time, humidity, pressure, wind_speed
-    FROM weather_measurements
-    ORDER BY measurement_time DESC;
-    """
 
-    df = pd.read_sql(query, dbconnect)
-    dbconnect.close()
-    return df
+@st.cache_data(ttl=CACHE_TTL)
+def get_trend_data(start: date, end: date, cities: tuple) -> pd.DataFrame:
+    """Get bucketed, downsampled temperature series for the selected range."""
+    max_points = load_config().get("dashboard", {}).get("trend_max_points", 500)
+    return measurements.get_temperature_trends(
+        datetime.combine(start, time.min),
+        datetime.combine(end + timedelta(days=1), time.min),
+        list(cities),
+        max_points=max_points,
+        client=READINGS,
+    )
 
 
 st.set_page_config(page_title="Weather Dashboard", page_icon="☁️", layout="wide")
@@ -74,21 +75,25 @@ st.dataframe(latest_df, use_container_width=True)
 
 st.header("Temperature Trends")
 
-all_data = get_all_measurements()
-
-all_cities = all_data["city"].unique().tolist()
+all_cities = latest_df["city"].tolist()
 selected_cities = st.multiselect(
     "Select cities to display", options=all_cities, default=all_cities
 )
 
-if selected_cities:
-    filtered_data = all_data[all_data["city"].isin(selected_cities)]
+today = date.today()
+date_range = st.date_input(
+    "Date range", value=(today - timedelta(days=7), today), max_value=today
+)
+if isinstance(date_range, (tuple, list)) and len(date_range) == 2:
+    start_date, end_date = date_range
 else:
-    filtered_data = all_data
+    start_date = end_date = date_range[0] if date_range else today
+
+trend_data = get_trend_data(start_date, end_date, tuple(selected_cities or all_cities))
 
 
 fig_temp = px.line(
-    filtered_data,
+    trend_data,
     x="measurement_time",
     y="temperature_celsius",
     color="city",
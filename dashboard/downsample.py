@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    Keeps the first and last point and, for every bucket in between, the
+    point forming the largest triangle with the previously selected point
+    and the average of the next bucket. This preserves peaks and the visual
+    shape of the series with a fixed number of points.
+
+    Args:
+        x: Sorted x values (numeric)
+        y: y values, same length as ``x``
+        threshold: Maximum number of points to keep
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+
+    return indices
+
+
+def downsample_series(
+    df: pd.DataFrame, x: str, y: str, by: str, max_points: int
+) -> pd.DataFrame:
+    """
+    Downsample every series of a long-format frame with LTTB.
+
+    Args:
+        df: Frame with one row per point
+        x: Datetime or numeric column used as the x axis
+        y: Numeric column used as the y axis
+        by: Column identifying the series (e.g. city)
+        max_points: Maximum number of points kept per series
+
+    Returns:
+        Frame with at most ``max_points`` rows per series, sorted by ``by``
+        and ``x``
+    """
+    if df.empty:
+        return df
+
+    parts = []
+    for _, series in df.dropna(subset=[y]).sort_values([by, x]).groupby(by):
+        x_values = series[x].to_numpy()
+        if np.issubdtype(x_values.dtype, np.datetime64):
+            x_values = x_values.astype("datetime64[ns]").astype(np.int64)
+        keep = lttb(x_values, series[y].to_numpy(), max_points)
+        parts.append(series.iloc[keep])
+    return pd.concat(parts, ignore_index=True)
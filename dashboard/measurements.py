@@ -0,0 +1,258 @@
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+import pandas as pd
+import requests
+from src.db import get_connection
+from src.read_service import ReadingsClient
+from dashboard.downsample import downsample_series
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "city",
+    "temperature_celsius",
+    "measurement_time",
+    "humidity",
+    "pressure",
+    "wind_speed",
+]
+
+TREND_BUCKETS = [
+    ("hour", timedelta(hours=1)),
+    ("day", timedelta(days=1)),
+    ("week", timedelta(weeks=1)),
+    ("month", timedelta(days=30)),
+]
+
+TREND_QUERY = """
+SELECT city,
+    date_trunc(%(bucket)s, bucket) AS measurement_time,
+    SUM(temperature_sum) / NULLIF(SUM(temperature_count), 0) AS temperature_celsius
+FROM {table}
+WHERE bucket >= %(start)s
+    AND bucket < %(end)s
+    AND city = ANY(%(cities)s)
+GROUP BY 1, 2
+ORDER BY 1, 2;
+"""
+
+LATEST_QUERY = """
+SELECT city, temperature_celsius, measurement_time, humidity, pressure, wind_speed
+FROM latest_measurements
+ORDER BY city;
+"""
+
+LATEST_CHANGES_QUERY = """
+SELECT city, temperature_celsius, measurement_time, humidity, pressure, wind_speed,
+    updated_at
+FROM latest_measurements
+WHERE %(since)s IS NULL OR updated_at > %(since)s;
+"""
+
+
+def readings_frame(readings: list[dict]) -> pd.DataFrame:
+    """Build a measurements frame from readings service JSON."""
+    frame = pd.DataFrame(readings, columns=COLUMNS)
+    frame["measurement_time"] = pd.to_datetime(frame["measurement_time"])
+    return frame
+
+
+def read_sql(query: str, params: Optional[dict] = None) -> pd.DataFrame:
+    """Run a query on a pooled connection and return the result as a DataFrame."""
+    with get_connection() as dbconnect:
+        return pd.read_sql(query, dbconnect, params=params)
+
+
+class LatestStore:
+    """
+    In-memory copy of ``latest_measurements``, refreshed incrementally.
+
+    The first refresh loads every city. Later refreshes, at most once per
+    ``ttl`` seconds, fetch only cities whose row changed after the newest
+    ``updated_at`` seen (minus ``overlap`` seconds to catch transactions
+    that committed late) and merge them into the cached frame, so database
+    load does not grow with the number of dashboard viewers.
+
+    Attributes:
+        ttl: Seconds between database refreshes
+        overlap: Seconds re-read before the watermark on each refresh
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        overlap: float = 300,
+        fetch: Callable[..., pd.DataFrame] = read_sql,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            ttl: Seconds between database refreshes
+            overlap: Seconds re-read before the watermark on each refresh
+            fetch: Function running a query with params and returning a DataFrame
+        """
+        self.ttl = ttl
+        self.overlap = overlap
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._frame = pd.DataFrame(columns=COLUMNS)
+        self._watermark = None
+        self._refreshed_at = None
+
+    def _refresh(self) -> None:
+        since = None
+        if self._watermark is not None:
+            since = self._watermark - timedelta(seconds=self.overlap)
+        changed = self._fetch(LATEST_CHANGES_QUERY, {"since": since})
+        self._refreshed_at = time.monotonic()
+        if changed.empty:
+            return
+
+        self._watermark = changed["updated_at"].max()
+        changed = changed[COLUMNS]
+        frame = changed if self._frame.empty else pd.concat([self._frame, changed])
+        self._frame = (
+            frame.drop_duplicates("city", keep="last")
+            .sort_values("city")
+            .reset_index(drop=True)
+        )
+
+    def latest(self) -> pd.DataFrame:
+        """
+        Get the latest measurement for each city.
+
+        Returns:
+            DataFrame with one row per city, ordered by city, refreshed from
+            the database if older than ``ttl``
+        """
+        with self._lock:
+            if (
+                self._refreshed_at is None
+                or time.monotonic() - self._refreshed_at >= self.ttl
+            ):
+                self._refresh()
+            return self._frame
+
+
+def choose_bucket(start: datetime, end: datetime, max_buckets: int) -> str:
+    """
+    Choose the finest ``date_trunc`` unit giving at most ``max_buckets`` buckets.
+
+    Args:
+        start: Start of the visible time range
+        end: End of the visible time range
+        max_buckets: Maximum number of buckets per series
+
+    Returns:
+        PostgreSQL ``date_trunc`` unit ("hour", "day", "week" or "month")
+    """
+    span = end - start
+    for unit, width in TREND_BUCKETS:
+        if span / width <= max_buckets:
+            return unit
+    return TREND_BUCKETS[-1][0]
+
+
+def _recent_hourly(
+    client: ReadingsClient, start: datetime, end: datetime, cities: list[str]
+) -> Optional[pd.DataFrame]:
+    """Hourly means from the readings service, or None if it cannot answer."""
+    try:
+        readings, complete = client.recent(cities, since=start, until=end)
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logger.warning("Readings service unavailable, using the database: %s", e)
+        return None
+    if not complete:
+        return None
+    frame = readings_frame(readings)
+    frame["measurement_time"] = frame["measurement_time"].dt.floor("h")
+    return frame.groupby(["city", "measurement_time"], as_index=False)[
+        "temperature_celsius"
+    ].mean()
+
+
+def get_temperature_trends(
+    start: datetime,
+    end: datetime,
+    cities: list[str],
+    max_points: int = 500,
+    fetch: Callable[..., pd.DataFrame] = read_sql,
+    client: Optional[ReadingsClient] = None,
+) -> pd.DataFrame:
+    """
+    Get temperature series aggregated in SQL and downsampled for plotting.
+
+    Rows are averaged into ``date_trunc`` buckets chosen from the time range
+    (at most ``4 * max_points`` buckets per city), read from the hourly or
+    daily rollup table, then each city series is reduced to ``max_points``
+    points with LTTB. The result size is bounded regardless of how much
+    history is stored. Hourly ranges held in full by the readings service
+    are aggregated from memory instead.
+
+    Args:
+        start: Start of the time range (inclusive)
+        end: End of the time range (exclusive)
+        cities: Cities to include
+        max_points: Maximum number of points per city
+        fetch: Function running a query with params and returning a DataFrame
+        client: Readings service client, or None to always use the database
+
+    Returns:
+        Frame with city, measurement_time and temperature_celsius columns
+    """
+    if not cities:
+        return pd.DataFrame(columns=["city", "measurement_time", "temperature_celsius"])
+
+    bucket = choose_bucket(start, end, max_buckets=4 * max_points)
+    df = None
+    if client is not None and bucket == "hour":
+        df = _recent_hourly(client, start, end, list(cities))
+    if df is None:
+        table = "weather_hourly" if bucket == "hour" else "weather_daily"
+        df = fetch(
+            TREND_QUERY.format(table=table),
+            {"bucket": bucket, "start": start, "end": end, "cities": list(cities)},
+        )
+    return downsample_series(
+        df,
+        x="measurement_time",
+        y="temperature_celsius",
+        by="city",
+        max_points=max_points,
+    )
+
+
+def get_latest_measurements(
+    fetch: Callable[..., pd.DataFrame] = read_sql,
+    client: Optional[ReadingsClient] = None,
+    store: Optional[LatestStore] = None,
+) -> pd.DataFrame:
+    """
+    Get the latest measurement for each city.
+
+    Served from the readings service when a client is given, falling back
+    to the ``latest_measurements`` rollup table (through ``store`` when
+    given) if the service is down or holds no readings.
+
+    Args:
+        fetch: Function running a query with params and returning a DataFrame
+        client: Readings service client, or None to always use the database
+        store: Incrementally refreshed copy of ``latest_measurements``
+
+    Returns:
+        DataFrame with one row per city, ordered by city
+    """
+    if client is not None:
+        try:
+            readings = client.latest()
+            if readings:
+                return readings_frame(readings)
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logger.warning("Readings service unavailable, using the database: %s", e)
+    if store is not None:
+        return store.latest()
+    return fetch(LATEST_QUERY)
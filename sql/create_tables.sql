@@ -1,5 +1,7 @@
 -- Weather Data Pipeline - Database Schema
 
+-- Partitioned by month on measurement_time; partitions are created ahead
+-- and expired by src/load/partitions.py
 CREATE TABLE IF NOT EXISTS weather_measurements (
     city VARCHAR(100) NOT NULL,
     measurement_time TIMESTAMP NOT NULL,
@@ -9,7 +11,43 @@ CREATE TABLE IF NOT EXISTS weather_measurements (
     wind_speed FLOAT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (city, measurement_time)
-);
+) PARTITION BY RANGE (measurement_time);
+
+-- Default partition for rows outside the monthly partitions (e.g. backfills)
+-- and monthly partitions from the previous month to three months ahead.
+-- Skipped for a table created before partitioning; convert it with
+-- python -m src.load.partitions --migrate
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = to_regclass('weather_measurements') AND relkind = 'p'
+    ) THEN
+        RAISE NOTICE 'weather_measurements is not partitioned; run python -m src.load.partitions --migrate';
+        RETURN;
+    END IF;
+
+    CREATE TABLE IF NOT EXISTS weather_measurements_default
+    PARTITION OF weather_measurements DEFAULT;
+
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', CURRENT_DATE) - INTERVAL '1 month',
+            date_trunc('month', CURRENT_DATE) + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )::DATE
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF weather_measurements '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'weather_measurements_p' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+    END LOOP;
+END $$;
 
 -- Index for querying by time
 CREATE INDEX IF NOT EXISTS idx_measurement_time
@@ -17,4 +55,113 @@ ON weather_measurements(measurement_time DESC);
 
 -- Index for querying by city
 CREATE INDEX IF NOT EXISTS idx_city
-ON weather_measurements(city);
\ No newline at end of file
+ON weather_measurements(city);
+
+-- Records rejected by validation (src/validation.py), with the failed checks
+CREATE TABLE IF NOT EXISTS weather_quarantine (
+    id BIGSERIAL PRIMARY KEY,
+    city VARCHAR(100) NOT NULL,
+    measurement_time TIMESTAMP NOT NULL,
+    temperature_celsius FLOAT,
+    humidity INTEGER,
+    pressure INTEGER,
+    wind_speed FLOAT,
+    reasons TEXT[] NOT NULL,
+    quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- One row per reading, so re-fetched rejects are not quarantined twice
+CREATE UNIQUE INDEX IF NOT EXISTS weather_quarantine_city_time_key
+ON weather_quarantine(city, measurement_time);
+
+-- Rollups maintained incrementally by the load stage (src/load/db_loader.py)
+
+-- Latest measurement per city
+CREATE TABLE IF NOT EXISTS latest_measurements (
+    city VARCHAR(100) PRIMARY KEY,
+    measurement_time TIMESTAMP NOT NULL,
+    temperature_celsius FLOAT,
+    humidity INTEGER,
+    pressure INTEGER,
+    wind_speed FLOAT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Hourly aggregates per city (sums and counts keep averages mergeable)
+CREATE TABLE IF NOT EXISTS weather_hourly (
+    city VARCHAR(100) NOT NULL,
+    bucket TIMESTAMP NOT NULL,
+    sample_count INTEGER NOT NULL,
+    temperature_min FLOAT,
+    temperature_max FLOAT,
+    temperature_sum FLOAT NOT NULL DEFAULT 0,
+    temperature_count INTEGER NOT NULL DEFAULT 0,
+    temperature_avg FLOAT GENERATED ALWAYS AS
+        (temperature_sum / NULLIF(temperature_count, 0)) STORED,
+    humidity_min INTEGER,
+    humidity_max INTEGER,
+    humidity_sum BIGINT NOT NULL DEFAULT 0,
+    humidity_count INTEGER NOT NULL DEFAULT 0,
+    humidity_avg FLOAT GENERATED ALWAYS AS
+        (humidity_sum::FLOAT / NULLIF(humidity_count, 0)) STORED,
+    PRIMARY KEY (city, bucket)
+);
+
+-- Daily aggregates per city
+CREATE TABLE IF NOT EXISTS weather_daily (
+    city VARCHAR(100) NOT NULL,
+    bucket TIMESTAMP NOT NULL,
+    sample_count INTEGER NOT NULL,
+    temperature_min FLOAT,
+    temperature_max FLOAT,
+    temperature_sum FLOAT NOT NULL DEFAULT 0,
+    temperature_count INTEGER NOT NULL DEFAULT 0,
+    temperature_avg FLOAT GENERATED ALWAYS AS
+        (temperature_sum / NULLIF(temperature_count, 0)) STORED,
+    humidity_min INTEGER,
+    humidity_max INTEGER,
+    humidity_sum BIGINT NOT NULL DEFAULT 0,
+    humidity_count INTEGER NOT NULL DEFAULT 0,
+    humidity_avg FLOAT GENERATED ALWAYS AS
+        (humidity_sum::FLOAT / NULLIF(humidity_count, 0)) STORED,
+    PRIMARY KEY (city, bucket)
+);
+
+CREATE INDEX IF NOT EXISTS idx_weather_hourly_bucket
+ON weather_hourly(bucket);
+
+CREATE INDEX IF NOT EXISTS idx_weather_daily_bucket
+ON weather_daily(bucket);
+
+-- Populate rollups from rows loaded before they existed (no-op on a fresh database)
+INSERT INTO latest_measurements
+    (city, measurement_time, temperature_celsius, humidity, pressure, wind_speed)
+SELECT DISTINCT ON (city)
+    city, measurement_time, temperature_celsius, humidity, pressure, wind_speed
+FROM weather_measurements
+ORDER BY city, measurement_time DESC
+ON CONFLICT (city) DO NOTHING;
+
+INSERT INTO weather_hourly
+    (city, bucket, sample_count, temperature_min, temperature_max,
+     temperature_sum, temperature_count, humidity_min, humidity_max,
+     humidity_sum, humidity_count)
+SELECT city, date_trunc('hour', measurement_time), COUNT(*),
+    MIN(temperature_celsius), MAX(temperature_celsius),
+    COALESCE(SUM(temperature_celsius), 0), COUNT(temperature_celsius),
+    MIN(humidity), MAX(humidity), COALESCE(SUM(humidity), 0), COUNT(humidity)
+FROM weather_measurements
+GROUP BY 1, 2
+ON CONFLICT (city, bucket) DO NOTHING;
+
+INSERT INTO weather_daily
+    (city, bucket, sample_count, temperature_min, temperature_max,
+     temperature_sum, temperature_count, humidity_min, humidity_max,
+     humidity_sum, humidity_count)
+SELECT city, date_trunc('day', measurement_time), COUNT(*),
+    MIN(temperature_celsius), MAX(temperature_celsius),
+    COALESCE(SUM(temperature_celsius), 0), COUNT(temperature_celsius),
+    MIN(humidity), MAX(humidity), COALESCE(SUM(humidity), 0), COUNT(humidity)
+FROM weather_measurements
+GROUP BY 1, 2
+ON CONFLICT (city, bucket) DO NOTHING;
@@ -0,0 +1,389 @@
+import json
+import hashlib
+import logging
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import List, Optional
+from .config import load_config
+from .db import get_connection
+from .extract.request_budget import RequestBudget
+from .extract.weather_api import WeatherAPI
+from .load.db_loader import save_to_database
+from .load.partitions import (
+    add_months,
+    create_partition,
+    is_partitioned,
+    month_start,
+    partition_name,
+)
+from .transform.data_processor import transform_to_batch
+from .transform.records import WeatherRecord
+from .utils.files import write_json_atomic
+from .utils.logger import setup_logging
+from .validation import validate_data
+from .utils.metrics import LAST_SUCCESS, export_metrics
+
+logger = logging.getLogger(__name__)
+
+Chunk = tuple[str, datetime, datetime]
+
+
+def plan_chunks(
+    cities: List[str], start: date, end: date, chunk_days: int
+) -> List[Chunk]:
+    """
+    Split a date range into per-city chunks.
+
+    Args:
+        cities: City names
+        start: First day of the range (inclusive, UTC)
+        end: Last day of the range (exclusive, UTC)
+        chunk_days: Days per chunk
+
+    Returns:
+        List of (city, chunk_start, chunk_end) tuples with UTC datetimes
+    """
+    range_start = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+    range_end = datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc)
+    step = timedelta(days=max(1, chunk_days))
+
+    windows = []
+    chunk_start = range_start
+    while chunk_start < range_end:
+        chunk_end = min(chunk_start + step, range_end)
+        windows.append((chunk_start, chunk_end))
+        chunk_start = chunk_end
+
+    return [(city, window[0], window[1]) for window in windows for city in cities]
+
+
+def chunk_key(chunk: Chunk) -> str:
+    """Stable checkpoint key of a chunk."""
+    city, chunk_start, _ = chunk
+    return f"{city}|{chunk_start.isoformat()}"
+
+
+class BackfillCheckpoint:
+    """
+    On-disk record of completed backfill chunks.
+
+    A chunk is marked only after its rows are committed, so an interrupted
+    backfill resumes with the first chunk that was not loaded.
+
+    Attributes:
+        path: JSON file the checkpoint is persisted to
+        params: Backfill parameters stored alongside the chunks
+    """
+
+    def __init__(self, path: str, params: Optional[dict] = None):
+        """
+        Initialize the checkpoint and load completed chunks from disk.
+
+        Args:
+            path: JSON file to persist the checkpoint to
+            params: Backfill parameters to store for reference
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.params = params or {}
+        self._completed: set[str] = set()
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._completed = set(json.load(f)["completed"])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._completed
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+    def mark(self, keys: List[str]) -> None:
+        """
+        Mark chunks as completed and persist the checkpoint.
+
+        Args:
+            keys: Chunk keys returned by ``chunk_key``
+        """
+        self._completed.update(keys)
+        write_json_atomic(
+            self.path, {**self.params, "completed": sorted(self._completed)}, indent=2
+        )
+
+
+def checkpoint_path(
+    cities: List[str], start: date, end: date, chunk_days: int, checkpoint_dir: str
+) -> Path:
+    """Checkpoint file for a backfill, so rerunning it resumes the same job."""
+    digest = hashlib.sha1(
+        json.dumps([sorted(cities), str(start), str(end), chunk_days]).encode()
+    ).hexdigest()[:12]
+    return Path(checkpoint_dir) / f"backfill_{start}_{end}_{digest}.json"
+
+
+def ensure_backfill_partitions(start: date, end: date) -> List[str]:
+    """
+    Create monthly partitions covering the backfill range.
+
+    Args:
+        start: First day of the range
+        end: Last day of the range (exclusive)
+
+    Returns:
+        Names of created partitions (empty if the table is not partitioned)
+    """
+    created = []
+    with get_connection() as dbconnect:
+        try:
+            with dbconnect.cursor() as cursor:
+                if is_partitioned(cursor):
+                    month = month_start(start)
+                    while month < end:
+                        if create_partition(cursor, month):
+                            created.append(partition_name(month))
+                        month = add_months(month, 1)
+            dbconnect.commit()
+        except Exception:
+            dbconnect.rollback()
+            raise
+    if created:
+        logger.info("Created partitions for backfill: %s", ", ".join(created))
+    return created
+
+
+def run_backfill(
+    start: date,
+    end: date,
+    cities: Optional[List[str]] = None,
+    chunk_days: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    requests_per_minute: Optional[float] = None,
+    max_requests: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+) -> dict:
+    """
+    Backfill historical hourly observations into the database.
+
+    The range is split into per-city chunks of ``chunk_days`` that are
+    fetched from the history endpoint concurrently under a shared request
+    budget. Fetched chunks are transformed and validated in the worker
+    threads and bulk loaded in batches of ``backfill.load_batch_size`` rows;
+    each batch is checkpointed after it commits, so a rerun with the same
+    arguments skips completed chunks. Failed chunks are left for the next run.
+
+    Args:
+        start: First day of the range (inclusive, UTC)
+        end: Last day of the range (exclusive, UTC)
+        cities: Cities to backfill. If None, uses ``cities`` from config.yaml
+        chunk_days: Days per request. If None, uses ``backfill.chunk_days``
+        max_workers: Concurrent requests. If None, uses ``backfill.max_workers``
+        requests_per_minute: Request rate limit. If None, uses
+            ``backfill.requests_per_minute``
+        max_requests: Request cap for this run. If None, uses
+            ``backfill.max_requests``
+        checkpoint: Checkpoint file. If None, derived from the arguments
+            inside ``backfill.checkpoint_dir``
+
+    Returns:
+        Dict with "chunks", "skipped", "completed", "failed", "remaining",
+        "requests", "inserted" and "duplicates" counts
+
+    Raises:
+        ValueError: If the range is empty
+    """
+    if end <= start:
+        raise ValueError(f"Empty backfill range: {start} to {end}")
+
+    config = load_config()
+    setup_logging()
+    backfill_config = config.get("backfill", {})
+    if cities is None:
+        cities = config["cities"]
+    if chunk_days is None:
+        chunk_days = backfill_config.get("chunk_days", 7)
+    if max_workers is None:
+        max_workers = backfill_config.get("max_workers", 8)
+    if requests_per_minute is None:
+        requests_per_minute = backfill_config.get("requests_per_minute")
+    if max_requests is None:
+        max_requests = backfill_config.get("max_requests")
+    if checkpoint is None:
+        checkpoint = checkpoint_path(
+            cities,
+            start,
+            end,
+            chunk_days,
+            backfill_config.get("checkpoint_dir", "data/backfill/"),
+        )
+    load_batch_size = backfill_config.get("load_batch_size", 5000)
+
+    progress = BackfillCheckpoint(
+        checkpoint,
+        {"cities": cities, "start": str(start), "end": str(end), "days": chunk_days},
+    )
+    chunks = plan_chunks(cities, start, end, chunk_days)
+    todo = [chunk for chunk in chunks if chunk_key(chunk) not in progress]
+    stats = {
+        "chunks": len(chunks),
+        "skipped": len(chunks) - len(todo),
+        "completed": 0,
+        "failed": 0,
+        "remaining": 0,
+        "requests": 0,
+        "inserted": 0,
+        "duplicates": 0,
+    }
+    logger.info(
+        "Backfilling %d cities from %s to %s: %d chunks, %d already done",
+        len(cities),
+        start,
+        end,
+        len(chunks),
+        stats["skipped"],
+    )
+    if not todo:
+        return stats
+
+    ensure_backfill_partitions(start, end)
+    weather_api = WeatherAPI(config)
+    budget = RequestBudget(requests_per_minute, max_requests)
+
+    def fetch(chunk: Chunk) -> tuple[bool, Optional[list]]:
+        """Fetch, transform and validate one chunk; returns (attempted, records)."""
+        if not budget.acquire():
+            return False, None
+        city, chunk_start, chunk_end = chunk
+        payloads = weather_api.fetch_history(
+            city, int(chunk_start.timestamp()), int(chunk_end.timestamp())
+        )
+        if payloads is None:
+            return True, None
+        try:
+            records = validate_data(transform_to_batch(payloads)).records()
+        except ValueError as e:
+            logger.error("Invalid history data for %s: %s", chunk_key(chunk), e)
+            return True, None
+        return True, records
+
+    batch_records: List[WeatherRecord] = []
+    batch_keys: List[str] = []
+
+    def flush() -> None:
+        if batch_records:
+            inserted, duplicates = save_to_database(batch_records, bulk=True)
+            stats["inserted"] += inserted
+            stats["duplicates"] += duplicates
+        progress.mark(batch_keys)
+        stats["completed"] += len(batch_keys)
+        logger.info(
+            "Backfill progress: %d/%d chunks",
+            stats["skipped"] + stats["completed"],
+            stats["chunks"],
+        )
+        batch_records.clear()
+        batch_keys.clear()
+
+    workers = max(1, min(max_workers, len(todo)))
+    pending = iter(todo)
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="backfill"
+        ) as executor:
+            futures = {
+                executor.submit(fetch, chunk): chunk
+                for chunk in islice(pending, 2 * workers)
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = futures.pop(future)
+                    if not budget.exhausted:
+                        for next_chunk in islice(pending, 1):
+                            futures[executor.submit(fetch, next_chunk)] = next_chunk
+                    attempted, records = future.result()
+                    if records is None:
+                        stats["failed"] += attempted
+                        continue
+                    batch_records.extend(records)
+                    batch_keys.append(chunk_key(chunk))
+                    if len(batch_records) >= load_batch_size:
+                        flush()
+    except KeyboardInterrupt:
+        logger.warning("Backfill interrupted; saving completed chunks")
+        flush()
+        raise
+    finally:
+        weather_api.close()
+
+    if batch_keys:
+        flush()
+
+    stats["requests"] = budget.used
+    stats["remaining"] = stats["chunks"] - stats["skipped"] - stats["completed"]
+    if budget.exhausted and stats["remaining"]:
+        logger.warning(
+            "Request budget of %d exhausted; rerun to continue the remaining %d chunks",
+            max_requests,
+            stats["remaining"],
+        )
+    logger.info(
+        "Backfill finished: %d chunks loaded, %d failed, %d remaining, "
+        "inserted %d, duplicates %d",
+        stats["completed"],
+        stats["failed"],
+        stats["remaining"],
+        stats["inserted"],
+        stats["duplicates"],
+    )
+    LAST_SUCCESS.labels("backfill").set_to_current_time()
+    export_metrics("backfill")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point for a historical backfill."""
+    parser = argparse.ArgumentParser(
+        description="Backfill historical weather observations."
+    )
+    parser.add_argument(
+        "--start", required=True, type=date.fromisoformat, help="YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--end",
+        required=True,
+        type=date.fromisoformat,
+        help="YYYY-MM-DD (exclusive)",
+    )
+    parser.add_argument(
+        "--cities", help="comma-separated city names (default: config cities)"
+    )
+    parser.add_argument("--chunk-days", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--requests-per-minute", type=float)
+    parser.add_argument("--max-requests", type=int)
+    parser.add_argument("--checkpoint", help="checkpoint file to resume from")
+    args = parser.parse_args(argv)
+
+    cities = None
+    if args.cities:
+        cities = [city.strip() for city in args.cities.split(",") if city.strip()]
+
+    run_backfill(
+        args.start,
+        args.end,
+        cities=cities,
+        chunk_days=args.chunk_days,
+        max_workers=args.workers,
+        requests_per_minute=args.requests_per_minute,
+        max_requests=args.max_requests,
+        checkpoint=args.checkpoint,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,81 @@
+import os
+import threading
 import yaml
 from pathlib import Path
+from typing import Optional
 
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "config.yaml"
 
-def load_config():
-    """Load configuration from config.yaml"""
+REQUIRED_KEYS = {
+    "api": ("base_url", "timeout"),
+    "log": ("logs_dir", "logs_filename"),
+}
 
-    config_path = Path(__file__).parent.parent / "config" / "config.yaml"
+_cache: dict[Path, tuple[int, dict]] = {}
+_cache_lock = threading.Lock()
 
-    with open(config_path, "r") as f:
+
+def shard_suffix(shard: Optional[int]) -> str:
+    """File and job name suffix of a city shard ("" outside sharded runs)."""
+    return "" if shard is None else f"-{shard:04d}"
+
+
+def shard_path(path: str, shard: Optional[int]) -> str:
+    """Per-shard variant of a state file path (unchanged outside sharded runs)."""
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}{shard_suffix(shard)}{path.suffix}"))
+
+
+def validate_config(config: dict) -> None:
+    """
+    Check that the configuration has the sections the pipeline relies on.
+
+    Args:
+        config: Parsed configuration
+
+    Raises:
+        ValueError: If a required section or key is missing
+    """
+    if not isinstance(config, dict):
+        raise ValueError("Configuration must be a mapping")
+    for section, keys in REQUIRED_KEYS.items():
+        if not isinstance(config.get(section), dict):
+            raise ValueError(f"Missing '{section}' section in configuration")
+        for key in keys:
+            if key not in config[section]:
+                raise ValueError(f"Missing '{section}.{key}' in configuration")
+    if not isinstance(config.get("cities"), list):
+        raise ValueError("'cities' must be a list in configuration")
+
+
+def load_config(config_path: Optional[Path] = None) -> dict:
+    """Load configuration from config.yaml
+
+    The parsed configuration is cached and only re-read when the file's
+    modification time changes. The returned dict is shared between callers
+    and must not be modified.
+
+    Args:
+        config_path: Path to the YAML file (defaults to config/config.yaml)
+
+    Returns:
+        dict: Validated configuration
+
+    Raises:
+        ValueError: If the configuration is missing required keys
+    """
+    path = Path(config_path) if config_path is not None else CONFIG_PATH
+    mtime = os.stat(path).st_mtime_ns
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, "r") as f:
         config = yaml.safe_load(f)
+    validate_config(config)
 
+    with _cache_lock:
+        _cache[path] = (mtime, config)
     return config
@@ -0,0 +1,259 @@
+import os
+import time
+import logging
+import threading
+import psycopg2
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from dotenv import load_dotenv
+from .config import load_config
+
+
+def get_db_connection():
+    """Create database connection."""
+    load_dotenv()
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST"),
+        port=os.getenv("DB_PORT"),
+        database=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of PostgreSQL connections.
+
+    At most ``max_size`` connections are checked out at once; callers wait
+    up to ``timeout`` seconds for a free slot. Idle connections are checked
+    with ``SELECT 1`` before reuse and connections older than
+    ``max_lifetime`` seconds are closed and replaced.
+
+    Attributes:
+        min_size: Number of connections opened up front and kept idle
+        max_size: Maximum number of open connections
+        max_lifetime: Seconds after which a connection is recycled
+        health_check_interval: Idle seconds after which a connection is pinged
+        timeout: Seconds to wait for a free connection
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 5,
+        max_lifetime: float = 3600,
+        health_check_interval: float = 30,
+        timeout: float = 30,
+        connect: Optional[Callable] = None,
+    ):
+        """
+        Initialize the pool and open ``min_size`` connections.
+
+        Args:
+            min_size: Number of connections opened up front
+            max_size: Maximum number of open connections
+            max_lifetime: Seconds after which a connection is recycled
+            health_check_interval: Idle seconds after which a connection is pinged
+            timeout: Seconds to wait for a free connection
+            connect: Connection factory (defaults to ``get_db_connection``)
+
+        Raises:
+            ValueError: If the sizes are invalid
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool size: min_size={min_size}, max_size={max_size}"
+            )
+
+        self.logger = logging.getLogger(__name__)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._connect = connect or get_db_connection
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: deque = deque()
+        self._created: dict[int, float] = {}
+        self._closed = False
+
+        for _ in range(min_size):
+            conn = self._open()
+            self._idle.append((conn, time.monotonic()))
+
+    def _open(self):
+        conn = self._connect()
+        with self._lock:
+            self._created[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._created.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn) -> bool:
+        created = self._created.get(id(conn), 0.0)
+        return time.monotonic() - created >= self.max_lifetime
+
+    def _healthy(self, conn, idle_since: float) -> bool:
+        """Check that an idle connection is open and answers queries."""
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not conn.autocommit:
+                conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            self.logger.warning("Discarding unhealthy connection: %s", e)
+            return False
+
+    def getconn(self):
+        """
+        Check a connection out of the pool.
+
+        Returns:
+            An open psycopg2 connection
+
+        Raises:
+            PoolError: If the pool is closed or no connection is free in time
+        """
+        if self._closed:
+            raise PoolError("connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(
+                f"no free connection after {self.timeout}s (max_size={self.max_size})"
+            )
+
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    conn, idle_since = self._idle.pop()
+                if self._expired(conn) or not self._healthy(conn, idle_since):
+                    self._discard(conn)
+                    continue
+                return conn
+            return self._open()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Open transactions are rolled back. Broken, expired or explicitly
+        discarded connections are closed instead of being kept.
+
+        Args:
+            conn: Connection obtained from ``getconn``
+            discard: Close the connection instead of keeping it
+        """
+        try:
+            if discard or self._closed or conn.closed or self._expired(conn):
+                self._discard(conn)
+                return
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.autocommit = False
+            except psycopg2.Error:
+                self._discard(conn)
+                return
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """
+        Context manager that checks a connection out and returns it.
+
+        Connections that raised a connection-level error are discarded.
+
+        Yields:
+            An open psycopg2 connection
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self.putconn(conn, discard=True)
+            raise
+        except BaseException:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    def closeall(self) -> None:
+        """Close all idle connections and refuse further checkouts."""
+        self._closed = True
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Get the process-wide connection pool, creating it on first use.
+
+    Pool settings are read from ``database.pool`` in config.yaml.
+
+    Returns:
+        Shared ConnectionPool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool_config = load_config().get("database", {}).get("pool", {})
+            _pool = ConnectionPool(
+                min_size=pool_config.get("min_size", 1),
+                max_size=pool_config.get("max_size", 5),
+                max_lifetime=pool_config.get("max_lifetime", 3600),
+                health_check_interval=pool_config.get("health_check_interval", 30),
+                timeout=pool_config.get("timeout", 30),
+            )
+        return _pool
+
+
+@contextmanager
+def get_connection() -> Iterator:
+    """
+    Borrow a connection from the shared pool.
+
+    Yields:
+        An open psycopg2 connection, returned to the pool on exit
+    """
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def close_pool() -> None:
+    """Close the shared connection pool, if it was created."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
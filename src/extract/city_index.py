@@ -0,0 +1,80 @@
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+from ..utils.files import write_json_atomic
+
+
+class CityIndex:
+    """
+    On-disk mapping of configured city names to OpenWeatherMap city IDs.
+
+    IDs are learned from the ``id`` field of per-city responses, so each
+    city is resolved once and can then be fetched through the multi-city
+    group endpoint.
+
+    Attributes:
+        path: JSON file the index is persisted to
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the index and load existing entries from disk.
+
+        Args:
+            path: JSON file to persist the index to
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self._ids: dict[str, int] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._ids = {key: int(value) for key, value in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                self.logger.warning("Ignoring unreadable city index %s: %s", path, e)
+
+    @staticmethod
+    def _key(city: str) -> str:
+        return city.strip().lower()
+
+    def get(self, city: str) -> Optional[int]:
+        """
+        Get the city ID for a configured city name.
+
+        Args:
+            city: City name as passed to the API
+
+        Returns:
+            OpenWeatherMap city ID, or None if the city is not resolved yet
+        """
+        return self._ids.get(self._key(city))
+
+    def add(self, city: str, city_id) -> None:
+        """
+        Record the city ID returned for a city name.
+
+        Args:
+            city: City name as passed to the API
+            city_id: ``id`` field of the API response (ignored if missing)
+        """
+        if not isinstance(city_id, int) or city_id <= 0:
+            return
+        key = self._key(city)
+        if self._ids.get(key) != city_id:
+            self._ids[key] = city_id
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the index to disk if it changed."""
+        if not self._dirty:
+            return
+        try:
+            write_json_atomic(self.path, self._ids, indent=2, sort_keys=True)
+            self._dirty = False
+        except OSError as e:
+            self.logger.error("Failed to save city index to %s: %s", self.path, e)
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,105 @@
+import msgspec
+from typing import Optional, Union
+
+
+class MainFields(msgspec.Struct, gc=False):
+    """The ``main`` section fields used by the transform."""
+
+    temp: Optional[float] = None
+    humidity: Optional[int] = None
+    pressure: Optional[int] = None
+
+
+class WindFields(msgspec.Struct, gc=False):
+    """The ``wind`` section fields used by the transform."""
+
+    speed: Optional[float] = None
+
+
+class WeatherPayload(msgspec.Struct, gc=False):
+    """
+    Typed subset of an OpenWeatherMap current weather response.
+
+    Only the fields read by the transform (plus ``id`` for the city index)
+    are declared; every other field is skipped by the decoder without being
+    materialized.
+    """
+
+    name: Optional[str] = None
+    dt: Optional[int] = None
+    id: Optional[int] = None
+    main: Optional[MainFields] = None
+    wind: Optional[WindFields] = None
+
+
+class _PayloadList(msgspec.Struct, gc=False, rename={"items": "list"}):
+    """Envelope of the group and history endpoints."""
+
+    items: list[WeatherPayload] = []
+
+
+_payload_decoder = msgspec.json.Decoder(WeatherPayload)
+_list_decoder = msgspec.json.Decoder(_PayloadList)
+_encoder = msgspec.json.Encoder()
+
+Payload = Union[dict, WeatherPayload]
+
+
+def decode_weather(content: Union[bytes, str]) -> WeatherPayload:
+    """
+    Decode a current weather response body into a typed payload.
+
+    Args:
+        content: Raw JSON response body
+
+    Returns:
+        Decoded payload
+
+    Raises:
+        msgspec.DecodeError: If the body is not valid JSON or a declared
+            field has the wrong type (a ValueError subclass)
+    """
+    return _payload_decoder.decode(content)
+
+
+def decode_weather_list(content: Union[bytes, str]) -> list[WeatherPayload]:
+    """
+    Decode the ``list`` of a group or history response into typed payloads.
+
+    Args:
+        content: Raw JSON response body
+
+    Returns:
+        Decoded payloads
+
+    Raises:
+        msgspec.DecodeError: If the body is not valid JSON or a declared
+            field has the wrong type (a ValueError subclass)
+    """
+    return _list_decoder.decode(content).items
+
+
+def payload_field(payload: Payload, key: str):
+    """Read a top-level field of a dict or typed payload (None if missing)."""
+    if isinstance(payload, WeatherPayload):
+        return getattr(payload, key, None)
+    return payload.get(key)
+
+
+def with_name(payload: Payload, name: str) -> Payload:
+    """Return a copy of a dict or typed payload with ``name`` set."""
+    if isinstance(payload, WeatherPayload):
+        return msgspec.structs.replace(payload, name=name)
+    return {**payload, "name": name}
+
+
+def encode_payload(payload: Payload) -> bytes:
+    """Encode a dict or typed payload as JSON."""
+    return _encoder.encode(payload)
+
+
+def payload_to_dict(payload: Payload) -> dict:
+    """Return a payload as a plain dict (typed payloads are converted)."""
+    if isinstance(payload, WeatherPayload):
+        return msgspec.to_builtins(payload)
+    return payload
@@ -0,0 +1,66 @@
+import time
+import threading
+from typing import Callable, Optional
+
+
+class RequestBudget:
+    """
+    Thread-safe request budget shared by concurrent workers.
+
+    Requests are spaced evenly to stay under ``per_minute``, and no more
+    than ``max_requests`` are granted in total, so a large job can be run
+    within the API plan's limits and continued later.
+
+    Attributes:
+        per_minute: Maximum request rate, or None for no rate limit
+        max_requests: Maximum number of requests, or None for no cap
+        used: Number of requests granted so far
+    """
+
+    def __init__(
+        self,
+        per_minute: Optional[float] = None,
+        max_requests: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            per_minute: Maximum request rate, or None for no rate limit
+            max_requests: Maximum number of requests, or None for no cap
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.per_minute = per_minute
+        self.max_requests = max_requests
+        self.used = 0
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_slot = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the total request cap has been reached."""
+        return self.max_requests is not None and self.used >= self.max_requests
+
+    def acquire(self) -> bool:
+        """
+        Wait for the next request slot.
+
+        Returns:
+            True if a request may be sent, False if the budget is exhausted
+        """
+        with self._lock:
+            if self.exhausted:
+                return False
+            self.used += 1
+            now = self._clock()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            self._sleep(slot - now)
+        return True
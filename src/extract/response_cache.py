@@ -0,0 +1,150 @@
+import json
+import time
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from ..utils.files import write_json_atomic
+
+
+class ResponseCache:
+    """
+    Disk-backed LRU cache of the last API response seen per city.
+
+    OpenWeatherMap refreshes current conditions only every few minutes, so a
+    city whose last measurement (``dt``) is younger than ``refresh_interval``
+    cannot have new data yet and does not need to be requested again.
+
+    Attributes:
+        path: JSON file the cache is persisted to
+        ttl: Maximum age of an entry in seconds before it is discarded
+        refresh_interval: Seconds after ``dt`` during which data is unchanged
+        max_entries: Maximum number of cities kept (least recently used evicted)
+        hits: Number of lookups answered from the cache since creation
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600,
+        refresh_interval: float = 600,
+        max_entries: int = 1000,
+    ):
+        """
+        Initialize the cache and load existing entries from disk.
+
+        Args:
+            path: JSON file to persist the cache to
+            ttl: Maximum age of an entry in seconds
+            refresh_interval: Seconds after ``dt`` during which data is unchanged
+            max_entries: Maximum number of cities kept
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._load()
+
+    @staticmethod
+    def _key(city: str) -> str:
+        return city.strip().lower()
+
+    def _load(self) -> None:
+        """Read entries from disk, dropping the ones older than ``ttl``."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable cache %s: %s", self.path, e)
+            return
+
+        now = time.time()
+        for key, entry in sorted(entries.items(), key=lambda kv: kv[1]["accessed"]):
+            if now - entry["fetched_at"] < self.ttl:
+                self._entries[key] = entry
+
+    def is_fresh(self, city: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether the cached data for a city cannot have changed yet.
+
+        A fresh lookup counts as a cache hit.
+
+        Args:
+            city: City name as passed to the API
+            now: Current Unix time (defaults to ``time.time()``)
+
+        Returns:
+            True if the city does not need to be fetched again
+        """
+        if now is None:
+            now = time.time()
+        key = self._key(city)
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        if now - entry["fetched_at"] >= self.ttl:
+            del self._entries[key]
+            return False
+        if now >= entry["dt"] + self.refresh_interval:
+            return False
+
+        entry["accessed"] = now
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def get(self, city: str) -> Optional[dict]:
+        """
+        Get the last cached payload for a city.
+
+        Args:
+            city: City name as passed to the API
+
+        Returns:
+            Cached payload, or None if the city is not cached
+        """
+        entry = self._entries.get(self._key(city))
+        return entry["payload"] if entry is not None else None
+
+    def put(self, city: str, payload: dict, now: Optional[float] = None) -> None:
+        """
+        Store the payload fetched for a city.
+
+        Payloads without a ``dt`` field are not cached.
+
+        Args:
+            city: City name as passed to the API
+            payload: Raw API response
+            now: Current Unix time (defaults to ``time.time()``)
+        """
+        dt = payload.get("dt") if isinstance(payload, dict) else None
+        if not isinstance(dt, (int, float)):
+            return
+        if now is None:
+            now = time.time()
+
+        key = self._key(city)
+        self._entries[key] = {
+            "dt": dt,
+            "fetched_at": now,
+            "accessed": now,
+            "payload": payload,
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Persist the cache to disk atomically."""
+        try:
+            write_json_atomic(self.path, self._entries)
+        except OSError as e:
+            self.logger.error("Failed to save cache to %s: %s", self.path, e)
+
+    def __len__(self) -> int:
+        return len(self._entries)
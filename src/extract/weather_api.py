@@ -1,11 +1,30 @@
 import os
+import time
+import random
 import logging
 import requests
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from typing import Iterator, Optional
 from dotenv import load_dotenv
-from ..config import load_config
+from requests.adapters import HTTPAdapter
+from ..config import load_config, shard_path
+from ..utils.metrics import EXTRACT_CACHE_HITS, HTTP_REQUEST_SECONDS, HTTP_RESPONSES
+from .city_index import CityIndex
+from .decoder import (
+    Payload,
+    decode_weather,
+    decode_weather_list,
+    payload_field,
+    payload_to_dict,
+    with_name,
+)
+from .response_cache import ResponseCache
 
-load_dotenv()
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_STATUS_CODES = frozenset({429, 503})
 
 
 class WeatherAPI:
@@ -16,14 +35,29 @@ class WeatherAPI:
         api_key: OpenWeatherMap API key
         base_url: API endpoint URL
         timeout: Request timeout in seconds
+        max_workers: Maximum number of concurrent requests
+        retries: Number of retries for timeouts, connection errors and 429/5xx
+        backoff: Base delay in seconds for exponential backoff
+        backoff_max: Upper bound for a single backoff delay in seconds
+        session: Persistent HTTP session with a keep-alive connection pool
+        group_url: Multi-city (group by IDs) endpoint URL
+        group_size: Maximum number of city IDs per group request
+        history_url: Hourly history endpoint URL used for backfills
+        typed_decoding: Decode response bodies straight into typed
+            ``WeatherPayload`` structs instead of dicts
+        cache: Response cache used to skip unchanged cities, or None
+        city_index: Index of city names to IDs used for group requests, or None
+        cache_hits: Number of cities skipped because of the cache
     """
 
-    def __init__(self, config: Optional[dict] = None):
+    def __init__(self, config: Optional[dict] = None, shard: Optional[int] = None):
         """
         Initialize WeatherAPI client.
 
         Args:
             config: Configuration dictionary. If None, loads from config.yaml
+            shard: City shard index. Mapped shard tasks run concurrently, so
+                each shard keeps its own response cache and city index file
 
         Raises:
             Exception: If OPENWEATHER_API_KEY not found in environment
@@ -31,54 +65,482 @@ class WeatherAPI:
         if config is None:
             config = load_config()
 
+        load_dotenv()
         self.logger = logging.getLogger(__name__)
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
         self.base_url = config["api"]["base_url"]
         self.timeout = config["api"]["timeout"]
+        self.max_workers = max(1, int(config["api"].get("max_workers", 1)))
+        self.retries = max(0, int(config["api"].get("retries", 0)))
+        self.backoff = float(config["api"].get("backoff", 0.5))
+        self.backoff_max = float(config["api"].get("backoff_max", 30))
+        self.group_url = config["api"].get(
+            "group_url", "https://api.openweathermap.org/data/2.5/group"
+        )
+        self.group_size = max(1, int(config["api"].get("group_size", 20)))
+        self.history_url = config["api"].get(
+            "history_url", "https://history.openweathermap.org/data/2.5/history/city"
+        )
+        self.typed_decoding = bool(config["api"].get("typed_decoding", False))
         if not self.api_key:
             raise Exception("OPENWEATHER_API_KEY not found in .env file.")
 
-    def get_weather_data(self, cities: list[str]) -> list[dict]:
+        pool_size = int(config["api"].get("pool_size", self.max_workers))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.cache_hits = 0
+        self.cache = None
+        cache_config = config.get("cache", {})
+        if cache_config.get("enabled", False):
+            self.cache = ResponseCache(
+                shard_path(cache_config["path"], shard),
+                ttl=cache_config.get("ttl", 3600),
+                refresh_interval=cache_config.get("refresh_interval", 600),
+                max_entries=cache_config.get("max_entries", 1000),
+            )
+
+        self.city_index = None
+        index_config = config.get("city_index", {})
+        if index_config.get("enabled", False):
+            self.city_index = CityIndex(shard_path(index_config["path"], shard))
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def get_weather_data(self, cities: list[str]) -> list[Payload]:
         """
         Fetch weather data for multiple cities.
 
+        Requests run concurrently on up to ``max_workers`` threads, so the
+        total time is bounded by the slowest batch rather than the sum of
+        all requests. Cities with a known ID are fetched through the group
+        endpoint, up to ``group_size`` per request. When the response cache
+        is enabled, cities whose last measurement cannot have been refreshed
+        yet are skipped and counted in ``cache_hits``.
+
         Args:
             cities: List of city names
 
         Returns:
-            List of weather data dictionaries for successfully fetched cities
+            List of weather data dictionaries (typed payloads with
+            ``typed_decoding``) for successfully fetched cities,
+            in the same order as ``cities`` (cache hits are not included)
 
         Note:
             Skips cities with errors and logs them. Does not raise exceptions.
         """
+        cities = self._skip_cached(cities)
+        if not cities:
+            return []
+
+        jobs = self._plan_jobs(cities)
+        workers = min(self.max_workers, len(jobs))
+        if workers == 1:
+            fetched = [self._run_job(job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="weather-api"
+            ) as executor:
+                fetched = list(executor.map(self._run_job, jobs))
+
+        by_city = {}
+        for job_results in fetched:
+            for city, data in job_results:
+                self._remember(city, data)
+                by_city[city] = data
+        self._save_state()
+
+        return [by_city[city] for city in cities if city in by_city]
+
+    def iter_weather_data(
+        self, cities: list[str], heartbeat: Optional[float] = None
+    ) -> Iterator[Optional[Payload]]:
+        """
+        Fetch weather data for multiple cities, yielding payloads as they arrive.
+
+        At most ``2 * max_workers`` requests are in flight at once, so memory
+        does not grow with the length of ``cities``.
+
+        Args:
+            cities: List of city names
+            heartbeat: If set, yield None whenever no payload arrived within
+                this many seconds, so callers can act on timers
+
+        Yields:
+            Weather data dictionaries in completion order (or None heartbeats)
+
+        Note:
+            Skips cities with errors and logs them. Does not raise exceptions.
+        """
+        cities = self._skip_cached(cities)
+        if not cities:
+            return
+
+        jobs = self._plan_jobs(cities)
+        pending_jobs = iter(jobs)
+        workers = min(self.max_workers, len(jobs))
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="weather-api"
+            ) as executor:
+                futures = {
+                    executor.submit(self._run_job, job)
+                    for job in islice(pending_jobs, 2 * workers)
+                }
+                while futures:
+                    done, futures = wait(
+                        futures, timeout=heartbeat, return_when=FIRST_COMPLETED
+                    )
+                    if not done:
+                        yield None
+                        continue
+                    for future in done:
+                        for next_job in islice(pending_jobs, 1):
+                            futures.add(executor.submit(self._run_job, next_job))
+                        for city, data in future.result():
+                            self._remember(city, data)
+                            yield data
+        finally:
+            self._save_state()
+
+    def _skip_cached(self, cities: list[str]) -> list[str]:
+        """
+        Drop cities whose cached data cannot have changed yet.
+
+        Args:
+            cities: List of city names
+
+        Returns:
+            Cities that still need to be fetched
+        """
+        if self.cache is None:
+            return cities
+        pending = [city for city in cities if not self.cache.is_fresh(city)]
+        skipped = len(cities) - len(pending)
+        if skipped:
+            self.cache_hits += skipped
+            EXTRACT_CACHE_HITS.inc(skipped)
+            self.logger.info("Skipped %d unchanged cities (cache hits)", skipped)
+        return pending
+
+    def _plan_jobs(self, cities: list[str]) -> list[list[str]]:
+        """
+        Split cities into request jobs.
+
+        Cities with a known ID are grouped into jobs of up to ``group_size``
+        cities for the group endpoint; the rest get one job per city.
+
+        Args:
+            cities: List of city names
+
+        Returns:
+            List of jobs, each a list of city names
+        """
+        if self.city_index is None:
+            return [[city] for city in cities]
+
+        resolved = [city for city in cities if self.city_index.get(city) is not None]
+        unresolved = [city for city in cities if self.city_index.get(city) is None]
+        jobs = [
+            resolved[i : i + self.group_size]
+            for i in range(0, len(resolved), self.group_size)
+        ]
+        jobs.extend([city] for city in unresolved)
+        if resolved:
+            self.logger.info(
+                "Fetching %d cities in %d group requests, %d individually",
+                len(resolved),
+                len(jobs) - len(unresolved),
+                len(unresolved),
+            )
+        return jobs
+
+    def _run_job(self, job: list[str]) -> list[tuple[str, Payload]]:
+        """
+        Fetch one job, falling back to per-city requests if a group fails.
+
+        Args:
+            job: List of city names planned by ``_plan_jobs``
+
+        Returns:
+            List of (city, payload) pairs for successfully fetched cities
+        """
+        if len(job) == 1:
+            data = self._fetch_city(job[0])
+            return [(job[0], data)] if data is not None else []
+
+        ids = [self.city_index.get(city) for city in job]
+        by_id = self._fetch_group(ids) or {}
         results = []
+        for city, city_id in zip(job, ids):
+            data = by_id.get(city_id)
+            if data is None:
+                data = self._fetch_city(city)
+            if data is not None:
+                results.append((city, data))
+        return results
+
+    def _remember(self, city: str, data: Payload) -> None:
+        """Record a fetched payload in the response cache and city index."""
+        if self.cache is not None:
+            self.cache.put(city, payload_to_dict(data))
+        if self.city_index is not None:
+            self.city_index.add(city, payload_field(data, "id"))
+
+    def _save_state(self) -> None:
+        """Persist the response cache and city index."""
+        if self.cache is not None:
+            self.cache.save()
+        if self.city_index is not None:
+            self.city_index.save()
+
+    def _fetch_group(self, ids: list[int]) -> Optional[dict[int, Payload]]:
+        """
+        Fetch weather data for several cities in one group request.
+
+        Args:
+            ids: OpenWeatherMap city IDs (at most ``group_size``)
+
+        Returns:
+            Mapping of city ID to weather data dictionary, or None if the
+            request failed
+        """
+        label = f"group of {len(ids)} cities"
+        self.logger.info("Starting request for %s", label)
+        try:
+            params = {"id": ",".join(str(city_id) for city_id in ids)}
+            params["appid"] = self.api_key
+            response = self._request(self.group_url, params, label, target="group")
+
+            if response.status_code != 200:
+                self.logger.error("Error %s for %s.", response.status_code, label)
+                return None
 
-        for city in cities:
-            self.logger.info("Starting request for %s", city)
+            payloads = self._decode_list(response)
+            self.logger.info("Fetched data for %s.", label)
+            return {
+                payload_field(data, "id"): data
+                for data in payloads
+                if payload_field(data, "id") is not None
+            }
+
+        except requests.exceptions.Timeout:
+            self.logger.error("Timeout error for %s.", label)
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error("Request error for %s: %s", label, e)
+
+        except (ValueError, AttributeError):
+            self.logger.error("Invalid JSON response for %s.", label)
+
+        return None
+
+    def _fetch_city(self, city: str) -> Optional[Payload]:
+        """
+        Fetch weather data for a single city.
+
+        Args:
+            city: City name
+
+        Returns:
+            Weather data dictionary, or None if the request failed
+        """
+        self.logger.info("Starting request for %s", city)
+        try:
+            params = {"q": city, "appid": self.api_key}
+            response = self._request(self.base_url, params, city)
+
+            if response.status_code != 200:
+                self.logger.error("Error %s for %s.", response.status_code, city)
+                return None
+
+            data = self._decode_payload(response)
+            self.logger.info("Fetched data for %s.", city)
+            return data
+
+        except requests.exceptions.Timeout:
+            self.logger.error("Timeout error for %s.", city)
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error("Request error for %s: %s", city, e)
+
+        except ValueError:
+            self.logger.error("Invalid JSON response for %s.", city)
+
+        return None
+
+    def fetch_history(self, city: str, start: int, end: int) -> Optional[list[Payload]]:
+        """
+        Fetch hourly historical observations for a city.
+
+        Each observation has the shape of a current weather response, with
+        ``name`` set to ``city`` so it can go through the same transform.
+
+        Args:
+            city: City name
+            start: Start of the range as a Unix timestamp
+            end: End of the range as a Unix timestamp
+
+        Returns:
+            List of weather data dictionaries, or None if the request failed
+        """
+        label = f"history for {city}"
+        try:
+            params = {
+                "q": city,
+                "type": "hour",
+                "start": start,
+                "end": end,
+                "appid": self.api_key,
+            }
+            response = self._request(self.history_url, params, label, target="history")
+
+            if response.status_code != 200:
+                self.logger.error("Error %s for %s.", response.status_code, label)
+                return None
+
+            return [with_name(payload, city) for payload in self._decode_list(response)]
+
+        except requests.exceptions.Timeout:
+            self.logger.error("Timeout error for %s.", label)
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error("Request error for %s: %s", label, e)
+
+        except (ValueError, AttributeError):
+            self.logger.error("Invalid JSON response for %s.", label)
+
+        return None
+
+    def _decode_payload(self, response: requests.Response) -> Payload:
+        """
+        Decode a current weather response body.
+
+        Raises:
+            ValueError: If the body is not valid JSON or, with typed
+                decoding, a used field has the wrong type
+        """
+        if self.typed_decoding:
+            return decode_weather(response.content)
+        return response.json()
+
+    def _decode_list(self, response: requests.Response) -> list[Payload]:
+        """
+        Decode the ``list`` of a group or history response body.
+
+        Raises:
+            ValueError: If the body is not valid JSON or, with typed
+                decoding, a used field has the wrong type
+        """
+        if self.typed_decoding:
+            return decode_weather_list(response.content)
+        return [
+            payload
+            for payload in response.json().get("list", [])
+            if isinstance(payload, dict)
+        ]
+
+    def _request(
+        self, url: str, params: dict, label: str, target: Optional[str] = None
+    ) -> requests.Response:
+        """
+        Send a GET request, retrying transient failures.
+
+        Timeouts, connection errors and 429/5xx responses are retried up to
+        ``retries`` times with exponential backoff and jitter. For 429 and
+        503 responses a ``Retry-After`` header takes precedence.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            label: Short description of the request used in log messages
+            target: Metrics label for the request (defaults to ``label``)
+
+        Returns:
+            The last response received
+
+        Raises:
+            requests.exceptions.RequestException: If the final attempt fails
+                without a response
+        """
+        target = target or label
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            started = time.perf_counter()
             try:
-                params = {"q": city, "appid": self.api_key}
-                response = requests.get(
-                    self.base_url, params=params, timeout=self.timeout
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+            ) as e:
+                HTTP_REQUEST_SECONDS.labels(target).observe(
+                    time.perf_counter() - started
+                )
+                HTTP_RESPONSES.labels(target, type(e).__name__).inc()
+                if last_attempt:
+                    raise
+                delay = self._backoff_delay(attempt)
+                reason = type(e).__name__
+            else:
+                HTTP_REQUEST_SECONDS.labels(target).observe(
+                    time.perf_counter() - started
+                )
+                HTTP_RESPONSES.labels(target, str(response.status_code)).inc()
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+                retry_after = None
+                if response.status_code in RETRY_AFTER_STATUS_CODES:
+                    retry_after = _parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+                delay = (
+                    min(retry_after, self.backoff_max)
+                    if retry_after is not None
+                    else self._backoff_delay(attempt)
                 )
+                reason = f"status {response.status_code}"
+                response.close()
 
-                if response.status_code != 200:
-                    self.logger.error("Error %s for %s.", response.status_code, city)
-                    continue
+            self.logger.warning(
+                "Retrying %s after %s in %.2fs (attempt %d/%d)",
+                label,
+                reason,
+                delay,
+                attempt + 1,
+                self.retries,
+            )
+            time.sleep(delay)
 
-                data = response.json()
-                results.append(data)
-                self.logger.info("Fetched data for %s.", city)
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff delay with jitter for the given attempt."""
+        delay = min(self.backoff_max, self.backoff * (2**attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
 
-            except requests.exceptions.Timeout:
-                self.logger.error("Timeout error for %s.", city)
-                continue
 
-            except requests.exceptions.RequestException as e:
-                self.logger.error("Request error for %s: %s", city, e)
-                continue
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
 
-            except ValueError:
-                self.logger.error("Invalid JSON response for %s.", city)
-                continue
+    Args:
+        value: Header value, either delay in seconds or an HTTP date
 
-        return results
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,260 @@
+import os
+import uuid
+import logging
+import argparse
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+from ..config import load_config
+from ..transform.records import CLEAN_SCHEMA, Records, as_batch
+
+logger = logging.getLogger(__name__)
+
+DATE_FIELD = pa.field("date", pa.date32())
+RECORD_COLUMNS = CLEAN_SCHEMA.names
+DEDUP_KEYS = ("city", "measurement_time")
+
+
+def _archive_config() -> dict:
+    return load_config().get("archive", {})
+
+
+def _partitioning(partition_by_city: bool) -> ds.Partitioning:
+    fields = [DATE_FIELD]
+    if partition_by_city:
+        fields.append(CLEAN_SCHEMA.field("city"))
+    return ds.partitioning(pa.schema(fields), flavor="hive")
+
+
+def save_to_archive(
+    data: Records,
+    archive_dir: Optional[str] = None,
+    partition_by_city: Optional[bool] = None,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Append transformed weather data to the Parquet archive.
+
+    Each call writes new files under ``date=YYYY-MM-DD/`` (and
+    ``city=<name>/`` when partitioning by city), so runs never rewrite
+    earlier files. Columns use the same types as the clean staging stage.
+
+    Args:
+        data: WeatherBatch or list of transformed weather records
+        archive_dir: Archive root. If None, uses ``archive.dir``
+        partition_by_city: Add a city level below the date. If None, uses
+            ``archive.partition_by_city``
+        compression: Parquet codec. If None, uses ``archive.compression``
+
+    Returns:
+        Number of archived records
+    """
+    config = _archive_config()
+    if archive_dir is None:
+        archive_dir = config.get("dir", "data/archive/")
+    if partition_by_city is None:
+        partition_by_city = config.get("partition_by_city", False)
+    if compression is None:
+        compression = config.get("compression", "zstd")
+
+    batch = as_batch(data)
+    if not len(batch):
+        logger.warning("No data to archive")
+        return 0
+
+    table = batch.to_arrow()
+    table = table.append_column(
+        DATE_FIELD, pc.cast(table.column("measurement_time"), pa.date32())
+    )
+
+    run_stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    parquet_format = ds.ParquetFileFormat()
+    ds.write_dataset(
+        table,
+        archive_dir,
+        format=parquet_format,
+        partitioning=_partitioning(partition_by_city),
+        basename_template=f"part-{run_stamp}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=parquet_format.make_write_options(compression=compression),
+    )
+
+    logger.info("Archived %d records to %s", table.num_rows, archive_dir)
+    return table.num_rows
+
+
+def _partition_date(directory: Path) -> Optional[date]:
+    for part in directory.parts:
+        if part.startswith("date="):
+            return date.fromisoformat(part[len("date=") :])
+    return None
+
+
+def _deduplicate(table: pa.Table) -> pa.Table:
+    """Keep the first row per city and measurement time."""
+    keys = [key for key in DEDUP_KEYS if key in table.column_names]
+    values = [name for name in table.column_names if name not in keys]
+    grouped = table.group_by(keys, use_threads=False).aggregate(
+        [(name, "first") for name in values]
+    )
+    grouped = grouped.rename_columns(
+        [name.removesuffix("_first") for name in grouped.column_names]
+    )
+    return grouped.select(table.column_names)
+
+
+def compact_archive(
+    archive_dir: Optional[str] = None,
+    min_files: Optional[int] = None,
+    today: Optional[date] = None,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Merge the small files of each closed partition into one sorted file.
+
+    Only partitions dated before ``today`` are compacted, so runs that are
+    still appending to the current day are never raced. Duplicate
+    (city, measurement_time) rows from overlapping runs are dropped.
+
+    Args:
+        archive_dir: Archive root. If None, uses ``archive.dir``
+        min_files: Compact a partition once it holds at least this many
+            files. If None, uses ``archive.compact_min_files``
+        today: Reference date (defaults to today)
+        compression: Parquet codec. If None, uses ``archive.compression``
+
+    Returns:
+        Number of compacted partitions
+    """
+    config = _archive_config()
+    if archive_dir is None:
+        archive_dir = config.get("dir", "data/archive/")
+    if min_files is None:
+        min_files = config.get("compact_min_files", 24)
+    if compression is None:
+        compression = config.get("compression", "zstd")
+    today = today or date.today()
+
+    root = Path(archive_dir)
+    if not root.exists():
+        return 0
+
+    partitions: dict[Path, list[Path]] = {}
+    for path in root.rglob("*.parquet"):
+        if not path.name.startswith("."):
+            partitions.setdefault(path.parent, []).append(path)
+
+    compacted = 0
+    for directory, files in sorted(partitions.items()):
+        partition_date = _partition_date(directory.relative_to(root))
+        if len(files) < max(min_files, 2) or partition_date is None:
+            continue
+        if partition_date >= today:
+            continue
+
+        table = pa.concat_tables(
+            [pq.ParquetFile(path).read() for path in files], promote_options="default"
+        )
+        rows_before = table.num_rows
+        table = _deduplicate(table)
+        sort_keys = [
+            (key, "ascending")
+            for key in ("measurement_time", "city")
+            if key in table.column_names
+        ]
+        table = table.sort_by(sort_keys)
+
+        tmp_path = directory / f".compacting-{uuid.uuid4().hex[:8]}.parquet"
+        pq.write_table(table, tmp_path, compression=compression)
+        os.replace(
+            tmp_path,
+            directory / f"compacted-{datetime.now().strftime('%Y%m%dT%H%M%S')}.parquet",
+        )
+        for path in files:
+            path.unlink()
+
+        compacted += 1
+        logger.info(
+            "Compacted %d files (%d rows, %d duplicates) in %s",
+            len(files),
+            table.num_rows,
+            rows_before - table.num_rows,
+            directory,
+        )
+    return compacted
+
+
+def read_archive(
+    start: date,
+    end: date,
+    columns: Optional[list[str]] = None,
+    cities: Optional[list[str]] = None,
+    archive_dir: Optional[str] = None,
+) -> pa.Table:
+    """
+    Read archived measurements for a date range.
+
+    Only partitions inside the range (and the requested cities, when the
+    archive is partitioned by city) are opened, and only the requested
+    columns are decoded.
+
+    Args:
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        columns: Columns to load. If None, loads all record columns
+        cities: Optional city filter
+        archive_dir: Archive root. If None, uses ``archive.dir``
+
+    Returns:
+        Arrow table (use ``.to_pandas()`` for a DataFrame)
+    """
+    if archive_dir is None:
+        archive_dir = _archive_config().get("dir", "data/archive/")
+    if columns is None:
+        columns = RECORD_COLUMNS
+
+    dataset = None
+    if Path(archive_dir).exists():
+        dataset = ds.dataset(archive_dir, format="parquet", partitioning="hive")
+    if dataset is None or dataset.schema.get_field_index("date") == -1:
+        return CLEAN_SCHEMA.empty_table().select(
+            [name for name in columns if name in RECORD_COLUMNS]
+        )
+
+    date_field = ds.field("date")
+    if pa.types.is_string(dataset.schema.field("date").type):
+        date_filter = (date_field >= start.isoformat()) & (
+            date_field <= end.isoformat()
+        )
+    else:
+        date_filter = (date_field >= start) & (date_field <= end)
+    if cities:
+        date_filter &= ds.field("city").isin(cities)
+
+    table = dataset.to_table(columns=columns, filter=date_filter)
+    if "date" in table.column_names:
+        index = table.column_names.index("date")
+        table = table.set_column(
+            index, DATE_FIELD, pc.cast(table.column("date"), pa.date32())
+        )
+    return table
+
+
+if __name__ == "__main__":
+    from ..utils.logger import setup_logging
+
+    parser = argparse.ArgumentParser(
+        description="Compact small files in the weather Parquet archive."
+    )
+    parser.add_argument(
+        "--min-files",
+        type=int,
+        help="compact partitions holding at least this many files",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    compact_archive(min_files=args.min_files)
@@ -3,22 +3,24 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import logging
+from ..transform.records import FIELDS, Records, as_records
+
+logger = logging.getLogger(__name__)
 
 
 def save_to_csv(
-    data: list[dict], output_dir: str = "data/", filename: Optional[str] = None
+    data: Records, output_dir: str = "data/", filename: Optional[str] = None
 ) -> None:
     """
     Save transformed weather data to CSV file.
 
     Args:
-        data: List of transformed weather dictionaries
+        data: WeatherBatch or list of transformed weather records
         output_dir: Directory to save CSV file
         filename: CSV filename (if None, generate with timestamp)
     """
-    logger = logging.getLogger(__name__)
 
-    if not data:
+    if not len(data):
         logger.warning("No data to save")
         return
 
@@ -29,21 +31,20 @@ def save_to_csv(
 
     filepath = Path(output_dir) / filename
 
-    clean_data = [record for record in data if record is not None]
+    clean_data, skipped = as_records(data)
 
     if not clean_data:
         logger.warning("No valid data to save (all records failed transformation)")
         return
 
-    if len(clean_data) < len(data):
-        logger.warning("Skipped %d invalid records", len(data) - len(clean_data))
+    if skipped:
+        logger.warning("Skipped %d invalid records", skipped)
 
     try:
         with open(filepath, "w", newline="", encoding="utf-8") as f:
-            fieldnames = clean_data[0].keys() if clean_data else []
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.writer(f)
 
-            writer.writeheader()
+            writer.writerow(FIELDS)
             writer.writerows(clean_data)
         logger.info("Saved %d records to %s", len(clean_data), filepath)
     except Exception as e:
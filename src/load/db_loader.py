@@ -1,70 +1,174 @@
-import os
+import time
 import logging
 import psycopg2
-from dotenv import load_dotenv
+from psycopg2.extras import execute_values
+from typing import Optional
+from ..config import load_config
+from ..db import get_connection
+from ..utils.metrics import LOAD_BATCH_SECONDS, LOAD_ROWS
+from ..read_service import publish_readings
+from ..validation import update_history
+from .recent_keys import get_recent_keys
+from .rollups import update_rollups
+from ..transform.records import Records, as_records
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
+INSERT_SQL = """
+INSERT INTO weather_measurements 
+(city, temperature_celsius, measurement_time, humidity, pressure, wind_speed)
+VALUES (%s, %s, %s, %s, %s, %s)
+"""
 
-def get_db_connection():
-    """Create database connection."""
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST"),
-        port=os.getenv("DB_PORT"),
-        database=os.getenv("DB_NAME"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
+BULK_INSERT_SQL = """
+INSERT INTO weather_measurements
+(city, temperature_celsius, measurement_time, humidity, pressure, wind_speed)
+VALUES %s
+ON CONFLICT (city, measurement_time) DO NOTHING
+RETURNING city, temperature_celsius, measurement_time, humidity, pressure, wind_speed
+"""
+
+
+def _insert_rows(cursor, rows: list[tuple]) -> list[tuple]:
+    """
+    Insert rows one statement at a time.
+
+    Args:
+        cursor: Cursor of an autocommit connection
+        rows: INSERT parameter tuples
+
+    Returns:
+        Inserted rows
+    """
+    inserted = []
+    for row in rows:
+        try:
+            cursor.execute(INSERT_SQL, row)
+            inserted.append(row)
+        except psycopg2.IntegrityError:
+            logger.debug("Duplicated record")
+            continue
+    return inserted
+
+
+def _bulk_insert_rows(cursor, rows: list[tuple], page_size: int) -> list[tuple]:
+    """
+    Insert rows in multi-row statements, skipping duplicates in PostgreSQL.
+
+    Each page of ``page_size`` rows is sent as a single
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` statement, so only
+    rows that were actually inserted are returned.
+
+    Args:
+        cursor: Cursor of a connection inside a transaction
+        rows: INSERT parameter tuples
+        page_size: Number of rows per statement
+
+    Returns:
+        Inserted rows
+    """
+    return execute_values(
+        cursor, BULK_INSERT_SQL, rows, page_size=page_size, fetch=True
     )
 
 
-def save_to_database(data: list[dict]) -> None:
-    """Save weather data to PostgreSQL."""
-    logger = logging.getLogger(__name__)
-    if not data:
-        logger.warning("No data to save")
-        return
+def _record_load(started: float, inserted_count: int, duplicate_count: int) -> None:
+    """Record load metrics and log the outcome of one batch."""
+    LOAD_BATCH_SECONDS.observe(time.perf_counter() - started)
+    LOAD_ROWS.labels("inserted").inc(inserted_count)
+    LOAD_ROWS.labels("duplicate").inc(duplicate_count)
+    logger.info("Inserted %d records, %d duplicates", inserted_count, duplicate_count)
 
-    clean_data = [record for record in data if record is not None]
 
-    if not clean_data:
-        logger.warning("No valid data to save (all records failed transformation)")
-        return
+def save_to_database(
+    data: Records,
+    bulk: Optional[bool] = None,
+    shard: Optional[int] = None,
+    use_recent_keys: bool = True,
+    publish: bool = True,
+) -> tuple[int, int]:
+    """
+    Save weather data to PostgreSQL.
 
-    if len(clean_data) < len(data):
-        logger.warning("Skipped %d invalid records", len(data) - len(clean_data))
+    Inserted rows are also folded into the ``latest_measurements``,
+    ``weather_hourly`` and ``weather_daily`` rollup tables. When
+    ``database.recent_keys`` is enabled, records whose key was loaded
+    recently are dropped before the insert and counted as duplicates.
+    ``WeatherRecord`` tuples are in INSERT column order and are sent as
+    rows without any per-field conversion.
+    Inserted rows are pushed to the readings service when
+    ``read_service`` is enabled and added to the validation history.
 
-    dbconnect = get_db_connection()
-    dbconnect.autocommit = True
-    cursor = dbconnect.cursor()
+    Args:
+        data: WeatherBatch or list of transformed weather records (dicts
+            or ``WeatherRecord`` tuples)
+        bulk: Use multi-row ``ON CONFLICT DO NOTHING`` inserts in a single
+            transaction. If None, uses ``database.bulk_load`` from config.yaml
+        shard: City shard index, selecting that shard's recent-keys index
+        use_recent_keys: Consult and update ``database.recent_keys`` (if
+            enabled); False loads without touching the index
+        publish: Push inserted rows to the readings service (if enabled)
 
-    sql = """
-    INSERT INTO weather_measurements 
-    (city, temperature_celsius, measurement_time, humidity, pressure, wind_speed)
-    VALUES (%s, %s, %s, %s, %s, %s)
+    Returns:
+        Tuple of (inserted_count, duplicate_count)
     """
+    if not len(data):
+        logger.warning("No data to save")
+        return 0, 0
+
+    rows, skipped = as_records(data)
+
+    if not rows:
+        logger.warning("No valid data to save (all records failed transformation)")
+        return 0, 0
+
+    if skipped:
+        logger.warning("Skipped %d invalid records", skipped)
 
-    inserted_count = 0
-    duplicate_count = 0
+    db_config = load_config().get("database", {})
+    if bulk is None:
+        bulk = db_config.get("bulk_load", True)
 
-    for record in clean_data:
+    started = time.perf_counter()
+    page_size = db_config.get("batch_size", 1000)
+    recent_keys = get_recent_keys(shard) if use_recent_keys else None
+    known_count = 0
+    if recent_keys is not None and recent_keys.warm:
+        rows, known_count = recent_keys.filter(rows)
+        if not rows:
+            _record_load(started, 0, known_count)
+            return 0, known_count
+
+    with get_connection() as dbconnect:
         try:
-            cursor.execute(
-                sql,
-                (
-                    record["city"],
-                    record["temperature_celsius"],
-                    record["measurement_time"],
-                    record["humidity"],
-                    record["pressure"],
-                    record["wind_speed"],
-                ),
-            )
-            inserted_count += 1
-        except psycopg2.IntegrityError:
-            logger.debug("Duplicated record")
-            duplicate_count += 1
-            continue
+            if recent_keys is not None and not recent_keys.warm:
+                with dbconnect.cursor() as cursor:
+                    recent_keys.seed(cursor)
+                # end the seed's transaction so autocommit can be switched on
+                dbconnect.commit()
+                rows, known_count = recent_keys.filter(rows)
+            if bulk:
+                with dbconnect.cursor() as cursor:
+                    inserted = _bulk_insert_rows(cursor, rows, page_size=page_size)
+                    update_rollups(cursor, inserted, page_size=page_size)
+                dbconnect.commit()
+            else:
+                dbconnect.autocommit = True
+                with dbconnect.cursor() as cursor:
+                    inserted = _insert_rows(cursor, rows)
+                    update_rollups(cursor, inserted, page_size=page_size)
+        except Exception:
+            dbconnect.rollback()
+            raise
 
-    cursor.close()
-    dbconnect.close()
-    logger.info("Inserted %d records, %d duplicates", inserted_count, duplicate_count)
+    if recent_keys is not None:
+        recent_keys.update(rows)
+        recent_keys.save()
+    if publish:
+        publish_readings(inserted)
+    update_history(inserted)
+
+    inserted_count = len(inserted)
+    duplicate_count = len(rows) - inserted_count + known_count
+    _record_load(started, inserted_count, duplicate_count)
+    return inserted_count, duplicate_count
@@ -0,0 +1,339 @@
+import re
+import logging
+import argparse
+from datetime import date
+from typing import Optional
+from psycopg2 import sql
+from ..config import load_config
+from ..db import get_connection
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "weather_measurements"
+DEFAULT_PARTITION = "weather_measurements_default"
+LEGACY_TABLE = "weather_measurements_legacy"
+PARTITION_PATTERN = re.compile(r"^weather_measurements_p(\d{4})_(\d{2})$")
+
+PARTITIONED_TABLE_DDL = """
+CREATE TABLE weather_measurements (
+    city VARCHAR(100) NOT NULL,
+    measurement_time TIMESTAMP NOT NULL,
+    temperature_celsius FLOAT,
+    humidity INTEGER,
+    pressure INTEGER,
+    wind_speed FLOAT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (city, measurement_time)
+) PARTITION BY RANGE (measurement_time);
+
+CREATE TABLE weather_measurements_default
+PARTITION OF weather_measurements DEFAULT;
+
+CREATE INDEX idx_measurement_time ON weather_measurements(measurement_time DESC);
+
+CREATE INDEX idx_city ON weather_measurements(city);
+"""
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing ``day``."""
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after the month containing ``day``."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(start: date) -> str:
+    """Name of the monthly partition starting at ``start``."""
+    return f"{PARENT_TABLE}_p{start:%Y_%m}"
+
+
+def parse_partition_name(name: str) -> Optional[date]:
+    """
+    Get the month start of a monthly partition from its name.
+
+    Args:
+        name: Table name
+
+    Returns:
+        First day of the partition's month, or None for other tables
+    """
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def is_partitioned(cursor) -> bool:
+    """Check whether weather_measurements is a partitioned table."""
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (PARENT_TABLE,)
+    )
+    row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def list_partitions(cursor) -> list[str]:
+    """Names of the partitions currently attached to weather_measurements."""
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(%s)
+        """,
+        (PARENT_TABLE,),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def create_partition(cursor, start: date) -> bool:
+    """
+    Create the monthly partition starting at ``start`` if it does not exist.
+
+    Rows of that month already stored in the default partition are moved
+    into the new partition. A table of that name left detached by
+    retention (e.g. when backfilling an expired month) is attached again
+    instead of created.
+
+    Args:
+        cursor: Cursor inside a transaction
+        start: First day of the month
+
+    Returns:
+        True if the partition was created or re-attached
+    """
+    name = partition_name(start)
+    if name in list_partitions(cursor):
+        return False
+
+    end = add_months(start, 1)
+    table = sql.Identifier(name)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+    detached = cursor.fetchone()[0]
+    cursor.execute(
+        sql.SQL(
+            "SELECT EXISTS (SELECT 1 FROM {} "
+            "WHERE measurement_time >= %s AND measurement_time < %s)"
+        ).format(sql.Identifier(DEFAULT_PARTITION)),
+        (start, end),
+    )
+    in_default = cursor.fetchone()[0]
+    if not detached and not in_default:
+        cursor.execute(
+            sql.SQL(
+                "CREATE TABLE {} PARTITION OF {} FOR VALUES FROM (%s) TO (%s)"
+            ).format(table, sql.Identifier(PARENT_TABLE)),
+            (start, end),
+        )
+        return True
+
+    if detached:
+        logger.info("Re-attaching detached partition %s", name)
+    else:
+        cursor.execute(
+            sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS)").format(
+                table, sql.Identifier(PARENT_TABLE)
+            )
+        )
+    if in_default:
+        cursor.execute(
+            sql.SQL(
+                "WITH moved AS (DELETE FROM {} WHERE measurement_time >= %s "
+                "AND measurement_time < %s RETURNING *) "
+                "INSERT INTO {} SELECT * FROM moved ON CONFLICT DO NOTHING"
+            ).format(sql.Identifier(DEFAULT_PARTITION), table),
+            (start, end),
+        )
+    cursor.execute(
+        sql.SQL(
+            "ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)"
+        ).format(sql.Identifier(PARENT_TABLE), table),
+        (start, end),
+    )
+    return True
+
+
+def ensure_partitions(
+    cursor, months_ahead: int = 3, today: Optional[date] = None
+) -> list[str]:
+    """
+    Create monthly partitions from the current month up to ``months_ahead``.
+
+    Args:
+        cursor: Cursor inside a transaction
+        months_ahead: Number of future months to create
+        today: Reference date (defaults to today)
+
+    Returns:
+        Names of the created partitions
+    """
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        if create_partition(cursor, start):
+            created.append(partition_name(start))
+    return created
+
+
+def apply_retention(
+    cursor,
+    retention_months: int,
+    action: str = "detach",
+    today: Optional[date] = None,
+) -> list[str]:
+    """
+    Detach or drop monthly partitions older than the retention window.
+
+    A partition is expired once its whole month lies before the first day
+    of the month ``retention_months`` before today.
+
+    Args:
+        cursor: Cursor inside a transaction
+        retention_months: Number of months of data to keep
+        action: "detach" to keep expired partitions as standalone tables,
+            "drop" to delete them
+        today: Reference date (defaults to today)
+
+    Returns:
+        Names of the expired partitions
+
+    Raises:
+        ValueError: If action is unknown
+    """
+    if action not in ("detach", "drop"):
+        raise ValueError(f"Unknown retention action: {action}")
+
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    expired = sorted(
+        name
+        for name in list_partitions(cursor)
+        if (start := parse_partition_name(name)) is not None
+        and add_months(start, 1) <= cutoff
+    )
+    for name in expired:
+        cursor.execute(
+            sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(
+                sql.Identifier(PARENT_TABLE), sql.Identifier(name)
+            )
+        )
+        if action == "drop":
+            cursor.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+    return expired
+
+
+def migrate_to_partitioned(cursor, months_ahead: int = 3) -> bool:
+    """
+    Convert an unpartitioned weather_measurements table to a partitioned one.
+
+    The old table is renamed, a partitioned table with monthly partitions
+    covering its data is created, rows are copied over and the old table
+    is dropped. Run inside a single transaction.
+
+    Args:
+        cursor: Cursor inside a transaction
+        months_ahead: Number of future months to create
+
+    Returns:
+        True if a migration was performed, False if already partitioned
+    """
+    if is_partitioned(cursor):
+        return False
+
+    cursor.execute(f"ALTER TABLE {PARENT_TABLE} RENAME TO {LEGACY_TABLE}")
+    cursor.execute(
+        f"ALTER TABLE {LEGACY_TABLE} "
+        f"RENAME CONSTRAINT {PARENT_TABLE}_pkey TO {LEGACY_TABLE}_pkey"
+    )
+    cursor.execute("DROP INDEX IF EXISTS idx_measurement_time")
+    cursor.execute("DROP INDEX IF EXISTS idx_city")
+    cursor.execute(PARTITIONED_TABLE_DDL)
+
+    cursor.execute(f"SELECT MIN(measurement_time)::DATE FROM {LEGACY_TABLE}")
+    oldest = cursor.fetchone()[0]
+    current = month_start(date.today())
+    start = month_start(oldest) if oldest is not None else current
+    while start < current:
+        create_partition(cursor, start)
+        start = add_months(start, 1)
+    ensure_partitions(cursor, months_ahead)
+
+    cursor.execute(f"""
+        INSERT INTO {PARENT_TABLE}
+        (city, measurement_time, temperature_celsius, humidity, pressure,
+         wind_speed, created_at)
+        SELECT city, measurement_time, temperature_celsius, humidity, pressure,
+            wind_speed, created_at
+        FROM {LEGACY_TABLE}
+        """)
+    cursor.execute(f"DROP TABLE {LEGACY_TABLE}")
+    return True
+
+
+def maintain_partitions(migrate: bool = False) -> dict:
+    """
+    Run partition maintenance with settings from ``database.partitions``.
+
+    Args:
+        migrate: Convert an unpartitioned table first
+
+    Returns:
+        Dict with "migrated", "created" and "expired" results
+    """
+    config = load_config().get("database", {}).get("partitions", {})
+    months_ahead = config.get("months_ahead", 3)
+
+    with get_connection() as dbconnect:
+        try:
+            with dbconnect.cursor() as cursor:
+                migrated = migrate and migrate_to_partitioned(cursor, months_ahead)
+                if not is_partitioned(cursor):
+                    logger.warning(
+                        "%s is not partitioned; run with --migrate", PARENT_TABLE
+                    )
+                    dbconnect.rollback()
+                    return {"migrated": False, "created": [], "expired": []}
+                created = ensure_partitions(cursor, months_ahead)
+                expired = []
+                if config.get("retention_months"):
+                    expired = apply_retention(
+                        cursor,
+                        config["retention_months"],
+                        config.get("retention_action", "detach"),
+                    )
+            dbconnect.commit()
+        except Exception:
+            dbconnect.rollback()
+            raise
+
+    if migrated:
+        logger.info("Migrated %s to a partitioned table", PARENT_TABLE)
+    if created:
+        logger.info("Created partitions: %s", ", ".join(created))
+    if expired:
+        logger.info(
+            "Expired partitions (%s): %s",
+            config.get("retention_action", "detach"),
+            ", ".join(expired),
+        )
+    return {"migrated": migrated, "created": created, "expired": expired}
+
+
+if __name__ == "__main__":
+    from ..utils.logger import setup_logging
+
+    parser = argparse.ArgumentParser(
+        description="Create and expire weather_measurements partitions."
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="convert an existing unpartitioned table first",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    maintain_partitions(migrate=args.migrate)
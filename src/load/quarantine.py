@@ -0,0 +1,51 @@
+import logging
+from psycopg2.extras import execute_values
+from ..db import get_connection
+from ..transform.records import WeatherBatch
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_SQL = """
+INSERT INTO weather_quarantine
+(city, temperature_celsius, measurement_time, humidity, pressure, wind_speed, reasons)
+VALUES %s
+ON CONFLICT (city, measurement_time) DO NOTHING
+RETURNING id
+"""
+
+
+def save_to_quarantine(batch: WeatherBatch, reasons: list[list[str]]) -> int:
+    """
+    Save records rejected by validation to ``weather_quarantine``.
+
+    Readings already quarantined by an earlier run are skipped.
+
+    Args:
+        batch: Rejected records
+        reasons: Reasons per record, in batch order
+
+    Returns:
+        Number of newly quarantined records
+    """
+    rows = [
+        (*record, record_reasons)
+        for record, record_reasons in zip(batch.records(), reasons)
+    ]
+    if not rows:
+        return 0
+
+    with get_connection() as dbconnect:
+        try:
+            with dbconnect.cursor() as cursor:
+                inserted = execute_values(cursor, QUARANTINE_SQL, rows, fetch=True)
+            dbconnect.commit()
+        except Exception:
+            dbconnect.rollback()
+            raise
+
+    logger.info(
+        "Quarantined %d records, %d already quarantined",
+        len(inserted),
+        len(rows) - len(inserted),
+    )
+    return len(inserted)
@@ -0,0 +1,200 @@
+import json
+import logging
+import calendar
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from ..config import load_config, shard_path
+from ..transform.records import WeatherRecord
+from ..utils.files import write_json_atomic
+
+SEED_SQL = """
+SELECT city, measurement_time
+FROM weather_measurements
+WHERE measurement_time >= (
+    SELECT max(measurement_time) FROM weather_measurements
+) - %s * interval '1 second'
+"""
+
+
+class RecentKeys:
+    """
+    Local index of recently loaded ``(city, measurement_time)`` keys.
+
+    Keys are kept for ``window_hours`` behind the newest measurement seen,
+    so the index stays small while still covering the overlap between
+    consecutive runs. Records whose key is in the index are already in
+    ``weather_measurements`` and can be dropped before the insert. A key
+    missing from the index only costs a conflicting insert, so the index
+    may be lossy but must never hold keys that were not committed.
+
+    Attributes:
+        path: JSON file the index is persisted to
+        window: Seconds of history kept behind the newest key
+        warm: Whether the index was loaded from disk or seeded
+    """
+
+    def __init__(self, path: str, window_hours: float = 48):
+        """
+        Initialize the index and load existing keys from disk.
+
+        Args:
+            path: JSON file to persist the index to
+            window_hours: Hours of keys kept behind the newest measurement
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.window = int(window_hours * 3600)
+        self.warm = False
+        self._keys: dict[str, set[int]] = {}
+        self._newest = 0
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                self._keys = {
+                    city: set(times) for city, times in stored["keys"].items()
+                }
+                self._newest = int(stored["newest"])
+                self.warm = True
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.logger.warning("Ignoring unreadable key index %s: %s", path, e)
+
+    @staticmethod
+    def _epoch(measurement_time: datetime) -> int:
+        return calendar.timegm(measurement_time.timetuple())
+
+    def __contains__(self, key: tuple[str, datetime]) -> bool:
+        city, measurement_time = key
+        return self._epoch(measurement_time) in self._keys.get(city, ())
+
+    def add(self, city: str, measurement_time: datetime) -> None:
+        """
+        Record a key that is committed to the database.
+
+        Args:
+            city: City name
+            measurement_time: Measurement timestamp
+        """
+        epoch = self._epoch(measurement_time)
+        if epoch < self._newest - self.window:
+            return
+        times = self._keys.setdefault(city, set())
+        if epoch not in times:
+            times.add(epoch)
+            self._newest = max(self._newest, epoch)
+            self._dirty = True
+
+    def update(self, records: list[WeatherRecord]) -> None:
+        """Record the keys of committed records and drop expired keys."""
+        for record in records:
+            self.add(record.city, record.measurement_time)
+        self.prune()
+
+    def filter(self, records: list[WeatherRecord]) -> tuple[list[WeatherRecord], int]:
+        """
+        Drop records that are already loaded or repeated within the batch.
+
+        Args:
+            records: Transformed weather records
+
+        Returns:
+            Tuple of (new_records, known_count)
+        """
+        new_records = []
+        batch_keys = set()
+        for record in records:
+            key = (record.city, self._epoch(record.measurement_time))
+            if key in batch_keys or key[1] in self._keys.get(key[0], ()):
+                continue
+            batch_keys.add(key)
+            new_records.append(record)
+        return new_records, len(records) - len(new_records)
+
+    def seed(self, cursor) -> int:
+        """
+        Fill the index from ``weather_measurements`` on cold start.
+
+        Args:
+            cursor: Database cursor
+
+        Returns:
+            Number of keys loaded
+        """
+        cursor.execute(SEED_SQL, (self.window,))
+        rows = cursor.fetchall()
+        for city, measurement_time in rows:
+            self.add(city, measurement_time)
+        self.prune()
+        self.warm = True
+        self.logger.info("Seeded key index with %d keys from the database", len(rows))
+        return len(rows)
+
+    def prune(self) -> int:
+        """
+        Drop keys older than the window behind the newest key.
+
+        Returns:
+            Number of dropped keys
+        """
+        cutoff = self._newest - self.window
+        dropped = 0
+        for city in list(self._keys):
+            times = self._keys[city]
+            expired = {epoch for epoch in times if epoch < cutoff}
+            if expired:
+                times -= expired
+                dropped += len(expired)
+            if not times:
+                del self._keys[city]
+        if dropped:
+            self._dirty = True
+        return dropped
+
+    def save(self) -> None:
+        """Persist the index to disk if it changed."""
+        if not self._dirty:
+            return
+        stored = {
+            "newest": self._newest,
+            "keys": {city: sorted(times) for city, times in self._keys.items()},
+        }
+        try:
+            write_json_atomic(self.path, stored, separators=(",", ":"))
+            self._dirty = False
+        except OSError as e:
+            self.logger.error("Failed to save key index to %s: %s", self.path, e)
+
+    def __len__(self) -> int:
+        return sum(len(times) for times in self._keys.values())
+
+
+_recent_keys: dict[Optional[int], RecentKeys] = {}
+_recent_keys_lock = threading.Lock()
+
+
+def get_recent_keys(shard: Optional[int] = None) -> Optional[RecentKeys]:
+    """
+    Get the process-wide recent-keys index, loading it on first use.
+
+    Settings are read from ``database.recent_keys`` in config.yaml. Mapped
+    shard loads run concurrently, so each shard keeps its own index file.
+
+    Args:
+        shard: City shard index when loading one of several mapped shards
+
+    Returns:
+        Shared RecentKeys, or None if the index is disabled
+    """
+    config = load_config().get("database", {}).get("recent_keys", {})
+    if not config.get("enabled", False):
+        return None
+    with _recent_keys_lock:
+        if shard not in _recent_keys:
+            _recent_keys[shard] = RecentKeys(
+                shard_path(config.get("path", "data/cache/recent_keys.json"), shard),
+                window_hours=config.get("window_hours", 48),
+            )
+        return _recent_keys[shard]
@@ -0,0 +1,96 @@
+from psycopg2.extras import execute_values
+
+ROW_TEMPLATE = "(%s, %s::float, %s::timestamp, %s::integer, %s::integer, %s::float)"
+
+ROW_COLUMNS = (
+    "city, temperature_celsius, measurement_time, humidity, pressure, wind_speed"
+)
+
+LATEST_SQL = f"""
+INSERT INTO latest_measurements AS latest
+({ROW_COLUMNS})
+VALUES %s
+ON CONFLICT (city) DO UPDATE SET
+    measurement_time = EXCLUDED.measurement_time,
+    temperature_celsius = EXCLUDED.temperature_celsius,
+    humidity = EXCLUDED.humidity,
+    pressure = EXCLUDED.pressure,
+    wind_speed = EXCLUDED.wind_speed,
+    updated_at = CURRENT_TIMESTAMP
+WHERE latest.measurement_time < EXCLUDED.measurement_time
+"""
+
+AGGREGATE_SQL = """
+INSERT INTO {table} AS rollup
+    (city, bucket, sample_count, temperature_min, temperature_max,
+     temperature_sum, temperature_count, humidity_min, humidity_max,
+     humidity_sum, humidity_count)
+SELECT city, date_trunc('{unit}', measurement_time), COUNT(*),
+    MIN(temperature_celsius), MAX(temperature_celsius),
+    COALESCE(SUM(temperature_celsius), 0), COUNT(temperature_celsius),
+    MIN(humidity), MAX(humidity), COALESCE(SUM(humidity), 0), COUNT(humidity)
+FROM (VALUES %s) AS batch ({columns})
+GROUP BY 1, 2
+ON CONFLICT (city, bucket) DO UPDATE SET
+    sample_count = rollup.sample_count + EXCLUDED.sample_count,
+    temperature_min = LEAST(rollup.temperature_min, EXCLUDED.temperature_min),
+    temperature_max = GREATEST(rollup.temperature_max, EXCLUDED.temperature_max),
+    temperature_sum = rollup.temperature_sum + EXCLUDED.temperature_sum,
+    temperature_count = rollup.temperature_count + EXCLUDED.temperature_count,
+    humidity_min = LEAST(rollup.humidity_min, EXCLUDED.humidity_min),
+    humidity_max = GREATEST(rollup.humidity_max, EXCLUDED.humidity_max),
+    humidity_sum = rollup.humidity_sum + EXCLUDED.humidity_sum,
+    humidity_count = rollup.humidity_count + EXCLUDED.humidity_count
+"""
+
+ROLLUP_TABLES = {"weather_hourly": "hour", "weather_daily": "day"}
+
+
+def latest_per_city(rows: list[tuple]) -> list[tuple]:
+    """
+    Keep only the newest row for each city.
+
+    Args:
+        rows: Row tuples in INSERT column order
+
+    Returns:
+        One row tuple per city
+    """
+    latest = {}
+    for row in rows:
+        current = latest.get(row[0])
+        if current is None or row[2] > current[2]:
+            latest[row[0]] = row
+    return list(latest.values())
+
+
+def update_rollups(cursor, rows: list[tuple], page_size: int = 1000) -> None:
+    """
+    Fold newly inserted rows into the latest-per-city and aggregate tables.
+
+    Only rows that were actually inserted must be passed, otherwise
+    duplicates would be counted twice in the hourly and daily aggregates.
+
+    Args:
+        cursor: Cursor of the connection that inserted the rows
+        rows: Inserted row tuples in INSERT column order
+        page_size: Number of rows per statement
+    """
+    if not rows:
+        return
+
+    execute_values(
+        cursor,
+        LATEST_SQL,
+        latest_per_city(rows),
+        template=ROW_TEMPLATE,
+        page_size=page_size,
+    )
+    for table, unit in ROLLUP_TABLES.items():
+        execute_values(
+            cursor,
+            AGGREGATE_SQL.format(table=table, unit=unit, columns=ROW_COLUMNS),
+            rows,
+            template=ROW_TEMPLATE,
+            page_size=page_size,
+        )
@@ -1,84 +1,346 @@
+import time
 import logging
+import argparse
 from .extract.weather_api import WeatherAPI
-from .transform.data_processor import transform_weather_data
+from .transform.data_processor import transform_to_batch
+from .transform.records import Records, WeatherBatch
+from .load.archive_writer import compact_archive, save_to_archive
 from .load.db_loader import save_to_database
-from .config import load_config
+from .load.partitions import maintain_partitions
+from .config import load_config, shard_suffix
+from .staging import cleanup_staging, read_stage, write_stage
+from .validation import validate_data
 from .utils.logger import setup_logging
+from .utils.metrics import LAST_SUCCESS, export_metrics, start_metrics_server
 from typing import List, Dict, Optional
 
+logger = logging.getLogger(__name__)
 
-def extract_data() -> List[Dict]:
+
+def extract_data(
+    cities: Optional[List[str]] = None, shard: Optional[int] = None
+) -> List[Dict]:
     """
     Extract: Fetch weather data from API.
 
+    Args:
+        cities: Cities to fetch. If None, uses ``cities`` from config.yaml
+        shard: City shard index when run as one of several mapped tasks
+
     Returns:
         List of raw weather data dictionaries
     """
     config = load_config()
     setup_logging()
-    logger = logging.getLogger(__name__)
 
-    weather_api = WeatherAPI()
-    cities_list = config["cities"]
+    weather_api = WeatherAPI(config, shard=shard)
+    cities_list = config["cities"] if cities is None else cities
 
     logger.info("Starting data extraction for %d cities", len(cities_list))
-    data_from_API = weather_api.get_weather_data(cities_list)
+    try:
+        data_from_API = weather_api.get_weather_data(cities_list)
+    finally:
+        weather_api.close()
     logger.info("Extracted %d records", len(data_from_API))
+    if weather_api.cache is not None:
+        logger.info("Response cache hits: %d", weather_api.cache_hits)
+    LAST_SUCCESS.labels("extract").set_to_current_time()
+    export_metrics(f"extract{shard_suffix(shard)}")
 
     return data_from_API
 
 
-def transform_data_impl(raw_data: List[Dict]) -> List[Optional[Dict]]:
+def transform_data_impl(
+    raw_data: List[Dict], shard: Optional[int] = None
+) -> WeatherBatch:
     """
     Transform: Clean and process raw weather data.
 
     Args:
-        raw_data: List of raw weather data dictionaries
+        raw_data: List of raw weather data dictionaries (or typed payloads)
+        shard: City shard index when run as one of several mapped tasks
 
     Returns:
-        List of transformed data dictionaries
+        Columnar batch of transformed records
     """
-    logger = logging.getLogger(__name__)
     logger.info("Starting data transformation")
 
-    result = []
-    for i in raw_data:
-        result.append(transform_weather_data(i))
+    result = transform_to_batch(raw_data)
 
     logger.info("Transformed %d records", len(result))
+    LAST_SUCCESS.labels("transform").set_to_current_time()
+    export_metrics(f"transform{shard_suffix(shard)}")
     return result
 
 
-def transform_data(**context):
-    """Airflow wrapper for transform."""
-    ti = context["ti"]
-    raw_data = ti.xcom_pull(task_ids="extract_weather_data")
-    return transform_data_impl(raw_data)
+def plan_shards(
+    cities: List[str],
+    shard_size: Optional[int] = None,
+    max_shards: Optional[int] = None,
+) -> List[List[str]]:
+    """
+    Split the city list into contiguous shards of similar size.
+
+    Contiguous shards keep neighbouring cities together, so each shard can
+    still use the multi-city group endpoint.
+
+    Args:
+        cities: City names
+        shard_size: Target number of cities per shard. If None, uses
+            ``pipeline.shards.size`` from config.yaml
+        max_shards: Upper bound on the number of shards. If None, uses
+            ``pipeline.shards.max_count`` from config.yaml
+
+    Returns:
+        List of city lists, never empty
+    """
+    shard_config = load_config().get("pipeline", {}).get("shards", {})
+    if shard_size is None:
+        shard_size = shard_config.get("size", 50)
+    if max_shards is None:
+        max_shards = shard_config.get("max_count", 16)
+
+    count = max(1, min(max_shards, -(-len(cities) // max(shard_size, 1))))
+    base, extra = divmod(len(cities), count)
+    shards = []
+    start = 0
+    for index in range(count):
+        end = start + base + (1 if index < extra else 0)
+        shards.append(cities[start:end])
+        start = end
+    return shards
+
+
+def plan_shards_task(**context) -> List[Dict]:
+    """
+    Airflow task that splits the configured cities into shards.
+
+    Also removes staging output of old runs, once per run.
+
+    Returns:
+        One ``{"shard", "cities"}`` dict per shard, used to map the
+        extract task
+    """
+    setup_logging()
+    cleanup_staging()
+    shards = plan_shards(load_config()["cities"])
+    logger.info("Planned %d shards", len(shards))
+    return [{"shard": index, "cities": cities} for index, cities in enumerate(shards)]
+
+
+def extract_data_task(
+    shard: Optional[int] = None, cities: Optional[List[str]] = None, **context
+) -> dict:
+    """Airflow wrapper for extract. Stages raw payloads and returns their path."""
+    staged = write_stage(
+        extract_data(cities, shard), "raw", context["run_id"], shard=shard
+    )
+    return {"shard": shard, "staged": staged}
 
 
-def load_data_impl(clean_data: List[Dict]) -> None:
+def transform_data(
+    shard: Optional[int] = None, staged: Optional[dict] = None, **context
+) -> dict:
+    """Airflow wrapper for transform. Stages records and returns their path."""
+    if staged is None:
+        staged = context["ti"].xcom_pull(task_ids="extract_weather_data")["staged"]
+    typed = load_config()["api"].get("typed_decoding", False)
+    raw_data = read_stage(staged, typed=typed)
+    clean = write_stage(
+        transform_data_impl(raw_data, shard), "clean", context["run_id"], shard=shard
+    )
+    return {"shard": shard, "staged": clean}
+
+
+def load_data_impl(clean_data: Records, shard: Optional[int] = None) -> tuple[int, int]:
     """
-    Load: Save transformed data to database.
+    Load: Validate transformed data, save it to database and, if
+    ``archive.enabled``, append it to the Parquet archive.
+
+    Records failing validation are quarantined instead of loaded. Sharded
+    loads leave archive compaction to ``merge_shard_stats_task``, so it runs
+    once per run instead of racing between shards.
 
     Args:
-        clean_data: List of transformed weather data dictionaries
+        clean_data: WeatherBatch or list of transformed weather records
+        shard: City shard index when run as one of several mapped tasks
+
+    Returns:
+        Tuple of (inserted_count, duplicate_count)
     """
-    logger = logging.getLogger(__name__)
     logger.info("Starting data load to database")
 
-    save_to_database(clean_data)
+    clean_data = validate_data(clean_data)
+    inserted, duplicates = save_to_database(clean_data, shard=shard)
+
+    if load_config().get("archive", {}).get("enabled", False):
+        save_to_archive(clean_data)
+        if shard is None:
+            compact_archive()
 
     logger.info("Data load completed")
+    LAST_SUCCESS.labels("load").set_to_current_time()
+    export_metrics(f"load{shard_suffix(shard)}")
+    return inserted, duplicates
 
 
-def load_data(**context):
-    """Airflow wrapper for load."""
-    ti = context["ti"]
-    clean_data = ti.xcom_pull(task_ids="transform_weather_data")
-    return load_data_impl(clean_data)
+def load_data(
+    shard: Optional[int] = None, staged: Optional[dict] = None, **context
+) -> dict:
+    """Airflow wrapper for load. Returns the shard's load statistics."""
+    if staged is None:
+        staged = context["ti"].xcom_pull(task_ids="transform_weather_data")["staged"]
+    inserted, duplicates = load_data_impl(read_stage(staged), shard)
+    return {
+        "shard": shard,
+        "records": staged["rows"],
+        "inserted": inserted,
+        "duplicates": duplicates,
+    }
 
 
-if __name__ == "__main__":
+def merge_shard_stats(stats: List[Dict]) -> dict:
+    """
+    Sum per-shard load statistics.
+
+    Args:
+        stats: Dicts returned by ``load_data``, one per shard
+
+    Returns:
+        Dict with "shards", "records", "inserted" and "duplicates" totals
+    """
+    totals = {"shards": 0, "records": 0, "inserted": 0, "duplicates": 0}
+    for shard_stats in stats:
+        totals["shards"] += 1
+        for key in ("records", "inserted", "duplicates"):
+            totals[key] += shard_stats.get(key, 0)
+    return totals
+
+
+def merge_shard_stats_task(stats: Optional[List[Dict]] = None, **context) -> dict:
+    """
+    Airflow task that logs the merged load statistics of all shards and, if
+    ``archive.enabled``, compacts the archive once for the whole run.
+    """
+    setup_logging()
+    totals = merge_shard_stats(list(stats or []))
+    if load_config().get("archive", {}).get("enabled", False):
+        compact_archive()
+    logger.info(
+        "Run loaded %d records from %d shards: inserted %d, duplicates %d",
+        totals["records"],
+        totals["shards"],
+        totals["inserted"],
+        totals["duplicates"],
+    )
+    return totals
+
+
+def maintain_partitions_task(**context) -> dict:
+    """Airflow wrapper for partition maintenance."""
+    setup_logging()
+    return maintain_partitions()
+
+
+def run_streaming(
+    batch_size: Optional[int] = None, flush_interval: Optional[float] = None
+) -> tuple[int, int]:
+    """
+    Run extract, transform and load as a stream of micro-batches.
+
+    Payloads are transformed and loaded as they arrive from the API. A batch
+    is flushed to the database once it holds ``batch_size`` payloads or
+    ``flush_interval`` seconds have passed since the last flush, so memory
+    stays flat and the first rows are loaded before the slowest city returns.
+
+    Args:
+        batch_size: Maximum payloads per batch. If None, uses
+            ``pipeline.stream.batch_size`` from config.yaml
+        flush_interval: Maximum seconds between flushes. If None, uses
+            ``pipeline.stream.flush_interval`` from config.yaml
+
+    Returns:
+        Tuple of (inserted_count, duplicate_count) over all batches
+    """
+    config = load_config()
+    setup_logging()
+
+    stream_config = config.get("pipeline", {}).get("stream", {})
+    if batch_size is None:
+        batch_size = stream_config.get("batch_size", 100)
+    if flush_interval is None:
+        flush_interval = stream_config.get("flush_interval", 5)
+
+    weather_api = WeatherAPI(config)
+    cities_list = config["cities"]
+    logger.info(
+        "Starting streaming run for %d cities (batch_size=%d, flush_interval=%ss)",
+        len(cities_list),
+        batch_size,
+        flush_interval,
+    )
+
+    buffer = []
+    extracted = inserted = duplicates = 0
+    last_flush = time.monotonic()
+
+    def flush():
+        nonlocal inserted, duplicates, last_flush
+        last_flush = time.monotonic()
+        if not buffer:
+            return
+        records = validate_data(transform_to_batch(buffer))
+        buffer.clear()
+        batch_inserted, batch_duplicates = save_to_database(records)
+        inserted += batch_inserted
+        duplicates += batch_duplicates
+
+    try:
+        for payload in weather_api.iter_weather_data(
+            cities_list, heartbeat=flush_interval
+        ):
+            if payload is not None:
+                buffer.append(payload)
+                extracted += 1
+            if (
+                len(buffer) >= batch_size
+                or time.monotonic() - last_flush >= flush_interval
+            ):
+                flush()
+        flush()
+    finally:
+        weather_api.close()
+
+    logger.info(
+        "Streaming run completed: extracted %d, inserted %d, duplicates %d",
+        extracted,
+        inserted,
+        duplicates,
+    )
+    LAST_SUCCESS.labels("stream").set_to_current_time()
+    export_metrics("stream")
+    return inserted, duplicates
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point for a single pipeline run."""
+    parser = argparse.ArgumentParser(description="Run the weather ETL pipeline.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="load micro-batches as payloads arrive instead of one batch per stage",
+    )
+    args = parser.parse_args(argv)
+    start_metrics_server()
+
+    if args.stream:
+        run_streaming()
+        return
+
     raw = extract_data()
     clean = transform_data_impl(raw)
     load_data_impl(clean)
+
+
+if __name__ == "__main__":
+    main()
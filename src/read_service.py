@@ -0,0 +1,515 @@
+import json
+import logging
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+import requests
+from .config import load_config
+from .db import get_connection
+from .transform.records import WeatherRecord
+from .utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+NEWEST_SQL = "SELECT max(measurement_time) FROM weather_measurements"
+
+WARM_SQL = """
+SELECT city, temperature_celsius, measurement_time, humidity, pressure, wind_speed
+FROM (
+    SELECT city, temperature_celsius, measurement_time, humidity, pressure,
+        wind_speed,
+        row_number() OVER (
+            PARTITION BY city ORDER BY measurement_time DESC
+        ) AS position
+    FROM weather_measurements
+    WHERE measurement_time >= %s
+) AS recent
+WHERE position <= %s
+ORDER BY city, measurement_time
+"""
+
+
+def _reading_to_json(record: WeatherRecord) -> dict:
+    reading = record._asdict()
+    reading["measurement_time"] = record.measurement_time.isoformat()
+    return reading
+
+
+class ReadingsBuffer:
+    """
+    Per-city ring buffers of the most recent measurements.
+
+    Each city keeps at most ``capacity`` readings ordered by measurement
+    time. The buffer also tracks, per city, the horizon from which it holds
+    every reading that was loaded, so callers can tell whether a window can
+    be answered from memory or needs the database.
+
+    Attributes:
+        capacity: Readings kept per city
+        warm: Whether the buffer was filled from the database
+    """
+
+    def __init__(self, capacity: int = 168):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            capacity: Readings kept per city
+        """
+        self.logger = logging.getLogger(__name__)
+        self.capacity = max(1, capacity)
+        self.warm = False
+        self._readings: dict[str, deque[WeatherRecord]] = {}
+        self._horizon: dict[str, datetime] = {}
+        self._cutoff: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def _insert(self, record: WeatherRecord) -> bool:
+        city, measurement_time = record.city, record.measurement_time
+        readings = self._readings.get(city)
+        if readings is None:
+            readings = self._readings[city] = deque(maxlen=self.capacity)
+            self._horizon[city] = (
+                self._cutoff if self._cutoff is not None else measurement_time
+            )
+        if measurement_time < self._horizon[city]:
+            return False
+
+        if not readings or readings[-1].measurement_time < measurement_time:
+            full = len(readings) == self.capacity
+            readings.append(record)
+            if full:
+                self._horizon[city] = readings[0].measurement_time
+            return True
+
+        index = len(readings)
+        while index and readings[index - 1].measurement_time > measurement_time:
+            index -= 1
+        if index and readings[index - 1].measurement_time == measurement_time:
+            return False
+        if len(readings) == self.capacity:
+            if index == 0:
+                return False
+            readings.popleft()
+            index -= 1
+            self._horizon[city] = readings[0].measurement_time
+        readings.insert(index, record)
+        return True
+
+    def add(self, records: Iterable[WeatherRecord]) -> int:
+        """
+        Add loaded readings; readings already buffered are ignored.
+
+        Args:
+            records: Readings in INSERT column order
+
+        Returns:
+            Number of readings added
+        """
+        with self._lock:
+            return sum(self._insert(WeatherRecord(*record)) for record in records)
+
+    def seed(self, cursor, window_hours: float = 168) -> int:
+        """
+        Replace the buffer contents with recent rows from the database.
+
+        Args:
+            cursor: Database cursor
+            window_hours: Hours of history read behind the newest measurement
+
+        Returns:
+            Number of readings loaded
+        """
+        cursor.execute(NEWEST_SQL)
+        newest = cursor.fetchone()[0]
+        if newest is None:
+            cutoff, rows = datetime.min, []
+        else:
+            cutoff = newest - timedelta(hours=window_hours)
+            cursor.execute(WARM_SQL, (cutoff, self.capacity))
+            rows = cursor.fetchall()
+
+        with self._lock:
+            self._readings.clear()
+            self._horizon.clear()
+            self._cutoff = cutoff
+            for row in rows:
+                self._insert(WeatherRecord(*row))
+            for city, readings in self._readings.items():
+                if len(readings) == self.capacity:
+                    # older rows in the window were cut by the capacity
+                    self._horizon[city] = readings[0].measurement_time
+            self.warm = True
+        self.logger.info(
+            "Warmed readings buffer with %d readings for %d cities",
+            len(rows),
+            len(self._readings),
+        )
+        return len(rows)
+
+    def latest(self, cities: Optional[List[str]] = None) -> List[WeatherRecord]:
+        """
+        Get the newest reading of each city.
+
+        Args:
+            cities: Cities to include. If None, includes all cities
+
+        Returns:
+            One reading per buffered city, ordered by city
+        """
+        with self._lock:
+            names = sorted(self._readings) if cities is None else sorted(cities)
+            return [
+                self._readings[city][-1] for city in names if self._readings.get(city)
+            ]
+
+    def recent(
+        self,
+        cities: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> tuple[List[WeatherRecord], bool]:
+        """
+        Get buffered readings in a time window.
+
+        Args:
+            cities: Cities to include. If None, includes all cities
+            since: Start of the window (inclusive). If None, from the oldest
+                buffered reading
+            until: End of the window (exclusive). If None, up to the newest
+
+        Returns:
+            Tuple of (readings ordered by city and time, complete), where
+            ``complete`` tells whether the buffer holds every loaded reading
+            of the window
+        """
+        with self._lock:
+            names = sorted(self._readings) if cities is None else sorted(cities)
+            readings = [
+                record
+                for city in names
+                for record in self._readings.get(city, ())
+                if (since is None or record.measurement_time >= since)
+                and (until is None or record.measurement_time < until)
+            ]
+            complete = since is not None and all(
+                self._horizon.get(
+                    city, datetime.max if self._cutoff is None else self._cutoff
+                )
+                <= since
+                for city in names
+            )
+            return readings, complete
+
+    def __len__(self) -> int:
+        return sum(len(readings) for readings in self._readings.values())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON endpoints over a ReadingsBuffer."""
+
+    server: "ReadingsServer"
+
+    def _send(self, status: int, body: dict) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        buffer = self.server.buffer
+        cities = query.get("city")
+        try:
+            if url.path == "/health":
+                self._send(
+                    200,
+                    {
+                        "status": "ok",
+                        "warm": buffer.warm,
+                        "readings": len(buffer),
+                    },
+                )
+            elif url.path == "/latest":
+                readings = buffer.latest(cities)
+                self._send(200, {"readings": [_reading_to_json(r) for r in readings]})
+            elif url.path == "/recent":
+                since = query.get("since")
+                until = query.get("until")
+                readings, complete = buffer.recent(
+                    cities,
+                    since=datetime.fromisoformat(since[0]) if since else None,
+                    until=datetime.fromisoformat(until[0]) if until else None,
+                )
+                self._send(
+                    200,
+                    {
+                        "readings": [_reading_to_json(r) for r in readings],
+                        "complete": complete,
+                    },
+                )
+            else:
+                self._send(404, {"error": f"Unknown path: {url.path}"})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/readings":
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            rows = json.loads(self.rfile.read(length))["rows"]
+            records = [
+                WeatherRecord(
+                    city,
+                    temperature,
+                    datetime.fromisoformat(measurement_time),
+                    humidity,
+                    pressure,
+                    wind,
+                )
+                for city, temperature, measurement_time, humidity, pressure, wind in rows
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": f"Invalid readings: {e}"})
+            return
+        self._send(200, {"added": self.server.buffer.add(records)})
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ReadingsServer(ThreadingHTTPServer):
+    """Threaded HTTP server serving a ReadingsBuffer."""
+
+    def __init__(self, buffer: ReadingsBuffer, host: str = "127.0.0.1", port: int = 0):
+        """
+        Bind the server.
+
+        Args:
+            buffer: Buffer to serve
+            host: Interface to bind to
+            port: Port to bind to (0 picks a free port)
+        """
+        super().__init__((host, port), _Handler)
+        self.buffer = buffer
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class ReadingsClient:
+    """
+    Client of the readings service.
+
+    Attributes:
+        url: Base URL of the service
+        timeout: Request timeout in seconds
+    """
+
+    def __init__(self, url: str, timeout: float = 2):
+        """
+        Initialize the client.
+
+        Args:
+            url: Base URL of the service
+            timeout: Request timeout in seconds
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _get(self, path: str, params: dict) -> dict:
+        response = self.session.get(
+            f"{self.url}{path}", params=params, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def push(self, records: Iterable[tuple]) -> int:
+        """
+        Send loaded readings to the service.
+
+        Args:
+            records: Readings in INSERT column order
+
+        Returns:
+            Number of readings the service added
+
+        Raises:
+            requests.RequestException: If the service cannot be reached
+        """
+        rows = [
+            [city, temperature, measurement_time.isoformat(), humidity, pressure, wind]
+            for city, temperature, measurement_time, humidity, pressure, wind in records
+        ]
+        response = self.session.post(
+            f"{self.url}/readings", json={"rows": rows}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["added"]
+
+    def latest(self, cities: Optional[List[str]] = None) -> List[dict]:
+        """
+        Get the newest reading of each city.
+
+        Args:
+            cities: Cities to include. If None, includes all cities
+
+        Returns:
+            Reading dicts with ISO-formatted measurement times
+
+        Raises:
+            requests.RequestException: If the service cannot be reached
+        """
+        return self._get("/latest", {"city": cities or []})["readings"]
+
+    def recent(
+        self,
+        cities: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> tuple[List[dict], bool]:
+        """
+        Get readings in a time window.
+
+        Args:
+            cities: Cities to include. If None, includes all cities
+            since: Start of the window (inclusive)
+            until: End of the window (exclusive)
+
+        Returns:
+            Tuple of (reading dicts, complete); see ``ReadingsBuffer.recent``
+
+        Raises:
+            requests.RequestException: If the service cannot be reached
+        """
+        params = {"city": cities or []}
+        if since is not None:
+            params["since"] = since.isoformat()
+        if until is not None:
+            params["until"] = until.isoformat()
+        body = self._get("/recent", params)
+        return body["readings"], body["complete"]
+
+
+def _service_config() -> dict:
+    return load_config().get("read_service", {})
+
+
+_clients: dict[tuple[str, float], ReadingsClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_readings_client() -> Optional[ReadingsClient]:
+    """
+    Get the process-wide client of the configured readings service.
+
+    Settings are read from ``read_service`` in config.yaml; ``url`` defaults
+    to ``http://<host>:<port>``. The client, and its pooled session, is
+    created on first use and shared by later calls.
+
+    Returns:
+        Shared ReadingsClient, or None if the service is disabled
+    """
+    config = _service_config()
+    if not config.get("enabled", False):
+        return None
+    url = config.get("url") or (
+        f"http://{config.get('host', '127.0.0.1')}:{config.get('port', 8765)}"
+    )
+    key = (url, config.get("timeout", 2))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = ReadingsClient(url, timeout=key[1])
+        return _clients[key]
+
+
+def publish_readings(records: list[tuple]) -> int:
+    """
+    Push loaded readings to the readings service, if enabled.
+
+    Failures are logged and ignored; the service re-reads the database when
+    it is restarted.
+
+    Args:
+        records: Inserted readings in INSERT column order
+
+    Returns:
+        Number of readings the service added
+    """
+    if not records:
+        return 0
+    client = get_readings_client()
+    if client is None:
+        return 0
+    try:
+        return client.push(records)
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logger.warning("Could not publish readings to %s: %s", client.url, e)
+        return 0
+
+
+def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    warm: bool = True,
+) -> None:
+    """
+    Run the readings service until interrupted.
+
+    Args:
+        host: Interface to bind to. If None, uses ``read_service.host``
+        port: Port to bind to. If None, uses ``read_service.port``
+        warm: Fill the buffer from the database before serving
+    """
+    config = _service_config()
+    setup_logging()
+    buffer = ReadingsBuffer(config.get("capacity", 168))
+    if warm:
+        with get_connection() as dbconnect:
+            with dbconnect.cursor() as cursor:
+                buffer.seed(cursor, config.get("window_hours", 168))
+            dbconnect.rollback()
+
+    server = ReadingsServer(
+        buffer,
+        host or config.get("host", "127.0.0.1"),
+        config.get("port", 8765) if port is None else port,
+    )
+    logger.info("Serving readings on %s", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point for the readings service."""
+    parser = argparse.ArgumentParser(
+        description="Serve recent weather readings from memory."
+    )
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument(
+        "--no-warm", action="store_true", help="start empty instead of reading the DB"
+    )
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, warm=not args.no_warm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import re
+import json
+import time
+import shutil
+import logging
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Optional, Union
+from .config import load_config, shard_suffix
+from .extract.decoder import decode_weather, encode_payload
+from .transform.records import CLEAN_SCHEMA, Records, WeatherBatch, as_batch
+
+logger = logging.getLogger(__name__)
+
+RAW_SCHEMA = pa.schema([("payload", pa.string())])
+
+STAGE_SCHEMAS = {"raw": RAW_SCHEMA, "clean": CLEAN_SCHEMA}
+
+
+def _staging_config() -> dict:
+    return load_config().get("staging", {})
+
+
+def _run_dir(staging_dir: str, run_id: str) -> Path:
+    """Directory for one DAG run, with the run id made filesystem-safe."""
+    safe_run_id = re.sub(r"[^A-Za-z0-9_.-]", "_", run_id)
+    return Path(staging_dir) / safe_run_id
+
+
+def write_stage(
+    records: Union[list, Records],
+    stage: str,
+    run_id: str,
+    staging_dir: Optional[str] = None,
+    shard: Optional[int] = None,
+) -> dict:
+    """
+    Write stage output to a compressed Parquet file.
+
+    Raw payloads are stored as one JSON string per row; transformed records
+    are stored as typed columns. None records are dropped.
+
+    Args:
+        records: Raw payloads ("raw"), or a WeatherBatch or list of
+            transformed records ("clean")
+        stage: Stage name, one of "raw" or "clean"
+        run_id: Identifier of the pipeline run (e.g. Airflow run_id)
+        staging_dir: Staging directory. If None, uses ``staging.dir``
+        shard: City shard index, so mapped tasks of one run write
+            separate files
+
+    Returns:
+        Small dict with "stage", "path" and "rows", suitable for XCom
+
+    Raises:
+        ValueError: If stage is unknown
+    """
+    if stage not in STAGE_SCHEMAS:
+        raise ValueError(f"Unknown stage: {stage}")
+
+    config = _staging_config()
+    if staging_dir is None:
+        staging_dir = config.get("dir", "data/staging/")
+
+    if stage == "raw":
+        rows = [
+            {"payload": encode_payload(record).decode()}
+            for record in records
+            if record is not None
+        ]
+        table = pa.Table.from_pylist(rows, schema=RAW_SCHEMA)
+    else:
+        table = as_batch(records).to_arrow()
+
+    run_dir = _run_dir(staging_dir, run_id)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    path = run_dir / f"{stage}{shard_suffix(shard)}.parquet"
+    pq.write_table(table, path, compression=config.get("compression", "zstd"))
+
+    logger.info("Staged %d %s records to %s", table.num_rows, stage, path)
+    return {"stage": stage, "path": str(path), "rows": table.num_rows}
+
+
+def read_stage(staged: dict, typed: bool = False) -> Union[list, WeatherBatch]:
+    """
+    Read stage output written by ``write_stage``.
+
+    Args:
+        staged: Dict returned by ``write_stage``
+        typed: Decode raw payloads into typed ``WeatherPayload`` structs
+            (only the fields used by the transform) instead of dicts
+
+    Returns:
+        Raw payloads, or a WeatherBatch of transformed records
+    """
+    table = pq.read_table(staged["path"], memory_map=True)
+    if staged["stage"] == "raw":
+        decode = decode_weather if typed else json.loads
+        return [decode(payload) for payload in table.column("payload").to_pylist()]
+    return WeatherBatch.from_arrow(table)
+
+
+def cleanup_staging(
+    staging_dir: Optional[str] = None, retention_hours: Optional[float] = None
+) -> int:
+    """
+    Remove staging directories of runs older than the retention window.
+
+    Args:
+        staging_dir: Staging directory. If None, uses ``staging.dir``
+        retention_hours: Age after which a run is removed. If None, uses
+            ``staging.retention_hours``
+
+    Returns:
+        Number of removed run directories
+    """
+    config = _staging_config()
+    if staging_dir is None:
+        staging_dir = config.get("dir", "data/staging/")
+    if retention_hours is None:
+        retention_hours = config.get("retention_hours", 24)
+
+    root = Path(staging_dir)
+    if not root.exists():
+        return 0
+
+    cutoff = time.time() - retention_hours * 3600
+    removed = 0
+    for run_dir in root.iterdir():
+        if run_dir.is_dir() and run_dir.stat().st_mtime < cutoff:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            removed += 1
+
+    if removed:
+        logger.info("Removed %d old staging runs from %s", removed, root)
+    return removed
@@ -1,6 +1,13 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
+import time
 import logging
+import numpy as np
+from ..extract.decoder import MainFields, Payload, WeatherPayload, payload_to_dict
+from .records import WeatherBatch, column_values, float_column
+from ..utils.metrics import TRANSFORM_RECORDS, TRANSFORM_SECONDS
+
+logger = logging.getLogger(__name__)
 
 
 def kelvin_to_celsius(kelvin: float) -> float:
@@ -49,35 +56,38 @@ def safe_get(data: dict, *keys, default: Any = None) -> Any:
         safe_get(data, 'main', 'temp', default=0)
         # Equivalent to: data.get('main', {}).get('temp', 0)
     """
-    logger = logging.getLogger(__name__)
     current = data
     for key in keys:
         if not isinstance(current, dict):
-            logger.debug(
-                "Cannot traverse - current is %s, not dict (key=%s, path=%s)",
-                type(current).__name__,
-                key,
-                keys,
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Cannot traverse - current is %s, not dict (key=%s, path=%s)",
+                    type(current).__name__,
+                    key,
+                    keys,
+                )
             return default
         current = current.get(key)
         if current is None:
-            logger.debug("Key '%s' not found in path %s", key, keys)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Key '%s' not found in path %s", key, keys)
             return default
     return current
 
 
-def transform_weather_data(raw_data: dict) -> dict:
+def transform_weather_data(raw_data: Payload) -> dict:
     """
     Transform raw API data to clean format.
 
     Args:
-        raw_data: Raw JSON from OpenWeatherMap API
+        raw_data: Raw JSON from OpenWeatherMap API (dict or typed payload)
 
     Returns:
         dict: Cleaned and transformed data, or None if city name is missing
     """
-    logger = logging.getLogger(__name__)
+    if isinstance(raw_data, WeatherPayload):
+        raw_data = payload_to_dict(raw_data)
+
     city = safe_get(raw_data, "name")
 
     if not city:
@@ -114,3 +124,190 @@ def transform_weather_data(raw_data: dict) -> dict:
     }
 
     return result_dict
+
+
+_EMPTY_MAIN = MainFields()
+
+
+def _payload_section(payload: dict, key: str) -> dict:
+    """Return a nested payload section, or an empty dict if it is not a dict."""
+    section = payload.get(key)
+    return section if isinstance(section, dict) else {}
+
+
+def _collect_columns(raw_data: list[Payload]) -> tuple[list[int], list[list]]:
+    """
+    Pull the used fields of each payload into column lists.
+
+    Payloads without a city name or measurement time are skipped with an
+    error, as in ``transform_weather_data``.
+
+    Args:
+        raw_data: Raw payloads, as dicts or typed payloads
+
+    Returns:
+        Tuple of (positions of kept payloads, [cities, timestamps, temps,
+        humidity, pressure, wind_speed] column lists)
+    """
+    positions = []
+    columns = [[], [], [], [], [], []]
+    cities, timestamps, temps, humidity, pressure, wind_speed = columns
+
+    for position, payload in enumerate(raw_data):
+        if isinstance(payload, WeatherPayload):
+            city = payload.name
+            measurement_time = payload.dt
+            main = payload.main or _EMPTY_MAIN
+            values = (
+                main.temp,
+                main.humidity,
+                main.pressure,
+                payload.wind.speed if payload.wind is not None else None,
+            )
+        elif isinstance(payload, dict):
+            city = payload.get("name")
+            measurement_time = payload.get("dt")
+            main = _payload_section(payload, "main")
+            values = (
+                main.get("temp"),
+                main.get("humidity"),
+                main.get("pressure"),
+                _payload_section(payload, "wind").get("speed"),
+            )
+        else:
+            logger.error("Missing city name in data")
+            continue
+        if not city:
+            logger.error("Missing city name in data")
+            continue
+        if not measurement_time:
+            logger.error("Missing measurement time for %s", city)
+            continue
+
+        positions.append(position)
+        cities.append(city)
+        timestamps.append(measurement_time)
+        temps.append(values[0])
+        humidity.append(values[1])
+        pressure.append(values[2])
+        wind_speed.append(values[3])
+
+    return positions, columns
+
+
+def _transform_columns(columns: list[list]) -> WeatherBatch:
+    """
+    Convert collected columns into a batch in one vectorized pass.
+
+    Args:
+        columns: Column lists from ``_collect_columns`` (non-empty)
+
+    Returns:
+        WeatherBatch with one record per collected payload
+
+    Raises:
+        ValueError: If any temperature is negative in Kelvin
+    """
+    cities, timestamps, temps, humidity, pressure, wind_speed = columns
+
+    kelvin = float_column(temps)
+    negative = kelvin < 0
+    if negative.any():
+        value = kelvin[np.argmax(negative)]
+        raise ValueError(f"Temperature cannot be negative in Kelvin: {value}K")
+
+    unique_times, inverse = np.unique(np.asarray(timestamps), return_inverse=True)
+    batch = WeatherBatch(
+        cities,
+        kelvin - 273.15,
+        [timestamp_to_datetime(t) for t in unique_times.tolist()],
+        inverse.astype(np.int64, copy=False),
+        float_column(humidity),
+        float_column(pressure),
+        float_column(wind_speed),
+    )
+
+    incomplete = np.isnan(kelvin)
+    for column in (batch.humidity, batch.pressure, batch.wind_speed):
+        incomplete |= np.isnan(column)
+    for index in np.flatnonzero(incomplete).tolist():
+        logger.warning("Incomplete data for %s", cities[index])
+    return batch
+
+
+def transform_to_batch(raw_data: list[Payload]) -> WeatherBatch:
+    """
+    Transform a batch of raw API payloads into a columnar WeatherBatch.
+
+    Same rules as ``transform_weather_batch``, but dropped payloads are left
+    out and no per-record dicts are built; this is the form the staging,
+    load and CSV stages consume.
+
+    Args:
+        raw_data: List of raw JSON payloads from OpenWeatherMap API, as
+            dicts or typed payloads
+
+    Returns:
+        WeatherBatch of the kept payloads, in input order
+
+    Raises:
+        ValueError: If any temperature is negative in Kelvin
+    """
+    started = time.perf_counter()
+    positions, columns = _collect_columns(raw_data)
+    if positions:
+        batch = _transform_columns(columns)
+    else:
+        batch = WeatherBatch.from_records([])
+
+    TRANSFORM_RECORDS.labels("kept").inc(len(positions))
+    TRANSFORM_RECORDS.labels("dropped").inc(len(raw_data) - len(positions))
+    TRANSFORM_SECONDS.observe(time.perf_counter() - started)
+    return batch
+
+
+def transform_weather_batch(raw_data: list[Payload]) -> list[Optional[dict]]:
+    """
+    Transform a batch of raw API payloads in one vectorized pass.
+
+    Fields are pulled into columnar NumPy arrays once, Kelvin is converted
+    for the whole batch at once and each distinct timestamp is converted to
+    a datetime only once. Missing-field rules match ``transform_weather_data``:
+    payloads without a city name or measurement time are dropped, partial
+    payloads are kept with None fields and a warning. Typed payloads from
+    ``decode_weather`` are read by attribute without any dict lookups.
+
+    Args:
+        raw_data: List of raw JSON payloads from OpenWeatherMap API, as
+            dicts or typed payloads
+
+    Returns:
+        List of the same length as ``raw_data`` with a cleaned dict per
+        payload, or None where the payload was dropped
+
+    Raises:
+        ValueError: If any temperature is negative in Kelvin
+    """
+    started = time.perf_counter()
+    results: list[Optional[dict]] = [None] * len(raw_data)
+
+    positions, columns = _collect_columns(raw_data)
+    if positions:
+        batch = _transform_columns(columns)
+        cities, _, _, humidity, pressure, wind_speed = columns
+        celsius = column_values(batch.temperature_celsius)
+        times = [batch.times[index] for index in batch.time_index.tolist()]
+        for index, position in enumerate(positions):
+            results[position] = {
+                "city": cities[index],
+                "temperature_celsius": celsius[index],
+                "measurement_time": times[index],
+                "humidity": humidity[index],
+                "pressure": pressure[index],
+                "wind_speed": wind_speed[index],
+            }
+
+    TRANSFORM_RECORDS.labels("kept").inc(len(positions))
+    TRANSFORM_RECORDS.labels("dropped").inc(len(raw_data) - len(positions))
+    TRANSFORM_SECONDS.observe(time.perf_counter() - started)
+    return results
@@ -0,0 +1,300 @@
+import numpy as np
+import pyarrow as pa
+from datetime import datetime
+from functools import partial
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+CLEAN_SCHEMA = pa.schema(
+    [
+        ("city", pa.string()),
+        ("temperature_celsius", pa.float64()),
+        ("measurement_time", pa.timestamp("us")),
+        ("humidity", pa.int64()),
+        ("pressure", pa.int64()),
+        ("wind_speed", pa.float64()),
+    ]
+)
+
+
+class WeatherRecord(NamedTuple):
+    """
+    One transformed measurement.
+
+    Fields are in ``weather_measurements`` INSERT column order, so a record
+    can be passed to the database driver as a row as is.
+    """
+
+    city: str
+    temperature_celsius: Optional[float]
+    measurement_time: datetime
+    humidity: Optional[int]
+    pressure: Optional[int]
+    wind_speed: Optional[float]
+
+
+FIELDS = WeatherRecord._fields
+
+# tuple.__new__ skips the per-field argument handling of WeatherRecord(...)
+_make_record = partial(tuple.__new__, WeatherRecord)
+
+
+def float_column(values: list) -> np.ndarray:
+    """Float64 column with NaN for missing values."""
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=np.float64
+    )
+
+
+def column_values(column: np.ndarray, integer: bool = False) -> list:
+    """
+    Column values as Python objects, with None for NaN.
+
+    With ``integer``, whole values become ints; fractional values stay
+    floats instead of being truncated, matching the per-record transform.
+    """
+    missing = np.isnan(column)
+    if integer:
+        filled = np.where(missing, 0, column)
+        values = filled.astype(np.int64).tolist()
+        for index in np.flatnonzero(filled != np.trunc(filled)).tolist():
+            values[index] = float(filled[index])
+    else:
+        values = column.tolist()
+    for index in np.flatnonzero(missing).tolist():
+        values[index] = None
+    return values
+
+
+class WeatherBatch:
+    """
+    Columnar batch of transformed measurements.
+
+    Numeric fields are stored as float64 arrays with NaN for missing values,
+    and each distinct measurement time is stored once and referenced by
+    index, so a batch costs a few dozen bytes per record instead of a dict.
+    Iterating yields ``WeatherRecord`` tuples.
+
+    Attributes:
+        cities: City name per record
+        temperature_celsius: Temperatures in Celsius
+        times: Distinct measurement times
+        time_index: Index into ``times`` per record
+        humidity: Humidity in percent
+        pressure: Pressure in hPa
+        wind_speed: Wind speed in m/s
+    """
+
+    __slots__ = (
+        "cities",
+        "temperature_celsius",
+        "times",
+        "time_index",
+        "humidity",
+        "pressure",
+        "wind_speed",
+    )
+
+    def __init__(
+        self,
+        cities: list[str],
+        temperature_celsius: np.ndarray,
+        times: list[datetime],
+        time_index: np.ndarray,
+        humidity: np.ndarray,
+        pressure: np.ndarray,
+        wind_speed: np.ndarray,
+    ):
+        """
+        Create a batch from its columns (all of the same length).
+
+        Args:
+            cities: City name per record
+            temperature_celsius: Temperatures, NaN where missing
+            times: Distinct measurement times
+            time_index: Index into ``times`` per record
+            humidity: Humidity, NaN where missing
+            pressure: Pressure, NaN where missing
+            wind_speed: Wind speed, NaN where missing
+        """
+        self.cities = cities
+        self.temperature_celsius = temperature_celsius
+        self.times = times
+        self.time_index = time_index
+        self.humidity = humidity
+        self.pressure = pressure
+        self.wind_speed = wind_speed
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Union[dict, WeatherRecord, None]]
+    ) -> "WeatherBatch":
+        """
+        Build a batch from record dicts or tuples, skipping None.
+
+        Args:
+            records: Transformed records
+
+        Returns:
+            WeatherBatch
+        """
+        columns = [[] for _ in FIELDS]
+        for record in records:
+            if record is None:
+                continue
+            if isinstance(record, dict):
+                record = WeatherRecord(**record)
+            for column, value in zip(columns, record):
+                column.append(value)
+
+        time_ids: dict[datetime, int] = {}
+        time_index = np.fromiter(
+            (time_ids.setdefault(t, len(time_ids)) for t in columns[2]),
+            dtype=np.int64,
+            count=len(columns[2]),
+        )
+        return cls(
+            columns[0],
+            float_column(columns[1]),
+            list(time_ids),
+            time_index,
+            float_column(columns[3]),
+            float_column(columns[4]),
+            float_column(columns[5]),
+        )
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> "WeatherBatch":
+        """
+        Build a batch from a table with ``CLEAN_SCHEMA`` columns.
+
+        Args:
+            table: Arrow table
+
+        Returns:
+            WeatherBatch
+        """
+
+        def numeric(name: str) -> np.ndarray:
+            column = table.column(name).cast(pa.float64())
+            return column.to_numpy().astype(np.float64, copy=False)
+
+        stamps = table.column("measurement_time").to_numpy().astype("datetime64[us]")
+        unique_times, time_index = np.unique(stamps, return_inverse=True)
+        return cls(
+            table.column("city").to_pylist(),
+            numeric("temperature_celsius"),
+            unique_times.tolist(),
+            time_index.astype(np.int64, copy=False),
+            numeric("humidity"),
+            numeric("pressure"),
+            numeric("wind_speed"),
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Convert the batch to an Arrow table with ``CLEAN_SCHEMA``.
+
+        Returns:
+            Arrow table
+        """
+
+        def integer(column: np.ndarray) -> pa.Array:
+            # rounds like PostgreSQL does when storing into INTEGER columns
+            missing = np.isnan(column)
+            values = np.rint(np.where(missing, 0, column)).astype(np.int64)
+            return pa.array(values, mask=missing)
+
+        times = np.array(self.times, dtype="datetime64[us]")
+        return pa.Table.from_arrays(
+            [
+                pa.array(self.cities, pa.string()),
+                pa.array(
+                    self.temperature_celsius,
+                    mask=np.isnan(self.temperature_celsius),
+                ),
+                pa.array(times[self.time_index]),
+                integer(self.humidity),
+                integer(self.pressure),
+                pa.array(self.wind_speed, mask=np.isnan(self.wind_speed)),
+            ],
+            schema=CLEAN_SCHEMA,
+        )
+
+    def take(self, rows: np.ndarray) -> "WeatherBatch":
+        """
+        Select rows of the batch.
+
+        Args:
+            rows: Boolean mask or integer row indices
+
+        Returns:
+            New WeatherBatch sharing the distinct times
+        """
+        return WeatherBatch(
+            np.array(self.cities, dtype=object)[rows].tolist(),
+            self.temperature_celsius[rows],
+            self.times,
+            self.time_index[rows],
+            self.humidity[rows],
+            self.pressure[rows],
+            self.wind_speed[rows],
+        )
+
+    def records(self) -> list[WeatherRecord]:
+        """
+        Materialize the batch as a list of records.
+
+        Returns:
+            List of WeatherRecord tuples
+        """
+        times = self.times
+        return list(
+            map(
+                _make_record,
+                zip(
+                    self.cities,
+                    column_values(self.temperature_celsius),
+                    [times[index] for index in self.time_index.tolist()],
+                    column_values(self.humidity, integer=True),
+                    column_values(self.pressure, integer=True),
+                    column_values(self.wind_speed),
+                ),
+            )
+        )
+
+    def __iter__(self) -> Iterator[WeatherRecord]:
+        return iter(self.records())
+
+    def __len__(self) -> int:
+        return len(self.cities)
+
+
+Records = Union[WeatherBatch, list[Union[dict, WeatherRecord, None]]]
+
+
+def as_records(data: Records) -> tuple[list[WeatherRecord], int]:
+    """
+    Normalize loader input to a list of records.
+
+    Args:
+        data: A WeatherBatch or a list of record dicts/tuples (None entries
+            are dropped)
+
+    Returns:
+        Tuple of (records, skipped_count)
+    """
+    if isinstance(data, WeatherBatch):
+        return data.records(), 0
+    records = [
+        WeatherRecord(**record) if isinstance(record, dict) else record
+        for record in data
+        if record is not None
+    ]
+    return records, len(data) - len(records)
+
+
+def as_batch(data: Records) -> WeatherBatch:
+    """Return ``data`` as a WeatherBatch (lists are converted)."""
+    if isinstance(data, WeatherBatch):
+        return data
+    return WeatherBatch.from_records(data)
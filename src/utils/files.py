@@ -0,0 +1,32 @@
+import os
+import json
+from pathlib import Path
+from typing import Any, Union
+
+
+def write_json_atomic(path: Union[str, Path], data: Any, **dump_kwargs) -> None:
+    """
+    Write JSON to a file atomically.
+
+    The data goes to a temporary file next to ``path``, named after the
+    process id so concurrent writers never share it, which then replaces
+    ``path``. Readers see either the old or the new file, never a partial one.
+
+    Args:
+        path: Destination file (parent directories are created)
+        data: JSON-serializable data
+        **dump_kwargs: Extra ``json.dump`` arguments (e.g. ``indent``)
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
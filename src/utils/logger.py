@@ -1,22 +1,76 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from ..config import load_config
 from pathlib import Path
 
+_listener = None
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process listener.
+
+    The standard handler formats every record in the calling thread so it
+    can be pickled; records here never leave the process, so formatting is
+    left entirely to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
 
 def setup_logging():
-    """Configure logging for the entire application."""
+    """Configure logging for the entire application.
+
+    With ``log.queue`` enabled (the default), the root logger only enqueues
+    records and the file and console handlers run on a background listener
+    thread, so slow disks or terminals do not block the pipeline.
+    """
+    global _listener
     config = load_config()
     log_level = getattr(logging, config["log"].get("level", "INFO"))
     Path(config["log"]["logs_dir"]).mkdir(parents=True, exist_ok=True)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("requests").setLevel(logging.WARNING)
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(
-                f"{config['log']['logs_dir']}/{config['log']['logs_filename']}"
-            ),
-            logging.StreamHandler(),
-        ],
+
+    log_path = f"{config['log']['logs_dir']}/{config['log']['logs_filename']}"
+
+    if not config["log"].get("queue", True):
+        logging.basicConfig(
+            level=log_level,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            handlers=[logging.FileHandler(log_path), logging.StreamHandler()],
+        )
+        return
+
+    root = logging.getLogger()
+    if _listener is not None or root.handlers:
+        return
+
+    handlers = [logging.FileHandler(log_path), logging.StreamHandler()]
+
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+    root.setLevel(log_level)
+    root.addHandler(_LocalQueueHandler(log_queue))
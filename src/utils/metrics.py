@@ -0,0 +1,152 @@
+import logging
+from pathlib import Path
+from typing import Optional
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    start_http_server,
+    write_to_textfile,
+)
+from prometheus_client.core import Metric
+from ..config import load_config
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = CollectorRegistry()
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "weather_api_request_seconds",
+    "Latency of OpenWeatherMap HTTP requests (per attempt)",
+    ["target"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+    registry=REGISTRY,
+)
+HTTP_RESPONSES = Counter(
+    "weather_api_responses_total",
+    "OpenWeatherMap HTTP responses by status code or error type",
+    ["target", "status"],
+    registry=REGISTRY,
+)
+EXTRACT_CACHE_HITS = Counter(
+    "weather_extract_cache_hits_total",
+    "Cities skipped because their cached data cannot have changed",
+    registry=REGISTRY,
+)
+TRANSFORM_SECONDS = Histogram(
+    "weather_transform_batch_seconds",
+    "Duration of batch transforms",
+    registry=REGISTRY,
+)
+TRANSFORM_RECORDS = Counter(
+    "weather_transform_records_total",
+    "Transformed payloads by outcome (kept or dropped)",
+    ["outcome"],
+    registry=REGISTRY,
+)
+VALIDATION_SECONDS = Histogram(
+    "weather_validation_batch_seconds",
+    "Duration of batch validation",
+    registry=REGISTRY,
+)
+VALIDATION_REJECTS = Counter(
+    "weather_validation_rejected_total",
+    "Records quarantined by field and check (range or outlier)",
+    ["field", "check"],
+    registry=REGISTRY,
+)
+LOAD_BATCH_SECONDS = Histogram(
+    "weather_load_batch_seconds",
+    "Duration of save_to_database batches",
+    registry=REGISTRY,
+)
+LOAD_ROWS = Counter(
+    "weather_load_rows_total",
+    "Rows sent to the database by result (inserted or duplicate)",
+    ["result"],
+    registry=REGISTRY,
+)
+LAST_SUCCESS = Gauge(
+    "weather_pipeline_last_success_timestamp_seconds",
+    "Unix time of the last successful run of a pipeline stage",
+    ["stage"],
+    registry=REGISTRY,
+)
+
+
+class _TaskLabelCollector:
+    """Collector re-exporting a registry with an extra ``task`` label."""
+
+    def __init__(self, registry: CollectorRegistry, task: str):
+        self.registry = registry
+        self.task = task
+
+    def collect(self):
+        for family in self.registry.collect():
+            labelled = Metric(family.name, family.documentation, family.type)
+            for sample in family.samples:
+                labelled.add_sample(
+                    sample.name,
+                    {**sample.labels, "task": self.task},
+                    sample.value,
+                    sample.timestamp,
+                )
+            yield labelled
+
+
+def export_metrics(job: str, textfile_dir: Optional[str] = None) -> Optional[Path]:
+    """
+    Write all metrics to a Prometheus textfile.
+
+    Each job (pipeline stage or run mode) writes its own
+    ``weather_pipeline_<job>.prom`` file with a ``task="<job>"`` label on
+    every sample, so separate Airflow task processes neither overwrite
+    each other nor export duplicate series. The directory is meant for the
+    node exporter textfile collector.
+
+    Args:
+        job: Name of the process writing the metrics (e.g. "extract")
+        textfile_dir: Output directory. If None, uses ``metrics.textfile_dir``
+
+    Returns:
+        Path of the written file, or None if metrics are disabled
+    """
+    config = load_config().get("metrics", {})
+    if not config.get("enabled", False):
+        return None
+    if textfile_dir is None:
+        textfile_dir = config.get("textfile_dir")
+    if not textfile_dir:
+        return None
+
+    Path(textfile_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(textfile_dir) / f"weather_pipeline_{job}.prom"
+    registry = CollectorRegistry(auto_describe=False)
+    registry.register(_TaskLabelCollector(REGISTRY, job))
+    try:
+        write_to_textfile(str(path), registry)
+    except OSError as e:
+        logger.error("Failed to write metrics to %s: %s", path, e)
+        return None
+    return path
+
+
+def start_metrics_server() -> bool:
+    """
+    Serve metrics over HTTP if ``metrics.port`` is configured.
+
+    Intended for long-running processes such as streaming runs.
+
+    Returns:
+        True if the server was started
+    """
+    config = load_config().get("metrics", {})
+    port = config.get("port")
+    if not config.get("enabled", False) or not port:
+        return False
+    start_http_server(
+        int(port), addr=config.get("host", "127.0.0.1"), registry=REGISTRY
+    )
+    logger.info("Serving metrics on port %s", port)
+    return True
@@ -0,0 +1,350 @@
+import time
+import logging
+import threading
+from typing import Optional
+import numpy as np
+from .config import load_config
+from .db import get_connection
+from .load.quarantine import save_to_quarantine
+from .transform.records import Records, WeatherBatch, WeatherRecord, as_batch
+from .utils.metrics import VALIDATION_REJECTS, VALIDATION_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RANGES = {
+    "temperature_celsius": (-90.0, 57.0),
+    "humidity": (0.0, 100.0),
+    "pressure": (870.0, 1085.0),
+    "wind_speed": (0.0, 115.0),
+}
+
+DEFAULT_MIN_SPREAD = {"temperature_celsius": 2.0, "pressure": 2.0}
+
+# Scales the median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+
+SEED_SQL = """
+SELECT city, temperature_celsius, measurement_time, humidity, pressure, wind_speed
+FROM (
+    SELECT city, temperature_celsius, measurement_time, humidity, pressure,
+        wind_speed,
+        row_number() OVER (
+            PARTITION BY city ORDER BY measurement_time DESC
+        ) AS position
+    FROM weather_measurements
+    WHERE measurement_time >= (
+        SELECT max(measurement_time) FROM weather_measurements
+    ) - %s * interval '1 second'
+) AS recent
+WHERE position <= %s
+ORDER BY city, measurement_time
+"""
+
+
+class Validator:
+    """
+    Batched data-quality checks for transformed measurements.
+
+    Every field is range checked over the whole batch at once. Fields listed
+    in ``min_spread`` are also tested against the recent history of their
+    city: a reading is an outlier when its robust z-score (distance from the
+    rolling median in units of the scaled median absolute deviation, but at
+    least ``min_spread``) exceeds ``threshold``. Only readings within
+    ``window_hours`` of the newest reading in the history are tested, so
+    backfills of older data are range checked only. Missing values pass.
+
+    Attributes:
+        ranges: Field -> (low, high) inclusive valid range
+        min_spread: Field -> smallest deviation scale for the outlier test
+        threshold: Robust z-score above which a reading is an outlier
+        history_size: Readings kept per city and field
+        min_history: Readings a city needs before it is outlier tested
+        window: Seconds behind the newest reading that are outlier tested
+        warm: Whether the history was seeded from the database
+    """
+
+    def __init__(
+        self,
+        ranges: Optional[dict] = None,
+        min_spread: Optional[dict] = None,
+        threshold: float = 6.0,
+        history_size: int = 48,
+        min_history: int = 12,
+        window_hours: float = 48,
+    ):
+        """
+        Initialize the validator with an empty history.
+
+        Args:
+            ranges: Field -> (low, high) valid range. If None, uses
+                ``DEFAULT_RANGES``
+            min_spread: Fields to outlier test -> smallest deviation scale.
+                If None, uses ``DEFAULT_MIN_SPREAD``
+            threshold: Robust z-score above which a reading is an outlier
+            history_size: Readings kept per city and field
+            min_history: Readings a city needs before it is outlier tested
+            window_hours: Hours behind the newest reading that are tested
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ranges = {
+            field: (float(low), float(high))
+            for field, (low, high) in (ranges or DEFAULT_RANGES).items()
+        }
+        self.min_spread = dict(DEFAULT_MIN_SPREAD if min_spread is None else min_spread)
+        self.threshold = threshold
+        self.history_size = history_size
+        self.min_history = min_history
+        self.window = int(window_hours * 3600)
+        self.warm = False
+        self._city_rows: dict[str, int] = {}
+        self._values = {field: np.empty((0, history_size)) for field in self.min_spread}
+        self._next = np.empty(0, dtype=np.int64)
+        self._newest = np.empty(0)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _city_codes(batch: WeatherBatch) -> tuple[list[str], np.ndarray]:
+        ids: dict[str, int] = {}
+        codes = np.fromiter(
+            (ids.setdefault(city, len(ids)) for city in batch.cities),
+            dtype=np.int64,
+            count=len(batch),
+        )
+        return list(ids), codes
+
+    @staticmethod
+    def _epochs(batch: WeatherBatch) -> np.ndarray:
+        times = np.array(batch.times, dtype="datetime64[s]").astype(np.int64)
+        return times[batch.time_index].astype(np.float64)
+
+    def _history_rows(self, names: list[str], create: bool = False) -> np.ndarray:
+        """History row of each city (-1 for unknown cities unless ``create``)."""
+        if create:
+            for city in names:
+                self._city_rows.setdefault(city, len(self._city_rows))
+            missing = len(self._city_rows) - len(self._next)
+            if missing > 0:
+                grow = max(missing, len(self._next))
+                for field, values in self._values.items():
+                    self._values[field] = np.vstack(
+                        [values, np.full((grow, self.history_size), np.nan)]
+                    )
+                self._next = np.concatenate([self._next, np.zeros(grow, np.int64)])
+                self._newest = np.concatenate([self._newest, np.full(grow, -np.inf)])
+        return np.array([self._city_rows.get(city, -1) for city in names], np.int64)
+
+    def _in_window(self, rows: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        """Records within the window behind their city's newest history reading."""
+        newest = np.full(len(rows), -np.inf)
+        known = rows >= 0
+        newest[known] = self._newest[rows[known]]
+        return ~(epochs < newest - self.window)
+
+    def _stats(self, rows: np.ndarray, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """Per-city rolling median and deviation scale (NaN if too little history)."""
+        median = np.full(len(rows), np.nan)
+        spread = np.full(len(rows), np.nan)
+        known = np.flatnonzero(rows >= 0)
+        values = self._values[field][rows[known]]
+        enough = np.count_nonzero(~np.isnan(values), axis=1) >= max(1, self.min_history)
+        if enough.any():
+            values = values[enough]
+            center = np.nanmedian(values, axis=1)
+            mad = np.nanmedian(np.abs(values - center[:, None]), axis=1)
+            median[known[enough]] = center
+            spread[known[enough]] = np.maximum(MAD_SCALE * mad, self.min_spread[field])
+        return median, spread
+
+    def check(self, batch: WeatherBatch) -> tuple[np.ndarray, dict[int, list[str]]]:
+        """
+        Run all checks over a batch.
+
+        Args:
+            batch: Transformed measurements
+
+        Returns:
+            Tuple of (boolean mask of valid rows, row index -> reasons for
+            every rejected row)
+        """
+        failures = []
+        for field, (low, high) in self.ranges.items():
+            values = getattr(batch, field)
+            failed = (values < low) | (values > high)
+            if failed.any():
+                failures.append(
+                    (field, failed, f"{field} out of range [{low}, {high}]")
+                )
+
+        if self.min_spread and len(batch):
+            names, codes = self._city_codes(batch)
+            with self._lock:
+                rows = self._history_rows(names)
+                tested = self._in_window(rows[codes], self._epochs(batch))
+                stats = {field: self._stats(rows, field) for field in self.min_spread}
+            for field, (median, spread) in stats.items():
+                values = getattr(batch, field)
+                score = np.abs(values - median[codes]) / spread[codes]
+                failed = tested & (score > self.threshold)
+                if failed.any():
+                    failures.append((field, failed, score))
+
+        valid = np.ones(len(batch), dtype=bool)
+        reasons: dict[int, list[str]] = {}
+        for field, failed, detail in failures:
+            valid &= ~failed
+            check = "range" if isinstance(detail, str) else "outlier"
+            VALIDATION_REJECTS.labels(field, check).inc(int(failed.sum()))
+            for index in np.flatnonzero(failed).tolist():
+                reason = (
+                    detail
+                    if check == "range"
+                    else f"{field} outlier (z={detail[index]:.1f})"
+                )
+                reasons.setdefault(index, []).append(reason)
+        return valid, reasons
+
+    def update(self, batch: WeatherBatch) -> None:
+        """
+        Add accepted readings to the history.
+
+        Each city keeps its last ``history_size`` readings in a ring. Readings
+        older than the window behind a city's newest reading are ignored, so
+        backfills do not displace recent history.
+
+        Args:
+            batch: Accepted measurements
+        """
+        if not self.min_spread or not len(batch):
+            return
+        names, codes = self._city_codes(batch)
+        epochs = self._epochs(batch)
+        size = self.history_size
+        with self._lock:
+            rows = self._history_rows(names, create=True)[codes]
+            keep = np.flatnonzero(self._in_window(rows, epochs))
+            if not len(keep):
+                return
+            order = keep[np.lexsort((epochs[keep], rows[keep]))]
+            rows = rows[order]
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            counts = np.diff(np.r_[starts, len(rows)])
+            rank = np.arange(len(rows)) - np.repeat(starts, counts)
+            skipped = np.repeat(np.maximum(counts - size, 0), counts)
+            last = rank >= skipped
+            slots = (self._next[rows] + rank - skipped) % size
+
+            for field, values in self._values.items():
+                column = getattr(batch, field)[order]
+                values[rows[last], slots[last]] = column[last]
+            cities = rows[starts]
+            self._next[cities] = (self._next[cities] + np.minimum(counts, size)) % size
+            np.maximum.at(self._newest, rows, epochs[order])
+
+    def seed(self, cursor) -> int:
+        """
+        Fill the history from ``weather_measurements`` on cold start.
+
+        Args:
+            cursor: Database cursor
+
+        Returns:
+            Number of readings loaded
+        """
+        cursor.execute(SEED_SQL, (self.window, self.history_size))
+        rows = cursor.fetchall()
+        self.update(WeatherBatch.from_records(WeatherRecord(*row) for row in rows))
+        self.warm = True
+        self.logger.info("Seeded validation history with %d readings", len(rows))
+        return len(rows)
+
+
+_validator: Optional[Validator] = None
+_validator_lock = threading.Lock()
+_seed_lock = threading.Lock()
+
+
+def get_validator() -> Optional[Validator]:
+    """
+    Get the process-wide validator, creating it on first use.
+
+    Settings are read from ``validation`` in config.yaml.
+
+    Returns:
+        Shared Validator, or None if validation is disabled
+    """
+    global _validator
+    config = load_config().get("validation", {})
+    if not config.get("enabled", False):
+        return None
+    with _validator_lock:
+        if _validator is None:
+            outliers = config.get("outliers", {})
+            _validator = Validator(
+                ranges=config.get("ranges"),
+                min_spread=(
+                    outliers.get("min_spread") if outliers.get("enabled", True) else {}
+                ),
+                threshold=outliers.get("threshold", 6.0),
+                history_size=outliers.get("history_size", 48),
+                min_history=outliers.get("min_history", 12),
+                window_hours=outliers.get("window_hours", 48),
+            )
+        return _validator
+
+
+def validate_data(data: Records) -> WeatherBatch:
+    """
+    Validate: screen transformed records before they are loaded.
+
+    Rejected rows are written to ``weather_quarantine`` with their reasons
+    and left out of the returned batch. The outlier history is seeded from
+    the database on first use; accepted rows join it only once they are
+    loaded (see ``update_history``).
+
+    Args:
+        data: WeatherBatch or list of transformed weather records
+
+    Returns:
+        WeatherBatch of the accepted rows (all rows if validation is disabled)
+    """
+    batch = as_batch(data)
+    validator = get_validator()
+    if validator is None or not len(batch):
+        return batch
+
+    started = time.perf_counter()
+    if validator.min_spread and not validator.warm:
+        with _seed_lock, get_connection() as dbconnect:
+            if not validator.warm:
+                with dbconnect.cursor() as cursor:
+                    validator.seed(cursor)
+            dbconnect.rollback()
+
+    valid, reasons = validator.check(batch)
+    accepted = batch if not reasons else batch.take(valid)
+    if reasons:
+        rejected = np.flatnonzero(~valid)
+        save_to_quarantine(
+            batch.take(rejected), [reasons[i] for i in rejected.tolist()]
+        )
+        logger.warning(
+            "Quarantined %d of %d records failing validation", len(rejected), len(batch)
+        )
+    VALIDATION_SECONDS.observe(time.perf_counter() - started)
+    return accepted
+
+
+def update_history(rows: list[tuple]) -> None:
+    """
+    Add rows committed to ``weather_measurements`` to the outlier history.
+
+    Called by the loader with the rows actually inserted, so rows that
+    failed to load or were duplicates never shape later outlier checks.
+
+    Args:
+        rows: Inserted rows in ``WeatherRecord`` field order
+    """
+    validator = get_validator()
+    if validator is None or not validator.warm or not rows:
+        return
+    validator.update(WeatherBatch.from_records(WeatherRecord(*row) for row in rows))
@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+from src.transform.records import WeatherRecord
+
+
+def weather_record(
+    city,
+    hour=12,
+    day=25,
+    temperature=0.0,
+    humidity=85,
+    pressure=1013,
+    wind_speed=5.5,
+):
+    """Transformed record measured ``hour`` hours after 2026-01-``day`` 00:00."""
+    return WeatherRecord(
+        city,
+        temperature,
+        datetime(2026, 1, day) + timedelta(hours=hour),
+        humidity,
+        pressure,
+        wind_speed,
+    )
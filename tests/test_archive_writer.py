@@ -0,0 +1,89 @@
+from datetime import date, datetime
+from src.load.archive_writer import compact_archive, read_archive, save_to_archive
+from tests.factories import weather_record
+
+
+def test_save_to_archive_partitions_by_date_and_city(tmp_path):
+    """Records land in date and city partitions; None records are skipped."""
+    records = [
+        weather_record("Warsaw", 12),
+        weather_record("New York", 12, day=26),
+        None,
+    ]
+
+    archived = save_to_archive(records, str(tmp_path), partition_by_city=True)
+
+    assert archived == 2
+    files = sorted(
+        p.relative_to(tmp_path).parts[:2] for p in tmp_path.rglob("*.parquet")
+    )
+    assert files == [
+        ("date=2026-01-25", "city=Warsaw"),
+        ("date=2026-01-26", "city=New%20York"),
+    ]
+
+
+def test_read_archive_filters_dates_cities_and_columns(tmp_path):
+    """Reader prunes by date range and city and returns only requested columns."""
+    save_to_archive(
+        [
+            weather_record("Warsaw", 12, day=24),
+            weather_record("Warsaw", 12),
+            weather_record("Gdansk", 12),
+        ],
+        str(tmp_path),
+        partition_by_city=True,
+    )
+
+    table = read_archive(
+        date(2026, 1, 25),
+        date(2026, 1, 31),
+        columns=["city", "temperature_celsius"],
+        cities=["Warsaw"],
+        archive_dir=str(tmp_path),
+    )
+
+    assert table.column_names == ["city", "temperature_celsius"]
+    assert table.to_pylist() == [{"city": "Warsaw", "temperature_celsius": 0.0}]
+
+
+def test_read_archive_roundtrip_without_city_partitions(tmp_path):
+    """Records read back with their original types."""
+    record = weather_record("Warsaw", 12)
+    save_to_archive([record], str(tmp_path), partition_by_city=False)
+
+    table = read_archive(
+        date(2026, 1, 25), date(2026, 1, 25), archive_dir=str(tmp_path)
+    )
+
+    assert table.to_pylist() == [record._asdict()]
+
+
+def test_read_archive_missing_directory_is_empty(tmp_path):
+    """A missing archive reads as an empty table."""
+    table = read_archive(
+        date(2026, 1, 1), date(2026, 1, 31), archive_dir=str(tmp_path / "missing")
+    )
+
+    assert table.num_rows == 0
+
+
+def test_compact_archive_merges_closed_partitions(tmp_path):
+    """Past partitions are merged into one file with duplicates removed."""
+    for hour in (10, 11, 11):
+        save_to_archive([weather_record("Warsaw", hour)], str(tmp_path))
+    save_to_archive([weather_record("Warsaw", 10, day=26)], str(tmp_path))
+    save_to_archive([weather_record("Warsaw", 11, day=26)], str(tmp_path))
+
+    compacted = compact_archive(str(tmp_path), min_files=2, today=date(2026, 1, 26))
+
+    assert compacted == 1
+    assert len(list((tmp_path / "date=2026-01-25").glob("*.parquet"))) == 1
+    assert len(list((tmp_path / "date=2026-01-26").glob("*.parquet"))) == 2
+    table = read_archive(
+        date(2026, 1, 25), date(2026, 1, 25), archive_dir=str(tmp_path)
+    )
+    assert table.column("measurement_time").to_pylist() == [
+        datetime(2026, 1, 25, 10),
+        datetime(2026, 1, 25, 11),
+    ]
@@ -0,0 +1,118 @@
+import json
+import pytest
+from datetime import date, datetime, timezone
+from unittest.mock import patch, MagicMock
+from src import backfill
+
+
+@pytest.fixture(autouse=True)
+def no_validation():
+    with patch("src.validation.get_validator", return_value=None):
+        yield
+
+
+def _history(city, start, end):
+    return [
+        {
+            "name": city,
+            "main": {"temp": 273.15, "humidity": 85, "pressure": 1013},
+            "wind": {"speed": 5.5},
+            "dt": dt,
+        }
+        for dt in range(start, end, 86400)
+    ]
+
+
+@pytest.fixture
+def pipeline_mocks():
+    api = MagicMock()
+    api.fetch_history.side_effect = _history
+    with patch.object(backfill, "setup_logging"), patch.object(
+        backfill, "export_metrics"
+    ), patch.object(backfill, "ensure_backfill_partitions"), patch.object(
+        backfill, "WeatherAPI", return_value=api
+    ), patch.object(
+        backfill,
+        "save_to_database",
+        side_effect=lambda records, bulk: (len(records), 0),
+    ) as mock_save:
+        yield api, mock_save
+
+
+def test_plan_chunks_covers_range_per_city():
+    """Chunks tile the range for every city; the last chunk is truncated."""
+    chunks = backfill.plan_chunks(
+        ["Warsaw", "Gdansk"], date(2026, 1, 1), date(2026, 1, 10), 7
+    )
+
+    assert len(chunks) == 4
+    assert chunks[0] == (
+        "Warsaw",
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        datetime(2026, 1, 8, tzinfo=timezone.utc),
+    )
+    assert chunks[-1][2] == datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+
+def test_run_backfill_loads_and_checkpoints(tmp_path, pipeline_mocks):
+    """All chunks are fetched, bulk loaded and recorded in the checkpoint."""
+    api, mock_save = pipeline_mocks
+    checkpoint = tmp_path / "checkpoint.json"
+
+    stats = backfill.run_backfill(
+        date(2026, 1, 1),
+        date(2026, 1, 15),
+        cities=["Warsaw", "Gdansk"],
+        chunk_days=7,
+        max_workers=2,
+        checkpoint=str(checkpoint),
+    )
+
+    assert stats["completed"] == 4
+    assert stats["inserted"] == 28
+    assert api.fetch_history.call_count == 4
+    assert all(call.kwargs["bulk"] for call in mock_save.call_args_list)
+    assert len(json.loads(checkpoint.read_text())["completed"]) == 4
+
+
+def test_run_backfill_resumes_after_budget_is_exhausted(tmp_path, pipeline_mocks):
+    """A capped run leaves the rest for a rerun, which skips completed chunks."""
+    api, _ = pipeline_mocks
+    kwargs = {
+        "cities": ["Warsaw", "Gdansk"],
+        "chunk_days": 7,
+        "max_workers": 1,
+        "checkpoint": str(tmp_path / "checkpoint.json"),
+    }
+
+    first = backfill.run_backfill(
+        date(2026, 1, 1), date(2026, 1, 15), max_requests=3, **kwargs
+    )
+    second = backfill.run_backfill(date(2026, 1, 1), date(2026, 1, 15), **kwargs)
+
+    assert (first["completed"], first["remaining"]) == (3, 1)
+    assert (second["skipped"], second["completed"]) == (3, 1)
+    assert api.fetch_history.call_count == 4
+
+
+def test_run_backfill_leaves_failed_chunks_for_next_run(tmp_path, pipeline_mocks):
+    """Chunks whose request failed are not checkpointed."""
+    api, _ = pipeline_mocks
+    api.fetch_history.side_effect = lambda city, start, end: (
+        None if city == "Gdansk" else _history(city, start, end)
+    )
+
+    stats = backfill.run_backfill(
+        date(2026, 1, 1),
+        date(2026, 1, 8),
+        cities=["Warsaw", "Gdansk"],
+        checkpoint=str(tmp_path / "checkpoint.json"),
+    )
+
+    assert (stats["completed"], stats["failed"], stats["remaining"]) == (1, 1, 1)
+
+
+def test_run_backfill_rejects_empty_range():
+    """An end date before the start date is an error."""
+    with pytest.raises(ValueError):
+        backfill.run_backfill(date(2026, 1, 2), date(2026, 1, 1))
@@ -0,0 +1,45 @@
+import os
+import pytest
+from src.config import load_config
+
+CONFIG = """
+api:
+  base_url: "http://example.invalid"
+  timeout: 10
+log:
+  logs_dir: "logs/"
+  logs_filename: "logs.log"
+cities:
+  - Warsaw
+"""
+
+
+def test_load_config_is_memoized(tmp_path):
+    """Repeated loads of an unchanged file return the cached object."""
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG)
+
+    assert load_config(path) is load_config(path)
+
+
+def test_load_config_reloads_on_mtime_change(tmp_path):
+    """A modified file is parsed again."""
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG)
+    first = load_config(path)
+
+    path.write_text(CONFIG.replace("Warsaw", "Gdansk"))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_config(path)["cities"] == ["Gdansk"]
+    assert first["cities"] == ["Warsaw"]
+
+
+def test_load_config_validates_required_keys(tmp_path):
+    """Missing required keys raise ValueError."""
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG.replace("  timeout: 10\n", ""))
+
+    with pytest.raises(ValueError, match="api.timeout"):
+        load_config(path)
@@ -0,0 +1,55 @@
+import sys
+import json
+import importlib
+import subprocess
+from pathlib import Path
+import pytest
+
+pytest.importorskip("airflow")
+
+MAX_DAG_IMPORT_SECONDS = 2.0
+
+IMPORT_PROBE = """
+import sys, time, json, importlib
+start = time.perf_counter()
+module = importlib.import_module("dags.weather_dag")
+print(json.dumps({
+    "dag_id": module.dag.dag_id,
+    "elapsed": time.perf_counter() - start,
+    "pipeline_imported": "src.pipeline" in sys.modules,
+}))
+"""
+
+
+def test_dag_import_is_fast_and_lazy():
+    """Parsing the DAG file does not import the pipeline and stays fast."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert probe["dag_id"] == "weather_etl_pipeline"
+    assert not probe["pipeline_imported"]
+    assert probe["elapsed"] < MAX_DAG_IMPORT_SECONDS
+
+
+def test_dag_maps_etl_over_city_shards():
+    """Extract, transform and load are mapped per shard and merged at the end."""
+    from airflow.models.mappedoperator import MappedOperator
+
+    module = importlib.import_module("dags.weather_dag")
+    tasks = module.dag.task_dict
+
+    for task_id in (
+        "extract_weather_data",
+        "transform_weather_data",
+        "load_weather_data",
+    ):
+        assert isinstance(tasks[task_id], MappedOperator)
+    assert tasks["extract_weather_data"].upstream_task_ids == {"plan_shards"}
+    assert tasks["merge_shard_stats"].upstream_task_ids == {"load_weather_data"}
+    assert "maintain_partitions" in tasks["load_weather_data"].upstream_task_ids
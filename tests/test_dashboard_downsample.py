@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from dashboard.downsample import downsample_series, lttb
+from dashboard.measurements import choose_bucket
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    """LTTB keeps first, last and extreme points within the threshold."""
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[500] = 100.0
+
+    indices = lttb(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0
+    assert indices[-1] == 999
+    assert 500 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_short_series_unchanged():
+    """Series shorter than the threshold are returned whole."""
+    assert lttb(np.arange(10), np.arange(10), 50).tolist() == list(range(10))
+
+
+def test_downsample_series_limits_points_per_city():
+    """Each city series is reduced to at most max_points rows."""
+    times = [datetime(2026, 1, 1) + timedelta(hours=i) for i in range(300)]
+    df = pd.DataFrame(
+        {
+            "city": ["Warsaw"] * 300 + ["Gdansk"] * 300,
+            "measurement_time": times * 2,
+            "temperature_celsius": np.sin(np.arange(600) / 10.0),
+        }
+    )
+
+    result = downsample_series(
+        df, x="measurement_time", y="temperature_celsius", by="city", max_points=40
+    )
+
+    assert result.groupby("city").size().to_dict() == {"Gdansk": 40, "Warsaw": 40}
+
+
+def test_choose_bucket_from_range():
+    """Bucket unit grows with the visible time range."""
+    start = datetime(2026, 1, 1)
+
+    assert choose_bucket(start, start + timedelta(days=7), 2000) == "hour"
+    assert choose_bucket(start, start + timedelta(days=365), 2000) == "day"
+    assert choose_bucket(start, start + timedelta(days=365 * 30), 2000) == "week"
@@ -0,0 +1,105 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+import pandas as pd
+import requests
+from dashboard.measurements import (
+    LatestStore,
+    get_latest_measurements,
+    get_temperature_trends,
+)
+
+
+def _reading(temp, stamp):
+    return {
+        "city": "Warsaw",
+        "temperature_celsius": temp,
+        "measurement_time": stamp,
+        "humidity": 85,
+        "pressure": 1013,
+        "wind_speed": 5.5,
+    }
+
+
+def _latest(*rows):
+    return pd.DataFrame(
+        [
+            {
+                **_reading(temp, datetime(2026, 1, 25, hour)),
+                "city": city,
+                "updated_at": datetime(2026, 1, 25, updated_hour),
+            }
+            for city, temp, hour, updated_hour in rows
+        ]
+    )
+
+
+def test_latest_store_fetches_only_changed_cities():
+    """Later refreshes query by watermark and merge into the cached frame."""
+    calls = []
+    responses = [
+        _latest(("Warsaw", 1.0, 10, 10), ("Gdansk", 2.0, 10, 10)),
+        _latest(("Warsaw", 3.0, 11, 11)),
+    ]
+
+    def fetch(query, params=None):
+        calls.append(params)
+        return responses[len(calls) - 1]
+
+    store = LatestStore(ttl=0, overlap=0, fetch=fetch)
+    store.latest()
+    latest = store.latest()
+
+    assert calls == [{"since": None}, {"since": datetime(2026, 1, 25, 10)}]
+    assert "updated_at" not in latest.columns
+    assert latest.set_index("city")["temperature_celsius"].to_dict() == {
+        "Gdansk": 2.0,
+        "Warsaw": 3.0,
+    }
+
+
+def test_latest_store_serves_from_memory_within_ttl():
+    """Within the TTL the database is not queried again."""
+    fetch = MagicMock(return_value=_latest(("Warsaw", 1.0, 10, 10)))
+    store = LatestStore(ttl=3600, fetch=fetch)
+
+    store.latest()
+    get_latest_measurements(store=store)
+
+    fetch.assert_called_once()
+
+
+def test_dashboard_reads_latest_from_service():
+    """The dashboard uses the service and falls back to SQL when it is down."""
+    client = MagicMock()
+    client.latest.return_value = [_reading(1.0, "2026-01-25T10:00")]
+    fetch = MagicMock(return_value=pd.DataFrame())
+
+    latest = get_latest_measurements(fetch=fetch, client=client)
+    assert latest.loc[0, "measurement_time"] == pd.Timestamp(2026, 1, 25, 10)
+    fetch.assert_not_called()
+
+    client.latest.side_effect = requests.ConnectionError("refused")
+    get_latest_measurements(fetch=fetch, client=client)
+    fetch.assert_called_once()
+
+
+def test_dashboard_trends_from_complete_window():
+    """Hourly trends come from memory only when the window is complete."""
+    client = MagicMock()
+    client.recent.return_value = (
+        [
+            _reading(t, stamp)
+            for t, stamp in [(1.0, "2026-01-25T10:00"), (3.0, "2026-01-25T10:30")]
+        ],
+        True,
+    )
+    fetch = MagicMock(return_value=pd.DataFrame())
+    start, end = datetime(2026, 1, 25), datetime(2026, 1, 26)
+
+    trend = get_temperature_trends(start, end, ["Warsaw"], fetch=fetch, client=client)
+    assert trend["temperature_celsius"].tolist() == [2.0]
+    fetch.assert_not_called()
+
+    client.recent.return_value = ([], False)
+    get_temperature_trends(start, end, ["Warsaw"], fetch=fetch, client=client)
+    fetch.assert_called_once()
@@ -1,7 +1,11 @@
+import json
 import pytest
+from src.extract.decoder import decode_weather
 from src.transform.data_processor import (
     kelvin_to_celsius,
     safe_get,
+    transform_to_batch,
+    transform_weather_batch,
     transform_weather_data,
 )
 from datetime import datetime
@@ -136,3 +140,82 @@ def test_transform_weather_data_partial_data():
     assert result["humidity"] is None
     assert result["pressure"] is None
     assert result["wind_speed"] is None
+
+
+def test_transform_weather_batch_matches_scalar():
+    """Batch transform returns the same results as the scalar function."""
+    raw_data = [
+        {
+            "name": "Warsaw",
+            "main": {"temp": 273.15, "humidity": 85, "pressure": 1013},
+            "dt": 1706216400,
+            "wind": {"speed": 5.5},
+        },
+        {"main": {"temp": 273.15}, "dt": 1706216400},
+        {"name": "Gdansk"},
+        {"name": "Krakow", "main": {"temp": 280}, "dt": 1706220000},
+        {"name": "Katowice", "main": "not_a_dict", "dt": 1706216400},
+        {"name": "Szczecin", "main": {"temp": 290.5, "humidity": 40}, "dt": 1.5e9},
+    ]
+
+    expected = [transform_weather_data(raw) for raw in raw_data]
+
+    assert transform_weather_batch(raw_data) == expected
+
+
+def test_transform_to_batch_keeps_fractional_integer_fields():
+    """Batch records equal scalar results for non-integer humidity and pressure."""
+    raw_data = [
+        {
+            "name": "Warsaw",
+            "main": {"temp": 273.15, "humidity": 85.5, "pressure": 1013.7},
+            "dt": 1706216400,
+            "wind": {"speed": 5.5},
+        },
+        {
+            "name": "Gdansk",
+            "main": {"temp": 275.15, "humidity": 70, "pressure": 1009},
+            "dt": 1706216400,
+            "wind": {"speed": 3.0},
+        },
+    ]
+
+    records = list(transform_to_batch(raw_data))
+
+    assert [r._asdict() for r in records] == [
+        transform_weather_data(raw) for raw in raw_data
+    ]
+    assert type(records[1].humidity) is int
+    table = transform_to_batch(raw_data).to_arrow()
+    assert table.column("humidity").to_pylist() == [86, 70]
+    assert table.column("pressure").to_pylist() == [1014, 1009]
+
+
+def test_transform_weather_batch_empty():
+    """Empty input gives empty output."""
+    assert transform_weather_batch([]) == []
+
+
+def test_transform_weather_batch_negative_kelvin():
+    """Negative Kelvin should raise ValueError like the scalar function."""
+    raw_data = [{"name": "Warsaw", "main": {"temp": -1}, "dt": 1706216400}]
+
+    with pytest.raises(ValueError, match="cannot be negative"):
+        transform_weather_batch(raw_data)
+
+
+def test_transform_weather_batch_accepts_typed_payloads():
+    """Typed payloads transform exactly like the equivalent dicts."""
+    raw = {
+        "name": "Warsaw",
+        "dt": 1706216400,
+        "main": {"temp": 273.15, "humidity": 85},
+        "wind": {"speed": 5.5},
+    }
+    typed = decode_weather(json.dumps(raw))
+
+    assert transform_weather_batch([typed, decode_weather(b"{}")]) == [
+        transform_weather_data(raw),
+        None,
+    ]
+    assert transform_weather_data(typed) == transform_weather_data(raw)
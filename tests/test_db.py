@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import MagicMock
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from src.db import ConnectionPool
+
+
+def _fake_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.autocommit = False
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+def test_pool_reuses_connections():
+    """A returned connection is handed out again instead of reconnecting."""
+    connect = MagicMock(side_effect=_fake_connection)
+    pool = ConnectionPool(min_size=1, max_size=2, connect=connect)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert connect.call_count == 1
+
+
+def test_pool_is_bounded():
+    """Checking out more than max_size connections times out."""
+    pool = ConnectionPool(
+        min_size=0, max_size=1, timeout=0.01, connect=_fake_connection
+    )
+    pool.getconn()
+
+    with pytest.raises(PoolError):
+        pool.getconn()
+
+
+def test_pool_recycles_expired_connections():
+    """Connections older than max_lifetime are closed on return."""
+    connect = MagicMock(side_effect=_fake_connection)
+    pool = ConnectionPool(min_size=0, max_size=1, max_lifetime=0, connect=connect)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    conn.close.assert_called_once()
+    assert pool.getconn() is not conn
+
+
+def test_pool_discards_unhealthy_connections():
+    """An idle connection that fails the health check is replaced."""
+    connect = MagicMock(side_effect=_fake_connection)
+    pool = ConnectionPool(
+        min_size=1, max_size=1, health_check_interval=0, connect=connect
+    )
+    broken = pool.getconn()
+    pool.putconn(broken)
+    broken.closed = 1
+
+    assert pool.getconn() is not broken
+    assert connect.call_count == 2
+
+
+def test_pool_rolls_back_open_transaction():
+    """A connection returned mid-transaction is rolled back."""
+    pool = ConnectionPool(min_size=0, max_size=1, connect=_fake_connection)
+    conn = pool.getconn()
+    conn.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_INTRANS
+
+    pool.putconn(conn)
+
+    conn.rollback.assert_called_once()
@@ -0,0 +1,166 @@
+import pytest
+from datetime import datetime
+from contextlib import contextmanager
+from unittest.mock import call, patch, MagicMock, PropertyMock
+import psycopg2
+from src.load.db_loader import save_to_database
+from src.load.recent_keys import RecentKeys
+from tests.factories import weather_record
+
+
+@pytest.fixture(autouse=True)
+def no_recent_keys():
+    with patch("src.load.db_loader.get_recent_keys", return_value=None):
+        yield
+
+
+def _pooled(connection):
+    @contextmanager
+    def get_connection():
+        yield connection
+
+    return get_connection
+
+
+def _record(city, hour=12):
+    """Record as a dict, the loader's legacy input format."""
+    return weather_record(city, hour)._asdict()
+
+
+def test_save_to_database_bulk_counts_duplicates():
+    """Bulk path counts rows not returned by ON CONFLICT DO NOTHING as duplicates."""
+    connection = MagicMock()
+    data = [_record("Warsaw"), _record("Gdansk"), None, _record("Krakow")]
+
+    inserted = [weather_record("Warsaw"), weather_record("Gdansk")]
+
+    with patch("src.load.db_loader.get_connection", _pooled(connection)), patch(
+        "src.load.db_loader.execute_values", return_value=inserted
+    ) as mock_execute_values, patch(
+        "src.load.db_loader.update_rollups"
+    ) as mock_rollups, patch(
+        "src.load.db_loader.update_history"
+    ) as mock_history:
+        result = save_to_database(data, bulk=True)
+
+    assert result == (2, 1)
+    assert mock_rollups.call_args.args[1] == inserted
+    mock_history.assert_called_once_with(inserted)
+    rows = mock_execute_values.call_args.args[2]
+    assert rows[0] == weather_record("Warsaw")
+    assert len(rows) == 3
+    connection.commit.assert_called_once()
+
+
+def test_save_to_database_row_by_row_counts_integrity_errors():
+    """Row-by-row path counts IntegrityError as a duplicate."""
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.execute.side_effect = [None, psycopg2.IntegrityError(), None]
+
+    with patch("src.load.db_loader.get_connection", _pooled(connection)), patch(
+        "src.load.db_loader.update_rollups"
+    ) as mock_rollups:
+        result = save_to_database(
+            [_record("Warsaw"), _record("Warsaw"), _record("Gdansk")], bulk=False
+        )
+
+    assert result == (2, 1)
+    assert mock_rollups.call_args.args[1] == [
+        weather_record("Warsaw"),
+        weather_record("Gdansk"),
+    ]
+    assert cursor.execute.call_count == 3
+
+
+def test_save_to_database_can_skip_recent_keys_and_publishing():
+    """Benchmarks load without touching the key index or the readings service."""
+    connection = MagicMock()
+
+    with patch("src.load.db_loader.get_connection", _pooled(connection)), patch(
+        "src.load.db_loader.execute_values", return_value=[weather_record("Warsaw")]
+    ), patch("src.load.db_loader.update_rollups"), patch(
+        "src.load.db_loader.get_recent_keys"
+    ) as mock_keys, patch(
+        "src.load.db_loader.publish_readings"
+    ) as mock_publish:
+        result = save_to_database(
+            [weather_record("Warsaw")], bulk=True, use_recent_keys=False, publish=False
+        )
+
+    assert result == (1, 0)
+    mock_keys.assert_not_called()
+    mock_publish.assert_not_called()
+
+
+def test_save_to_database_rolls_back_on_error():
+    """A failing bulk insert rolls back and leaves the validation history alone."""
+    connection = MagicMock()
+
+    with patch("src.load.db_loader.get_connection", _pooled(connection)), patch(
+        "src.load.db_loader.execute_values", side_effect=psycopg2.OperationalError()
+    ), patch("src.load.db_loader.update_history") as mock_history:
+        with pytest.raises(psycopg2.OperationalError):
+            save_to_database([_record("Warsaw")], bulk=True)
+
+    connection.rollback.assert_called_once()
+    mock_history.assert_not_called()
+
+
+def test_save_to_database_skips_recently_loaded_keys(tmp_path):
+    """Known keys are dropped before the insert and counted as duplicates."""
+    connection = MagicMock()
+    recent_keys = RecentKeys(str(tmp_path / "keys.json"))
+    recent_keys.update([weather_record("Warsaw")])
+    recent_keys.warm = True
+    inserted = [weather_record("Gdansk")]
+
+    with patch("src.load.db_loader.get_connection", _pooled(connection)), patch(
+        "src.load.db_loader.get_recent_keys", return_value=recent_keys
+    ), patch(
+        "src.load.db_loader.execute_values", return_value=inserted
+    ) as mock_execute_values, patch(
+        "src.load.db_loader.update_rollups"
+    ):
+        result = save_to_database([_record("Warsaw"), _record("Gdansk")], bulk=True)
+
+    assert result == (1, 1)
+    assert mock_execute_values.call_args.args[2] == [weather_record("Gdansk")]
+    assert ("Gdansk", datetime(2026, 1, 25, 12)) in recent_keys
+
+
+def test_save_to_database_all_known_skips_database(tmp_path):
+    """A batch of known keys never opens a connection."""
+    recent_keys = RecentKeys(str(tmp_path / "keys.json"))
+    recent_keys.update([weather_record("Warsaw")])
+    recent_keys.warm = True
+
+    with patch("src.load.db_loader.get_connection") as mock_connection, patch(
+        "src.load.db_loader.get_recent_keys", return_value=recent_keys
+    ):
+        result = save_to_database([_record("Warsaw")], bulk=True)
+
+    assert result == (0, 1)
+    mock_connection.assert_not_called()
+
+
+def test_save_to_database_row_by_row_seeds_cold_index_first(tmp_path):
+    """Seeding a cold index is committed before autocommit is switched on."""
+    connection = MagicMock()
+    autocommit = PropertyMock()
+    type(connection).autocommit = autocommit
+    calls = MagicMock()
+    calls.attach_mock(connection.commit, "commit")
+    calls.attach_mock(autocommit, "autocommit")
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("Warsaw", datetime(2026, 1, 25, 12))]
+    recent_keys = RecentKeys(str(tmp_path / "keys.json"))
+
+    with patch("src.load.db_loader.get_connection", _pooled(connection)), patch(
+        "src.load.db_loader.get_recent_keys", return_value=recent_keys
+    ), patch("src.load.db_loader.update_rollups"):
+        result = save_to_database([_record("Warsaw"), _record("Gdansk")], bulk=False)
+
+    assert result == (1, 1)
+    assert calls.mock_calls[:2] == [call.commit(), call.autocommit(True)]
+    assert recent_keys.warm
@@ -0,0 +1,15 @@
+import json
+import pytest
+from src.utils.files import write_json_atomic
+
+
+def test_write_json_atomic_replaces_file_and_cleans_up(tmp_path):
+    """A failed write keeps the old file and leaves no temporary file behind."""
+    path = tmp_path / "state" / "index.json"
+
+    write_json_atomic(path, {"Warsaw": 1}, indent=2)
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"Warsaw": object()})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"Warsaw": 1}
+    assert [p.name for p in path.parent.iterdir()] == ["index.json"]
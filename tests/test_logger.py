@@ -0,0 +1,33 @@
+import logging
+from unittest.mock import patch
+from src.utils import logger as logger_module
+
+
+def test_setup_logging_writes_through_queue_listener(tmp_path):
+    """Records are written to the log file by the background listener."""
+    config = {
+        "log": {
+            "logs_dir": str(tmp_path),
+            "logs_filename": "test.log",
+            "level": "INFO",
+            "queue": True,
+        }
+    }
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+
+    try:
+        with patch.object(logger_module, "load_config", return_value=config):
+            logger_module.setup_logging()
+            logger_module.setup_logging()
+
+        assert len(root.handlers) == 1
+        assert isinstance(root.handlers[0], logger_module.QueueHandler)
+        logging.getLogger("test.queue").info("hello %s", "queue")
+        logger_module._stop_listener()
+    finally:
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+
+    assert "test.queue - INFO - hello queue" in (tmp_path / "test.log").read_text()
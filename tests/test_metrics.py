@@ -0,0 +1,39 @@
+from unittest.mock import patch, MagicMock
+from src.extract.weather_api import WeatherAPI
+from src.utils.metrics import REGISTRY, export_metrics
+
+
+def test_weather_api_counts_responses_by_status():
+    """Each HTTP response is counted under its status code."""
+    response = MagicMock()
+    response.status_code = 404
+
+    before = REGISTRY.get_sample_value(
+        "weather_api_responses_total", {"target": "Atlantis", "status": "404"}
+    )
+    with patch("requests.Session.get", return_value=response):
+        WeatherAPI().get_weather_data(["Atlantis"])
+
+    after = REGISTRY.get_sample_value(
+        "weather_api_responses_total", {"target": "Atlantis", "status": "404"}
+    )
+    assert after == (before or 0) + 1
+
+
+def test_export_metrics_writes_labelled_textfile(tmp_path):
+    """Textfile export adds the task label to every sample."""
+    config = {"metrics": {"enabled": True}}
+
+    with patch("src.utils.metrics.load_config", return_value=config):
+        path = export_metrics("extract", textfile_dir=str(tmp_path))
+
+    text = path.read_text()
+    assert path.name == "weather_pipeline_extract.prom"
+    assert "# TYPE weather_api_request_seconds histogram" in text
+    assert 'task="extract"' in text
+
+
+def test_export_metrics_disabled(tmp_path):
+    """Nothing is written when metrics are disabled."""
+    with patch("src.utils.metrics.load_config", return_value={}):
+        assert export_metrics("extract", textfile_dir=str(tmp_path)) is None
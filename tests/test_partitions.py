@@ -0,0 +1,62 @@
+from datetime import date
+from unittest.mock import MagicMock
+import pytest
+from src.load.partitions import (
+    add_months,
+    apply_retention,
+    create_partition,
+    parse_partition_name,
+    partition_name,
+)
+
+
+def test_add_months_crosses_year():
+    """Month arithmetic wraps around the year boundary."""
+    assert add_months(date(2026, 11, 15), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_name_roundtrip():
+    """Partition names encode the month they cover."""
+    name = partition_name(date(2026, 3, 1))
+
+    assert name == "weather_measurements_p2026_03"
+    assert parse_partition_name(name) == date(2026, 3, 1)
+    assert parse_partition_name("weather_measurements_default") is None
+
+
+def test_apply_retention_detaches_expired_partitions():
+    """Only partitions entirely before the retention cutoff are detached."""
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [
+        ("weather_measurements_default",),
+        ("weather_measurements_p2025_12",),
+        ("weather_measurements_p2026_01",),
+        ("weather_measurements_p2026_02",),
+    ]
+
+    expired = apply_retention(cursor, retention_months=2, today=date(2026, 3, 10))
+
+    assert expired == ["weather_measurements_p2025_12"]
+    statements = [str(call.args[0]) for call in cursor.execute.call_args_list[1:]]
+    assert len(statements) == 1
+    assert "DETACH PARTITION" in statements[0]
+
+
+def test_apply_retention_rejects_unknown_action():
+    """Unknown retention actions raise ValueError."""
+    with pytest.raises(ValueError):
+        apply_retention(MagicMock(), retention_months=2, action="archive")
+
+
+def test_create_partition_reattaches_detached_table():
+    """A month detached by retention is attached again, not created."""
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [("weather_measurements_default",)]
+    cursor.fetchone.side_effect = [(True,), (False,)]
+
+    assert create_partition(cursor, date(2025, 1, 1))
+
+    statements = [str(call.args[0]) for call in cursor.execute.call_args_list]
+    assert not any("CREATE TABLE" in statement for statement in statements)
+    assert "ATTACH PARTITION" in statements[-1]
@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src import pipeline
+
+
+@pytest.fixture(autouse=True)
+def no_validation():
+    with patch("src.validation.get_validator", return_value=None):
+        yield
+
+
+def _payload(city):
+    return {
+        "name": city,
+        "main": {"temp": 273.15, "humidity": 85, "pressure": 1013},
+        "dt": 1706216400,
+        "wind": {"speed": 5.5},
+    }
+
+
+def test_run_streaming_flushes_micro_batches():
+    """Payloads are loaded in batches of batch_size plus a final partial batch."""
+    api = MagicMock()
+    api.iter_weather_data.return_value = iter(
+        [_payload("Warsaw"), None, _payload("Gdansk"), _payload("Krakow")]
+    )
+
+    with patch.object(pipeline, "setup_logging"), patch.object(
+        pipeline, "export_metrics"
+    ), patch.object(pipeline, "WeatherAPI", return_value=api), patch.object(
+        pipeline, "save_to_database", side_effect=[(2, 0), (0, 1)]
+    ) as mock_save:
+        result = pipeline.run_streaming(batch_size=2, flush_interval=3600)
+
+    assert result == (2, 1)
+    batches = [call.args[0] for call in mock_save.call_args_list]
+    assert [[r.city for r in batch] for batch in batches] == [
+        ["Warsaw", "Gdansk"],
+        ["Krakow"],
+    ]
+
+
+def test_run_streaming_closes_api_on_failure():
+    """The API client is closed even when a batch fails to load."""
+    api = MagicMock()
+    api.iter_weather_data.return_value = iter([_payload("Warsaw")])
+
+    with patch.object(pipeline, "setup_logging"), patch.object(
+        pipeline, "WeatherAPI", return_value=api
+    ), patch.object(
+        pipeline, "save_to_database", side_effect=RuntimeError("database down")
+    ):
+        with pytest.raises(RuntimeError):
+            pipeline.run_streaming(batch_size=1, flush_interval=3600)
+
+    api.close.assert_called_once()
+
+
+def test_extract_data_closes_api():
+    """The API session is closed after extraction, even when it fails."""
+    api = MagicMock()
+    api.get_weather_data.side_effect = RuntimeError("network down")
+
+    with patch.object(pipeline, "setup_logging"), patch.object(
+        pipeline, "WeatherAPI", return_value=api
+    ):
+        with pytest.raises(RuntimeError):
+            pipeline.extract_data(["Warsaw"])
+
+    api.close.assert_called_once()
+
+
+def test_plan_shards_splits_contiguously():
+    """Cities are split into balanced contiguous shards, capped by max_shards."""
+    cities = [f"City {i}" for i in range(7)]
+
+    assert pipeline.plan_shards(cities, shard_size=3, max_shards=16) == [
+        ["City 0", "City 1", "City 2"],
+        ["City 3", "City 4"],
+        ["City 5", "City 6"],
+    ]
+    assert len(pipeline.plan_shards(cities, shard_size=1, max_shards=2)) == 2
+    assert pipeline.plan_shards([], shard_size=3, max_shards=4) == [[]]
+
+
+def test_shard_tasks_stage_separately_and_merge_stats(tmp_path):
+    """Each shard stages its own files and load statistics are summed."""
+    context = {"run_id": "manual__2026-01-25"}
+    stats = []
+
+    with patch.object(pipeline, "setup_logging"), patch.object(
+        pipeline, "export_metrics"
+    ) as mock_export, patch.object(
+        pipeline,
+        "extract_data",
+        side_effect=lambda cities, shard: [_payload(city) for city in cities],
+    ), patch.object(
+        pipeline, "save_to_database", side_effect=[(2, 0), (0, 1)]
+    ) as mock_save, patch.object(
+        pipeline, "save_to_archive"
+    ), patch.object(
+        pipeline, "compact_archive"
+    ) as mock_compact, patch.object(
+        pipeline, "load_config", return_value={"api": {}, "archive": {"enabled": True}}
+    ), patch(
+        "src.staging._staging_config", return_value={"dir": str(tmp_path)}
+    ):
+        for shard, cities in enumerate([["Warsaw", "Gdansk"], ["Krakow"]]):
+            extracted = pipeline.extract_data_task(shard, cities, **context)
+            transformed = pipeline.transform_data(**extracted, **context)
+            stats.append(pipeline.load_data(**transformed, **context))
+        mock_compact.assert_not_called()
+        totals = pipeline.merge_shard_stats_task(stats)
+
+    assert extracted["staged"]["path"].endswith("raw-0001.parquet")
+    assert [call.args[0] for call in mock_export.call_args_list] == [
+        "transform-0000",
+        "load-0000",
+        "transform-0001",
+        "load-0001",
+    ]
+    mock_compact.assert_called_once_with()
+    assert [call.kwargs["shard"] for call in mock_save.call_args_list] == [0, 1]
+    assert totals == {
+        "shards": 2,
+        "records": 3,
+        "inserted": 2,
+        "duplicates": 1,
+    }
@@ -0,0 +1,117 @@
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+import requests
+from src.read_service import (
+    ReadingsBuffer,
+    ReadingsClient,
+    ReadingsServer,
+    get_readings_client,
+    publish_readings,
+)
+from tests.factories import weather_record
+
+
+def test_buffer_keeps_newest_readings_in_order():
+    """Each city keeps its newest readings sorted; duplicates are ignored."""
+    buffer = ReadingsBuffer(capacity=3)
+
+    added = buffer.add(
+        [
+            weather_record("Warsaw", 10),
+            weather_record("Warsaw", 12),
+            weather_record("Warsaw", 11),
+            weather_record("Warsaw", 11),
+            weather_record("Warsaw", 13, temperature=5.0),
+            weather_record("Gdansk", 10),
+        ]
+    )
+
+    readings, _ = buffer.recent(["Warsaw"])
+    assert added == 5
+    assert [r.measurement_time.hour for r in readings] == [11, 12, 13]
+    assert [r.city for r in buffer.latest()] == ["Gdansk", "Warsaw"]
+    assert buffer.latest(["Warsaw"])[0].temperature_celsius == 5.0
+
+
+def test_buffer_reports_whether_window_is_complete():
+    """Windows older than the evicted or unseen history are not complete."""
+    buffer = ReadingsBuffer(capacity=2)
+    buffer.add([weather_record("Warsaw", 10), weather_record("Warsaw", 11)])
+    assert buffer.recent(["Warsaw"], since=datetime(2026, 1, 25, 10))[1]
+    assert not buffer.recent(["Krakow"], since=datetime(2026, 1, 25, 10))[1]
+
+    buffer.add([weather_record("Warsaw", 12)])
+    assert not buffer.recent(["Warsaw"], since=datetime(2026, 1, 25, 10))[1]
+    readings, complete = buffer.recent(["Warsaw"], since=datetime(2026, 1, 25, 11))
+    assert complete
+    assert len(readings) == 2
+
+
+def test_buffer_with_capacity_one_keeps_newest():
+    """A single-reading buffer evicts on every newer reading."""
+    buffer = ReadingsBuffer(capacity=1)
+
+    assert buffer.add([weather_record("Warsaw", 10), weather_record("Warsaw", 11)]) == 2
+
+    readings, complete = buffer.recent(["Warsaw"], since=datetime(2026, 1, 25, 11))
+    assert [r.measurement_time.hour for r in readings] == [11]
+    assert complete
+    assert not buffer.recent(["Warsaw"], since=datetime(2026, 1, 25, 10))[1]
+
+
+def test_buffer_seed_from_database():
+    """Seeding loads the window and treats cities without rows as complete."""
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (datetime(2026, 1, 25, 12),)
+    cursor.fetchall.return_value = [
+        weather_record("Warsaw", 11),
+        weather_record("Warsaw", 12),
+    ]
+    buffer = ReadingsBuffer(capacity=10)
+
+    assert buffer.seed(cursor, window_hours=6) == 2
+    assert buffer.warm
+    assert cursor.execute.call_args[0][1] == (datetime(2026, 1, 25, 6), 10)
+    since = datetime(2026, 1, 25, 8)
+    assert buffer.recent(["Warsaw", "Krakow"], since=since)[1]
+
+
+def test_server_roundtrip():
+    """Readings pushed by the loader are served over HTTP."""
+    server = ReadingsServer(ReadingsBuffer(capacity=5))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = ReadingsClient(server.url)
+        assert client.push([tuple(weather_record("Warsaw", 10))]) == 1
+
+        latest = client.latest()
+        readings, complete = client.recent(["Warsaw"], since=datetime(2026, 1, 25, 10))
+        health = client.session.get(f"{server.url}/health").json()
+        bad = client.session.get(f"{server.url}/recent?since=yesterday")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert latest[0]["city"] == "Warsaw"
+    assert latest[0]["measurement_time"] == "2026-01-25T10:00:00"
+    assert len(readings) == 1 and complete
+    assert health["readings"] == 1
+    assert bad.status_code == 400
+
+
+def test_publish_readings_ignores_unreachable_service():
+    """A load never fails because the readings service is down."""
+    config = {"read_service": {"enabled": True, "url": "http://127.0.0.1:1"}}
+    with patch("src.read_service.load_config", return_value=config), patch.object(
+        ReadingsClient, "push", side_effect=requests.ConnectionError("refused")
+    ):
+        assert publish_readings([tuple(weather_record("Warsaw", 10))]) == 0
+
+
+def test_readings_client_is_shared():
+    """Loads reuse one client and its session instead of opening new ones."""
+    config = {"read_service": {"enabled": True, "url": "http://127.0.0.1:1"}}
+    with patch("src.read_service.load_config", return_value=config):
+        assert get_readings_client() is get_readings_client()
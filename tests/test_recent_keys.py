@@ -0,0 +1,78 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from src.load import recent_keys
+from src.load.recent_keys import RecentKeys, get_recent_keys
+from tests.factories import weather_record
+
+
+def test_filter_drops_known_and_repeated_keys(tmp_path):
+    """Known keys and repeats within a batch are filtered out."""
+    keys = RecentKeys(str(tmp_path / "keys.json"))
+    keys.update([weather_record("Warsaw", 10)])
+
+    new_records, known = keys.filter(
+        [
+            weather_record("Warsaw", 10),
+            weather_record("Warsaw", 11),
+            weather_record("Warsaw", 11),
+        ]
+    )
+
+    assert new_records == [weather_record("Warsaw", 11)]
+    assert known == 2
+
+
+def test_keys_outside_window_are_pruned(tmp_path):
+    """Keys older than the window behind the newest key are dropped."""
+    keys = RecentKeys(str(tmp_path / "keys.json"), window_hours=24)
+    keys.update(
+        [weather_record("Warsaw", 10, day=23), weather_record("Warsaw", 10, day=24)]
+    )
+    keys.update([weather_record("Gdansk", 12, day=25)])
+
+    assert ("Warsaw", datetime(2026, 1, 23, 10)) not in keys
+    assert ("Warsaw", datetime(2026, 1, 24, 10)) not in keys
+    assert ("Gdansk", datetime(2026, 1, 25, 12)) in keys
+    assert len(keys) == 1
+
+
+def test_save_and_reload_is_warm(tmp_path):
+    """A persisted index loads warm with the same keys."""
+    path = str(tmp_path / "keys.json")
+    keys = RecentKeys(path)
+    assert not keys.warm
+    keys.update([weather_record("Warsaw", 10)])
+    keys.save()
+
+    reloaded = RecentKeys(path)
+
+    assert reloaded.warm
+    assert ("Warsaw", datetime(2026, 1, 25, 10)) in reloaded
+
+
+def test_seed_loads_keys_from_database(tmp_path):
+    """Cold start seeds keys from weather_measurements."""
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [("Warsaw", datetime(2026, 1, 25, 10))]
+    keys = RecentKeys(str(tmp_path / "keys.json"), window_hours=6)
+
+    assert keys.seed(cursor) == 1
+
+    assert keys.warm
+    assert cursor.execute.call_args.args[1] == (6 * 3600,)
+    assert ("Warsaw", datetime(2026, 1, 25, 10)) in keys
+
+
+def test_get_recent_keys_keeps_one_file_per_shard(tmp_path):
+    """Concurrent shard loads never rewrite each other's key index."""
+    config = {
+        "database": {
+            "recent_keys": {"enabled": True, "path": str(tmp_path / "keys.json")}
+        }
+    }
+    with patch.dict(recent_keys._recent_keys, clear=True), patch(
+        "src.load.recent_keys.load_config", return_value=config
+    ):
+        assert get_recent_keys(3).path == tmp_path / "keys-0003.json"
+        assert get_recent_keys().path == tmp_path / "keys.json"
+        assert get_recent_keys(3) is get_recent_keys(3)
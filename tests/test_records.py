@@ -0,0 +1,50 @@
+import csv
+from datetime import datetime
+from src.load.csv_writer import save_to_csv
+from src.transform.records import WeatherBatch, WeatherRecord, as_records
+
+
+def _records():
+    return [
+        WeatherRecord("Warsaw", 0.5, datetime(2026, 1, 25, 12), 85, 1013, 5.5),
+        WeatherRecord("Gdansk", None, datetime(2026, 1, 25, 12), None, 1010, None),
+        WeatherRecord("Krakow", -3.25, datetime(2026, 1, 25, 13), 70, None, 1.0),
+    ]
+
+
+def test_batch_roundtrips_records_with_missing_values():
+    """Records come back unchanged, with None for missing fields."""
+    batch = WeatherBatch.from_records(_records())
+
+    assert len(batch) == 3
+    assert len(batch.times) == 2
+    assert list(batch) == _records()
+
+
+def test_batch_roundtrips_through_arrow():
+    """Arrow conversion keeps types and nulls."""
+    table = WeatherBatch.from_records(_records()).to_arrow()
+
+    assert table.column("humidity").null_count == 1
+    assert table.to_pylist()[1]["temperature_celsius"] is None
+    assert list(WeatherBatch.from_arrow(table)) == _records()
+
+
+def test_as_records_accepts_dicts_and_skips_none():
+    """Legacy dict lists are converted and None entries counted."""
+    records, skipped = as_records([_records()[0]._asdict(), None])
+
+    assert records == [_records()[0]]
+    assert skipped == 1
+
+
+def test_save_to_csv_writes_batch(tmp_path):
+    """CSV output has a header row and one row per record."""
+    save_to_csv(WeatherBatch.from_records(_records()), str(tmp_path), "out.csv")
+
+    with open(tmp_path / "out.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["city"] for row in rows] == ["Warsaw", "Gdansk", "Krakow"]
+    assert rows[1]["humidity"] == ""
+    assert rows[0]["measurement_time"] == "2026-01-25 12:00:00"
@@ -0,0 +1,19 @@
+from src.extract.request_budget import RequestBudget
+
+
+def test_budget_spaces_requests_to_rate():
+    """Requests beyond the rate wait for their slot."""
+    sleeps = []
+    budget = RequestBudget(per_minute=120, clock=lambda: 100.0, sleep=sleeps.append)
+
+    assert all(budget.acquire() for _ in range(3))
+    assert sleeps == [0.5, 1.0]
+
+
+def test_budget_stops_at_max_requests():
+    """No more requests are granted once the cap is reached."""
+    budget = RequestBudget(max_requests=2)
+
+    assert [budget.acquire() for _ in range(3)] == [True, True, False]
+    assert budget.exhausted
+    assert budget.used == 2
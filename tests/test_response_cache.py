@@ -0,0 +1,66 @@
+from unittest.mock import patch, MagicMock
+from src.extract.response_cache import ResponseCache
+from src.extract.weather_api import WeatherAPI
+
+
+def test_fresh_entry_is_a_hit(tmp_path):
+    """City with a measurement younger than refresh_interval is fresh."""
+    cache = ResponseCache(tmp_path / "cache.json", ttl=3600, refresh_interval=600)
+    cache.put("Warsaw", {"name": "Warsaw", "dt": 1000}, now=1100)
+
+    assert cache.is_fresh("warsaw", now=1200)
+    assert cache.hits == 1
+
+
+def test_stale_measurement_is_a_miss(tmp_path):
+    """City whose data may have been refreshed must be fetched again."""
+    cache = ResponseCache(tmp_path / "cache.json", ttl=3600, refresh_interval=600)
+    cache.put("Warsaw", {"name": "Warsaw", "dt": 1000}, now=1100)
+
+    assert not cache.is_fresh("Warsaw", now=1600)
+    assert cache.hits == 0
+
+
+def test_lru_eviction(tmp_path):
+    """Least recently used city is evicted when max_entries is exceeded."""
+    cache = ResponseCache(tmp_path / "cache.json", max_entries=2)
+    cache.put("Warsaw", {"dt": 1000}, now=1000)
+    cache.put("Gdansk", {"dt": 1000}, now=1000)
+    cache.is_fresh("Warsaw", now=1001)
+    cache.put("Krakow", {"dt": 1000}, now=1002)
+
+    assert cache.get("Warsaw") is not None
+    assert cache.get("Gdansk") is None
+    assert len(cache) == 2
+
+
+def test_cache_persists_to_disk(tmp_path):
+    """Saved entries are loaded by a new cache instance."""
+    path = tmp_path / "cache.json"
+    cache = ResponseCache(path)
+    cache.put("Warsaw", {"name": "Warsaw", "dt": 1000})
+    cache.save()
+
+    assert ResponseCache(path).get("Warsaw") == {"name": "Warsaw", "dt": 1000}
+
+
+def test_weather_api_skips_cached_cities(tmp_path):
+    """Second run does not request cities whose data cannot have changed."""
+    config = {
+        "api": {"base_url": "http://example.invalid", "timeout": 1},
+        "cache": {"enabled": True, "path": str(tmp_path / "cache.json")},
+    }
+
+    def fake_get(url, params, timeout):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"name": params["q"], "dt": 4102444800}
+        return response
+
+    with patch("requests.Session.get", side_effect=fake_get) as mock_get:
+        api = WeatherAPI(config)
+        assert len(api.get_weather_data(["Warsaw", "Gdansk"])) == 2
+        assert api.get_weather_data(["Warsaw", "Gdansk"]) == []
+
+        assert mock_get.call_count == 2
+        assert api.cache_hits == 2
@@ -0,0 +1,62 @@
+import os
+import time
+from datetime import datetime
+from src.transform.records import WeatherRecord
+from src.staging import cleanup_staging, read_stage, write_stage
+
+
+def test_raw_stage_roundtrip(tmp_path):
+    """Raw payloads are read back unchanged."""
+    payloads = [
+        {"name": "Warsaw", "main": {"temp": 273.15}, "dt": 1706216400},
+        {"name": "Gdansk", "dt": 1706216400},
+    ]
+
+    staged = write_stage(payloads, "raw", "manual__2026-01-25T12:00", str(tmp_path))
+
+    assert staged["rows"] == 2
+    assert read_stage(staged) == payloads
+
+
+def test_clean_stage_roundtrip_drops_none(tmp_path):
+    """Transformed records keep their types and None records are dropped."""
+    record = {
+        "city": "Warsaw",
+        "temperature_celsius": 0.0,
+        "measurement_time": datetime(2026, 1, 25, 12),
+        "humidity": 85,
+        "pressure": None,
+        "wind_speed": 5.5,
+    }
+
+    staged = write_stage([record, None], "clean", "run", str(tmp_path))
+
+    assert staged["rows"] == 1
+    assert list(read_stage(staged)) == [WeatherRecord(**record)]
+
+
+def test_cleanup_staging_removes_old_runs(tmp_path):
+    """Run directories older than the retention window are removed."""
+    old = write_stage([], "raw", "old", str(tmp_path))
+    write_stage([], "raw", "new", str(tmp_path))
+    old_dir = os.path.dirname(old["path"])
+    past = time.time() - 48 * 3600
+    os.utime(old_dir, (past, past))
+
+    assert cleanup_staging(str(tmp_path), retention_hours=24) == 1
+    assert sorted(os.listdir(tmp_path)) == ["new"]
+
+
+def test_raw_stage_reads_typed_payloads(tmp_path):
+    """Raw payloads can be replayed straight into typed structs."""
+    payload = {"name": "Warsaw", "dt": 1706216400, "main": {"temp": 273.15}}
+
+    staged = write_stage([payload], "raw", "run", str(tmp_path))
+    (typed,) = read_stage(staged, typed=True)
+
+    assert (typed.name, typed.dt, typed.main.temp, typed.wind) == (
+        "Warsaw",
+        1706216400,
+        273.15,
+        None,
+    )
@@ -0,0 +1,65 @@
+import requests
+
+from benchmarks.payloads import generate_cities, generate_payloads
+from benchmarks.stub_server import StubOWMServer
+from src.extract.weather_api import WeatherAPI
+from src.transform.data_processor import transform_weather_batch
+
+
+def _api_config(server, **overrides):
+    api = {
+        "base_url": server.base_url,
+        "group_url": server.group_url,
+        "timeout": 5,
+        "max_workers": 4,
+        "retries": 5,
+        "backoff": 0.001,
+        "backoff_max": 0.01,
+    }
+    api.update(overrides)
+    return {"api": api}
+
+
+def test_stub_server_serves_city_and_group_payloads():
+    """Stub answers the weather and group endpoints with OWM-shaped JSON."""
+    with StubOWMServer() as server:
+        city = requests.get(server.base_url, params={"q": "Warsaw"}, timeout=5)
+        assert city.status_code == 200
+        assert city.json()["name"] == "Warsaw"
+
+        group = requests.get(server.group_url, params={"id": "1,2"}, timeout=5)
+        assert [item["id"] for item in group.json()["list"]] == [1, 2]
+        assert server.requests == 2
+
+
+def test_weather_api_against_stub_retries_rate_limits():
+    """WeatherAPI fetches every city end to end despite injected 429s."""
+    cities = generate_cities(20)
+    with StubOWMServer(rate_limit_first=2) as server:
+        api = WeatherAPI(_api_config(server))
+        results = api.get_weather_data(cities)
+        api.close()
+
+        assert [payload["name"] for payload in results] == cities
+        assert server.requests == 3 * len(cities)
+
+
+def test_generated_payloads_transform_cleanly():
+    """Synthetic payloads are valid input for the batch transform."""
+    records = transform_weather_batch(generate_payloads(50))
+
+    assert len(records) == 50
+    assert all(record is not None for record in records)
+
+
+def test_weather_api_fetches_history_from_stub():
+    """History requests return one named hourly payload per hour in range."""
+    with StubOWMServer() as server:
+        api = WeatherAPI(_api_config(server, history_url=server.history_url))
+        payloads = api.fetch_history("Warsaw", 1767225600, 1767225600 + 6 * 3600)
+        api.close()
+
+    assert [payload["dt"] for payload in payloads] == [
+        1767225600 + hour * 3600 for hour in range(6)
+    ]
+    assert all(payload["name"] == "Warsaw" for payload in payloads)
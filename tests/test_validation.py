@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock, patch
+import numpy as np
+from src.transform.records import WeatherBatch
+from src.validation import Validator, update_history, validate_data
+from tests.factories import weather_record
+
+
+def _history(city, hours=24):
+    """Hourly readings alternating around 0°C and 1013 hPa."""
+    return [
+        weather_record(city, hour, temperature=hour % 3 - 1.0, pressure=1012 + hour % 3)
+        for hour in range(hours)
+    ]
+
+
+def test_range_checks_reject_impossible_values():
+    """Out-of-range values are rejected with a reason; missing values pass."""
+    batch = WeatherBatch.from_records(
+        [
+            weather_record("Gdansk", 0, temperature=60.0),
+            weather_record("Warsaw", 0, pressure=0),
+            weather_record("Krakow", 0, temperature=None),
+        ]
+    )
+
+    valid, reasons = Validator(min_spread={}).check(batch)
+
+    assert valid.tolist() == [False, False, True]
+    assert reasons == {
+        0: ["temperature_celsius out of range [-90.0, 57.0]"],
+        1: ["pressure out of range [870.0, 1085.0]"],
+    }
+
+
+def test_outliers_are_tested_against_city_history():
+    """Readings far from a city's rolling median are rejected."""
+    validator = Validator(min_history=12)
+    validator.update(
+        WeatherBatch.from_records(_history("Warsaw") + _history("Gdansk", hours=3))
+    )
+    batch = WeatherBatch.from_records(
+        [
+            weather_record("Warsaw", 24, temperature=25.0),
+            weather_record("Warsaw", 25, temperature=3.0),
+            weather_record("Gdansk", 24, temperature=25.0),
+        ]
+    )
+
+    valid, reasons = validator.check(batch)
+
+    assert valid.tolist() == [False, True, True]
+    assert reasons[0] == ["temperature_celsius outlier (z=12.5)"]
+
+
+def test_old_readings_are_not_outlier_tested():
+    """Backfilled readings outside the history window only get range checks."""
+    validator = Validator(window_hours=48)
+    validator.update(WeatherBatch.from_records(_history("Warsaw")))
+    old = WeatherBatch.from_records(
+        [weather_record("Warsaw", hour, temperature=25.0) for hour in range(-100, -52)]
+    )
+
+    valid, _ = validator.check(old)
+    validator.update(old)
+
+    assert valid.all()
+    recent = WeatherBatch.from_records([weather_record("Warsaw", 24, temperature=25.0)])
+    assert validator.check(recent)[1] == {0: ["temperature_celsius outlier (z=12.5)"]}
+
+
+def test_validate_data_quarantines_rejects():
+    """Rejected rows are quarantined and the history is seeded once."""
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [tuple(r) for r in _history("Warsaw")]
+    connection = MagicMock()
+    connection.__enter__.return_value.cursor.return_value.__enter__.return_value = (
+        cursor
+    )
+    validator = Validator()
+    records = [
+        weather_record("Warsaw", 24, temperature=25.0),
+        weather_record("Warsaw", 25),
+    ]
+
+    with patch("src.validation.get_validator", return_value=validator), patch(
+        "src.validation.get_connection", return_value=connection
+    ), patch("src.validation.save_to_quarantine") as mock_quarantine:
+        accepted = validate_data(records)
+        validate_data([weather_record("Warsaw", 26)])
+
+    assert cursor.execute.call_count == 1
+    assert [r.measurement_time.hour for r in accepted] == [1]
+    rejected, reasons = mock_quarantine.call_args[0]
+    assert np.array_equal(rejected.temperature_celsius, [25.0])
+    assert reasons == [["temperature_celsius outlier (z=12.5)"]]
+
+
+def test_history_only_learns_loaded_rows():
+    """Accepted rows join the history only once the loader reports them inserted."""
+    validator = Validator()
+    validator.update(WeatherBatch.from_records(_history("Warsaw")))
+    validator.warm = True
+    warmer = [
+        weather_record("Warsaw", 24 + hour, temperature=4.0) for hour in range(36)
+    ]
+    probe = WeatherBatch.from_records([weather_record("Warsaw", 60, temperature=14.0)])
+
+    with patch("src.validation.get_validator", return_value=validator):
+        accepted = validate_data(warmer)
+        assert len(accepted) == 36
+        assert not validator.check(probe)[0].any()
+
+        update_history(list(accepted))
+
+    assert validator.check(probe)[0].all()
@@ -1,8 +1,21 @@
+import copy
+import json
 import pytest
 from unittest.mock import patch, MagicMock
+from src.config import load_config
+from src.extract.decoder import WeatherPayload
 from src.extract.weather_api import WeatherAPI
 
 
+@pytest.fixture(autouse=True)
+def json_decoding():
+    """Decode mocked responses through ``response.json()`` by default."""
+    config = copy.deepcopy(load_config())
+    config["api"]["typed_decoding"] = False
+    with patch("src.extract.weather_api.load_config", return_value=config):
+        yield
+
+
 def test_get_weather_data_success():
     """Test successful API call."""
 
@@ -13,7 +26,7 @@ def test_get_weather_data_success():
         "wind": {"speed": 5.5},
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = fake_response
@@ -27,3 +40,178 @@ def test_get_weather_data_success():
         assert result[0]["main"]["temp"] == 273.15
 
         mock_get.assert_called_once()
+
+
+def _mock_response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+def test_get_weather_data_concurrent_keeps_order_and_skips_errors():
+    """Concurrent fetch returns results in city order and skips failures."""
+
+    def fake_get(url, params, timeout):
+        city = params["q"]
+        if city == "Krakow":
+            return _mock_response({}, status_code=404)
+        return _mock_response({"name": city, "dt": 1706216400})
+
+    with patch("requests.Session.get", side_effect=fake_get) as mock_get:
+        api = WeatherAPI()
+        api.max_workers = 4
+        result = api.get_weather_data(["Warsaw", "Krakow", "Gdansk", "Katowice"])
+
+        assert [r["name"] for r in result] == ["Warsaw", "Gdansk", "Katowice"]
+        assert mock_get.call_count == 4
+
+
+def test_get_weather_data_retries_on_retry_after():
+    """A 503 with Retry-After is retried after the advertised delay."""
+
+    unavailable = _mock_response({}, status_code=503)
+    unavailable.headers = {"Retry-After": "2"}
+    ok = _mock_response({"name": "Warsaw", "dt": 1706216400})
+
+    with patch(
+        "requests.Session.get", side_effect=[unavailable, ok]
+    ) as mock_get, patch("src.extract.weather_api.time.sleep") as mock_sleep:
+        api = WeatherAPI()
+        api.retries = 2
+        result = api.get_weather_data(["Warsaw"])
+
+        assert [r["name"] for r in result] == ["Warsaw"]
+        assert mock_get.call_count == 2
+        mock_sleep.assert_called_once_with(2.0)
+
+
+def test_get_weather_data_gives_up_after_retries():
+    """Persistent server errors are retried, then the city is skipped."""
+
+    with patch(
+        "requests.Session.get", return_value=_mock_response({}, status_code=500)
+    ) as mock_get, patch("src.extract.weather_api.time.sleep"):
+        api = WeatherAPI()
+        api.retries = 2
+        result = api.get_weather_data(["Warsaw"])
+
+        assert result == []
+        assert mock_get.call_count == 3
+
+
+def test_iter_weather_data_yields_successful_payloads():
+    """Streaming fetch yields every successful payload and skips failures."""
+
+    def fake_get(url, params, timeout):
+        city = params["q"]
+        if city == "Krakow":
+            return _mock_response({}, status_code=404)
+        return _mock_response({"name": city, "dt": 1706216400})
+
+    with patch("requests.Session.get", side_effect=fake_get):
+        api = WeatherAPI()
+        api.max_workers = 2
+        cities = ["Warsaw", "Krakow", "Gdansk", "Katowice", "Szczecin"]
+        result = list(api.iter_weather_data(cities))
+
+        assert sorted(r["name"] for r in result) == [
+            "Gdansk",
+            "Katowice",
+            "Szczecin",
+            "Warsaw",
+        ]
+
+
+def test_get_weather_data_groups_resolved_cities(tmp_path):
+    """Cities resolved in the index are fetched in group requests."""
+    config = {
+        "api": {
+            "base_url": "http://example.invalid/weather",
+            "group_url": "http://example.invalid/group",
+            "timeout": 1,
+            "group_size": 3,
+        },
+        "city_index": {"enabled": True, "path": str(tmp_path / "index.json")},
+    }
+    ids = {"Warsaw": 1, "Gdansk": 2, "Krakow": 3}
+
+    def fake_get(url, params, timeout):
+        if url.endswith("/group"):
+            requested = [int(i) for i in params["id"].split(",")]
+            payloads = [
+                {"id": city_id, "name": city, "dt": 1706216400}
+                for city, city_id in ids.items()
+                if city_id in requested
+            ]
+            return _mock_response({"cnt": len(payloads), "list": payloads})
+        city = params["q"]
+        return _mock_response({"id": ids[city], "name": city, "dt": 1706216400})
+
+    cities = ["Warsaw", "Gdansk", "Krakow"]
+    with patch("requests.Session.get", side_effect=fake_get) as mock_get:
+        WeatherAPI(config).get_weather_data(cities)
+        assert mock_get.call_count == 3
+
+    with patch("requests.Session.get", side_effect=fake_get) as mock_get:
+        result = WeatherAPI(config).get_weather_data(cities)
+
+        assert [r["name"] for r in result] == cities
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0].endswith("/group")
+
+
+def test_shard_keeps_its_own_state_files(tmp_path):
+    """Concurrent shards never rewrite each other's cache or city index."""
+    config = {
+        "api": {"base_url": "http://example.invalid/weather", "timeout": 1},
+        "cache": {"enabled": True, "path": str(tmp_path / "responses.json")},
+        "city_index": {"enabled": True, "path": str(tmp_path / "index.json")},
+    }
+
+    api = WeatherAPI(config, shard=3)
+
+    assert api.cache.path == tmp_path / "responses-0003.json"
+    assert api.city_index.path == tmp_path / "index-0003.json"
+    assert WeatherAPI(config).cache.path == tmp_path / "responses.json"
+
+
+def _typed_api():
+    config = copy.deepcopy(load_config())
+    config["api"]["typed_decoding"] = True
+    return WeatherAPI(config)
+
+
+def test_typed_decoding_keeps_only_used_fields():
+    """Typed decoding parses the body into a struct with just the used fields."""
+    body = {
+        "name": "Warsaw",
+        "id": 756135,
+        "dt": 1706216400,
+        "main": {"temp": 273.15, "humidity": 85, "pressure": 1013, "feels_like": 270},
+        "wind": {"speed": 5.5, "deg": 200},
+        "weather": [{"id": 800, "main": "Clear"}],
+    }
+    response = MagicMock(status_code=200, content=json.dumps(body).encode())
+
+    with patch("requests.Session.get", return_value=response):
+        result = _typed_api().get_weather_data(["Warsaw"])
+
+    assert isinstance(result[0], WeatherPayload)
+    assert (result[0].name, result[0].id, result[0].main.humidity) == (
+        "Warsaw",
+        756135,
+        85,
+    )
+    response.json.assert_not_called()
+
+
+def test_typed_decoding_rejects_wrong_field_types():
+    """A used field with the wrong type fails the request like invalid JSON."""
+    body = b'{"name": "Warsaw", "dt": "yesterday"}'
+    response = MagicMock(status_code=200, content=body)
+
+    with patch("requests.Session.get", return_value=response):
+        result = _typed_api().get_weather_data(["Warsaw"])
+
+    assert result == []